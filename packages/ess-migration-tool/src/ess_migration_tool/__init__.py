@@ -2,8 +2,7 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from . import __main__
-
+# The CLI isn't imported here, so that importing the package's modules doesn't import every strategy
 __all__ = [
     "__main__",
 ]
@@ -11,17 +11,9 @@ Main CLI entry point for the migration script.
 import argparse
 import datetime
 import logging
-
-from .element_web import ELEMENT_WEB_STRATEGY_NAME
-from .engine import MigrationEngine
-from .hookshot import HOOKSHOT_STRATEGY_NAME
-from .inputs import InputProcessor, ValidationError
-from .mas import MAS_STRATEGY_NAME
-from .models import GlobalOptions
-from .outputs import create_output_dir, generate_helm_values, write_outputs
-from .rich_output import ProgressReporter, log_command, print_prompt, print_section, print_separator, print_table
-from .synapse import SYNAPSE_STRATEGY_NAME
-from .utils import press_enter_to_continue, prompt_for_database_choice
+import sys
+from pathlib import Path
+from typing import Any
 
 LOADING_STEP = "Loading and validating input files"
 MIGRATING_STEP = "Migrating configuration to ESS values"
@@ -44,18 +36,39 @@ Examples:
 
   # Verbose output for debugging
   python -m migration --synapse-config synapse.yaml --verbose
+
+  # Migrate every estate listed in a fleet manifest
+  python -m migration --manifest fleet.yaml --output-dir fleet-output
         """,
     )
 
     parser.add_argument(
         "--synapse-config",
-        required=True,
+        required=False,
         help=(
             "Path to Synapse homeserver.yaml configuration file. "
-            "This is the main Synapse configuration that contains server_name, database, listeners, etc."
+            "This is the main Synapse configuration that contains server_name, database, listeners, etc. "
+            "Required unless --manifest is given."
+        ),
+    )
+
+    parser.add_argument(
+        "--manifest",
+        required=False,
+        help=(
+            "Path to a YAML fleet manifest listing many estates to migrate non-interactively, each with a name and "
+            "the options of a single migration in snake_case, e.g. synapse_config. Each estate is written to a "
+            "directory named after it in the output directory, with an aggregate fleet-summary.json."
         ),
     )
 
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of estates of a --manifest to migrate at once (default: number of CPUs).",
+    )
+
     parser.add_argument(
         "--mas-config",
         required=False,
@@ -128,6 +141,79 @@ Examples:
         help="Disable migration summary output.",
     )
 
+    parser.add_argument(
+        "--parallel-discovery",
+        action="store_true",
+        help=(
+            "Discover the extra files of all components concurrently. "
+            "Speeds up migrations which mount many files. Secrets discovery, the migration of each component and "
+            "prompts still happen one at a time."
+        ),
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Record the wall-clock and CPU time of each phase of each component's migration, and the peak memory, "
+            "to migration-profile-*.json in the output directory. Time spent at prompts is included."
+        ),
+    )
+
+    parser.add_argument(
+        "--output-format",
+        choices=["text", "json"],
+        default="text",
+        help=(
+            "Format of the migration summary. 'json' writes a single line JSON document of the values, manifests, "
+            "warnings, missing files and phase timings to stdout instead of the summary, and never prompts, "
+            "as with --non-interactive."
+        ),
+    )
+
+    parser.add_argument(
+        "--compress-large-files",
+        action="store_true",
+        help=(
+            "Gzip extra files too large for a ConfigMap into its binaryData, "
+            "with an init container that unpacks them, rather than skipping them."
+        ),
+    )
+
+    parser.add_argument(
+        "--unpack-image",
+        metavar="IMAGE",
+        help=(
+            "Image of the init container that unpacks files gzipped by --compress-large-files, e.g. from a registry "
+            "mirror for air-gapped installs. It needs sh, mkdir, cp and gunzip. Defaults to busybox from Docker Hub."
+        ),
+    )
+
+    parser.add_argument(
+        "--combine-manifests",
+        action="store_true",
+        help="Write all the generated ConfigMaps and Secrets to a single manifests.yaml rather than a file each.",
+    )
+
+    parser.add_argument(
+        "--answers",
+        required=False,
+        help=(
+            "Path to a YAML or JSON file of answers to prompts, keyed by answer key, "
+            "e.g. 'database', 'secrets.<secret path>' or 'workers.<instance name>'. "
+            "Prompts without an answer are asked as usual unless --non-interactive is given."
+        ),
+    )
+
+    parser.add_argument(
+        "--non-interactive",
+        action="store_true",
+        help=(
+            "Never prompt. Prompts without an answer in --answers use their default, or else are written to "
+            "unanswered-prompts.json in the output directory and the migration fails."
+        ),
+    )
+
     parser.add_argument(
         "--database-mode",
         choices=["existing", "ess-managed"],
@@ -140,6 +226,35 @@ Examples:
 
     # Parse arguments
     args = parser.parse_args()
+    if not args.manifest and not args.synapse_config:
+        parser.error("--synapse-config is required unless --manifest is given")
+    if args.manifest and args.output_format == "json":
+        parser.error("--output-format json is not supported with --manifest, see fleet-summary.json instead")
+
+    # The migration itself is only imported once the arguments are valid, so that --help and usage errors don't
+    # pay for importing every strategy and their dependencies
+    from .engine import MigrationEngine
+    from .fleet import Estate, run_fleet
+    from .inputs import InputProcessor, ValidationError
+    from .models import GlobalOptions
+    from .outputs import (
+        create_output_dir,
+        generate_helm_values,
+        write_json_result,
+        write_outputs,
+        write_unanswered_prompts,
+    )
+    from .profiling import MigrationProfiler
+    from .rich_output import (
+        ProgressReporter,
+        disable_console,
+        log_command,
+        print_prompt,
+        print_section,
+        print_separator,
+        print_table,
+    )
+    from .utils import UnansweredPromptError, press_enter_to_continue, prompt_for_database_choice
 
     # Set up logging
     sh = logging.StreamHandler()
@@ -159,9 +274,8 @@ Examples:
     # Validate and create output directory
     create_output_dir(args.output_dir)
 
-    summary_fh = logging.FileHandler(
-        f"{args.output_dir}/migration-summary-{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log"
-    )
+    started_at = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    summary_fh = logging.FileHandler(f"{args.output_dir}/migration-summary-{started_at}.log")
     summary_fh.setFormatter(
         logging.Formatter(
             "%(asctime)s - %(levelname)s - %(message)s",
@@ -174,6 +288,17 @@ Examples:
     summary_logger.addHandler(summary_fh)
     logger.addHandler(summary_fh)
 
+    if args.manifest:
+        try:
+            results = run_fleet(
+                args.manifest, args.output_dir, summary_logger, max_workers=args.jobs, profile=args.profile
+            )
+        except Exception as e:
+            print_prompt(f"💥 Error: {e}", style="bold red", logger=summary_logger, prefix="")
+            logging.error(f"Fleet migration failed: {e}")
+            return 1
+        return 0 if all(result.succeeded for result in results) else 1
+
     # Set up progress reporter
     steps = [
         LOADING_STEP,
@@ -181,49 +306,48 @@ Examples:
         GENERATING_VALUES_STEP,
         WRITING_OUTPUTS_STEP,
     ]
+    json_output = args.output_format == "json"
+    if json_output:
+        # stdout is only for the JSON document, the summary still goes to the summary log
+        disable_console()
     global_options = GlobalOptions(
         quiet_mode=args.quiet,
+        parallel_discovery=args.parallel_discovery,
+        compress_large_extra_files=args.compress_large_files,
+        unpack_image=args.unpack_image,
+        non_interactive=args.non_interactive or json_output,
+        # The JSON document has the phase timings, without the slower memory tracing unless profiling
+        profiler=MigrationProfiler(trace_memory=args.profile) if args.profile or json_output else None,
     )
+    profile_path = Path(args.output_dir) / f"migration-profile-{started_at}.json"
+    engine: MigrationEngine | None = None
+    written_files: dict[str, Any] = {}
+    error: str | None = None
     reporter = ProgressReporter(
         summary_logger=summary_logger, steps=steps, verbose=args.verbose, global_options=global_options
     )
 
     try:
+        if global_options.profiler:
+            global_options.profiler.start()
         reporter.start_migration()
 
         # Load migration input
         reporter.report_step(LOADING_STEP)
-        input_processor = InputProcessor()
-        input_processor.load_migration_input(
-            name=SYNAPSE_STRATEGY_NAME,
-            config_path=args.synapse_config,
-        )
-
-        if args.mas_config:
-            input_processor.load_migration_input(
-                name=MAS_STRATEGY_NAME,
-                config_path=args.mas_config,
-            )
-
-        if args.element_web_config:
-            input_processor.load_migration_input(
-                name=ELEMENT_WEB_STRATEGY_NAME,
-                config_path=args.element_web_config,
-            )
-
-        if args.well_known_dir or args.well_known_client or args.well_known_server or args.well_known_support:
-            input_processor.load_well_known_inputs(
-                dir_path=args.well_known_dir,
-                client_path=args.well_known_client,
-                server_path=args.well_known_server,
-                support_path=args.well_known_support,
-            )
-
-        if args.hookshot_config:
-            input_processor.load_migration_input(
-                name=HOOKSHOT_STRATEGY_NAME,
-                config_path=args.hookshot_config,
-            )
+        if args.answers:
+            global_options.answers = InputProcessor.load_answers(args.answers)
+        input_processor = Estate(
+            # Named like the estates of a fleet migration, which are written to directories named after them
+            name=Path(args.output_dir).name,
+            synapse_config=args.synapse_config,
+            mas_config=args.mas_config,
+            element_web_config=args.element_web_config,
+            well_known_dir=args.well_known_dir,
+            well_known_client=args.well_known_client,
+            well_known_server=args.well_known_server,
+            well_known_support=args.well_known_support,
+            hookshot_config=args.hookshot_config,
+        ).load_inputs()
 
         # Run migration
         reporter.report_step(MIGRATING_STEP)
@@ -244,6 +368,12 @@ Examples:
             )
 
         ess_values = engine.run_migration()
+        if global_options.answers:
+            logging.warning(f"Answers not used by any prompt: {', '.join(global_options.answers)}")
+        if global_options.unanswered_prompts:
+            raise UnansweredPromptError(
+                f"{len(global_options.unanswered_prompts)} prompts have no answer in non-interactive mode"
+            )
 
         # Generate outputs
         reporter.report_step(GENERATING_VALUES_STEP)
@@ -256,10 +386,16 @@ Examples:
             secrets=engine.secrets,
             configmaps=engine.configmaps,
             output_dir=args.output_dir,
+            combine_manifests=args.combine_manifests,
         )
+        # The summary below waits for the user, so isn't profiled
+        if global_options.profiler:
+            global_options.profiler.stop()
+
+        written_files = {"values": values_path, "secrets": secret_paths, "configmaps": configmap_paths}
 
-        # Collect all written file paths for display
-        all_file_paths = [values_path] + secret_paths + configmap_paths
+        # Collect all written file paths for display, the Secrets and ConfigMaps can share a combined file
+        all_file_paths = list(dict.fromkeys([values_path] + secret_paths + configmap_paths))
 
         # Display migration summary
         press_enter_to_continue(summary_logger, engine.global_options)
@@ -425,12 +561,8 @@ Examples:
                 f"{step_number}. Apply generated Kubernetes resources:", style="default", logger=summary_logger
             )
             step_number += 1
-            if has_configmaps:
-                for configmap_path in configmap_paths:
-                    log_command(f"kubectl apply -f {configmap_path} -n ess", logger=summary_logger)
-            if has_secrets:
-                for secret_path in secret_paths:
-                    log_command(f"kubectl apply -f {secret_path} -n ess", logger=summary_logger)
+            for manifest_path in dict.fromkeys(configmap_paths + secret_paths):
+                log_command(f"kubectl apply -f {manifest_path} -n ess", logger=summary_logger)
             print_prompt("", style="default", logger=summary_logger)
 
         print_prompt(
@@ -451,13 +583,31 @@ Examples:
         reporter.report_success(args.output_dir, all_file_paths)
         logging.info("Migration completed successfully!")
         logging.info(f"Output files written to: {args.output_dir}")
-        return 0
+        exit_code = 0
 
     except ValidationError as e:
-        reporter.report_failure(str(e))
+        error = str(e)
+        reporter.report_failure(error)
         logging.error(f"Input validation failed: {e}")
-        return 1
+        exit_code = 1
     except Exception as e:
-        reporter.report_failure(str(e))
-        logging.error(f"Migration failed: {e}")
-        return 1
+        error = str(e)
+        # Report every prompt that wasn't answered, including those before one that the migration couldn't go on from
+        if global_options.unanswered_prompts:
+            report_path = write_unanswered_prompts(global_options.unanswered_prompts, args.output_dir)
+            error = f"{error}. Add answers for the prompts in {report_path} to the answers file"
+        reporter.report_failure(error)
+        logging.error(f"Migration failed: {error}")
+        exit_code = 1
+    finally:
+        # Failed migrations are profiled too, up to where they failed
+        if global_options.profiler:
+            global_options.profiler.stop()
+            if args.profile:
+                global_options.profiler.write(profile_path)
+                logging.info(f"Profile written to {profile_path}")
+
+    # Written once the migration has succeeded or failed, with the timings of its profile
+    if json_output and not write_json_result(sys.stdout, engine, global_options, written_files, error):
+        exit_code = 1
+    return exit_code
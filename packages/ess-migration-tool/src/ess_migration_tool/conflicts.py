@@ -56,7 +56,11 @@ def prompt_for_conflict_resolution(
         options.append("Enter custom value")
 
     choice = prompt_choice(
-        summary_logger, f"Select value for '{conflict_key}':", options, global_options=global_options
+        summary_logger,
+        f"Select value for '{conflict_key}':",
+        options,
+        global_options=global_options,
+        answer_key=f"conflicts.{conflict_key}",
     )
     is_custom = choice == "Enter custom value"
     selected_value = choice if not is_custom else None
@@ -106,7 +110,9 @@ def resolve_value_conflicts(
         )
 
         if is_custom:
-            selected_value = prompt_value(summary_logger, "Enter custom value:", global_options)
+            selected_value = prompt_value(
+                summary_logger, "Enter custom value:", global_options, answer_key=f"conflicts.{ess_path}.custom"
+            )
 
         set_nested_value(ess_config, ess_path, selected_value)
         logging.info(f"Resolved {ess_path} = {selected_value}")
@@ -9,6 +9,7 @@ Migration engine that orchestrates the conversion process.
 
 import logging
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from itertools import chain
 from typing import Any
@@ -134,6 +135,14 @@ class MigrationEngine:
             ESS values dictionary
         """
         logger.info("Starting migration process")
+        if self.global_options.parallel_discovery:
+            # Extra files discovery only reads the filesystem, so is run for all components at once. Everything
+            # which prompts or updates shared state still runs in the migrators' order below, so the result is
+            # the same as when migrating serially
+            with ThreadPoolExecutor() as executor:
+                # Consume the results to re-raise any discovery failures
+                list(executor.map(MigrationService.discover_extra_files, self.migrators))
+
         for migrator in self.migrators:
             migrator.migrate()
 
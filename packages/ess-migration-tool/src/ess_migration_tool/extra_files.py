@@ -8,7 +8,10 @@ Handles discovery, reading, and validation of extra files from configuration fil
 """
 
 import logging
+import os
 import re
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from urllib.parse import urlparse
@@ -20,6 +23,9 @@ from .utils import prompt_choice, prompt_value, prompt_yes_no
 
 logger = logging.getLogger("migration")
 
+# Maximum number of files and directories looked at concurrently, which mostly wait on the filesystem
+DISCOVERY_MAX_WORKERS = 8
+
 
 class ExtraFilesError(Exception):
     """Base exception for extra files-related errors."""
@@ -27,6 +33,72 @@ class ExtraFilesError(Exception):
     pass
 
 
+def _list_directory(path: Path) -> list[Path] | None:
+    """
+    List the files in a directory, non-recursively.
+
+    Args:
+        path: Path to list
+
+    Returns:
+        The files in the directory, or None if the path isn't a directory
+
+    Raises:
+        ExtraFilesError: If the directory can't be listed
+    """
+    try:
+        with os.scandir(path) as entries:
+            # The file type comes with the directory entry, so this doesn't stat each file
+            return [Path(entry.path) for entry in entries if entry.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except OSError as e:
+        raise ExtraFilesError(f"Failed to list directory {path}: {e}") from e
+
+
+def _probe_file(path: Path, known_file: bool = False) -> bool:
+    """
+    Check that a path is a readable file, opening it once to also check if it is binary.
+
+    Args:
+        path: Path to the file to check
+        known_file: If the path is already known to be a file, e.g. from a directory listing
+
+    Returns:
+        True if the file is cleartext, False if it appears to be binary as it has null bytes
+
+    Raises:
+        ExtraFilesError: If the file doesn't exist, isn't a file or isn't readable
+    """
+    if not known_file:
+        try:
+            file_stat = path.stat()
+        except OSError as err:
+            raise ExtraFilesError(f"Extra file does not exist: {path}") from err
+        if not stat.S_ISREG(file_stat.st_mode):
+            raise ExtraFilesError(f"Extra file path is not a file: {path}")
+
+    try:
+        with open(path, "rb") as f:
+            # Read a sample of the file (first 1024 bytes) rather than its content, which is only read for ConfigMaps
+            sample = f.read(1024)
+    except PermissionError as err:
+        raise ExtraFilesError(f"Permission denied when reading file: {path}") from err
+    except OSError as err:
+        raise ExtraFilesError(f"Failed to read file {path}: {err}") from err
+
+    # Check for null bytes which are common in binary files
+    return b"\x00" not in sample
+
+
+def _probe_file_or_error(path: Path, known_file: bool) -> bool | ExtraFilesError:
+    """_probe_file, returning rather than raising the error so that the other files can still be probed."""
+    try:
+        return _probe_file(path, known_file)
+    except ExtraFilesError as e:
+        return e
+
+
 def ess_schema_config_key_secret_paths(ess_schema: dict[str, DiscoverableSecret]):
     return [
         secret_config.discovery.config_path
@@ -51,6 +123,12 @@ class ExtraFilesDiscovery:
     )  # Discovered Extra File to mount in ESS
     discovered_file_paths: list[DiscoveredPath] = field(default_factory=list)  # File paths discovered in configuration
     skipped_config_keys: list[str] = field(default_factory=list)  # Configuration keys that are skipped
+    discovered_directories: list[tuple[Path, list[str]]] = field(
+        default_factory=list
+    )  # Files found in each discovered directory, reported by report_discovered_directories
+    directory_listings: dict[Path, list[Path] | None] = field(
+        default_factory=dict
+    )  # Files in each path listed, None if it isn't a directory, so a directory used by several keys is listed once
 
     @property
     def missing_file_paths(self) -> list[DiscoveredPath]:
@@ -73,6 +151,9 @@ class ExtraFilesDiscovery:
         """
         Discover extra file paths from configuration data.
 
+        This doesn't prompt or print to the summary, so can run concurrently for different components.
+        Call report_discovered_directories() afterwards to summarise what was found.
+
         Args:
             config_data: Configuration dictionary to analyze
             ignored_config_keys: List of configuration keys where file paths should be ignored
@@ -170,37 +251,132 @@ class ExtraFilesDiscovery:
     def _discover_extra_files(self) -> None:
         """
         Discover extra files from discovered file paths.
+
+        The filesystem is looked at concurrently, as it can be slow, e.g. on NFS. The results are then handled in
+        the order of the configuration.
         """
         logger.info("Discovering extra files")
-        for _discovered_path in self.discovered_file_paths:
-            if _discovered_path.skipped_reason:
-                continue
-            if _discovered_path.source_path.is_dir():
-                files_in_dir = self._handle_directory(_discovered_path)
+        discovered_paths = [
+            _discovered_path for _discovered_path in self.discovered_file_paths if not _discovered_path.skipped_reason
+        ]
+        listing_errors = self._list_directories([_discovered_path.source_path for _discovered_path in discovered_paths])
+
+        # Files referenced directly still need checking that they exist and are files
+        files_to_probe = {
+            _discovered_path.source_path: False
+            for _discovered_path in discovered_paths
+            if self.directory_listings.get(_discovered_path.source_path) is None
+        }
+        for _discovered_path in discovered_paths:
+            files_to_probe |= dict.fromkeys(self.directory_listings.get(_discovered_path.source_path) or [], True)
+        probes = self._probe_files(files_to_probe)
+
+        for _discovered_path in discovered_paths:
+            if _discovered_path.source_path in listing_errors:
+                error = listing_errors[_discovered_path.source_path]
+                logger.error(f"Failed to process directory {_discovered_path}: {error}")
+                raise ExtraFilesError(f"Failed to process directory {_discovered_path}: {error}") from error
+
+            files_in_dir = self.directory_listings.get(_discovered_path.source_path)
+            if files_in_dir is not None:
+                logger.info(f"Processing directory: {_discovered_path.source_path}")
+                _discovered_path.is_dir = True
+                for file_path in files_in_dir:
+                    self._add_extra_file(_discovered_path, file_path, probes[file_path])
                 logger.info(f"Found {len(files_in_dir)} files in directory {_discovered_path.source_path}")
-                self.summary_logger.info(
-                    f"📁 Found {len(files_in_dir)} files in directory: {_discovered_path.source_path}"
-                )
-                # Show the files being imported
                 for file_path in files_in_dir:
                     logger.info(f"  - {file_path}")
-                    print_prompt(f"  📄 {Path(file_path).name}", style="default", logger=self.summary_logger)
                 if not files_in_dir:
                     logger.warning(f"No files found in directory: {_discovered_path.source_path}")
-                    print_prompt(
-                        f"⚠️  No files found in directory: {_discovered_path.source_path}",
-                        style="default",
-                        logger=self.summary_logger,
-                    )
+                self.discovered_directories.append(
+                    (_discovered_path.source_path, [str(file_path) for file_path in files_in_dir])
+                )
             else:
-                if _discovered_path.source_path not in self.discovered_extra_files:
-                    try:
-                        # If the file is not matching an existing extra file, add it to the discovered extra files
-                        self.discovered_extra_files[_discovered_path.source_path] = self._discover_extra_file(
-                            _discovered_path
-                        )
-                    except ExtraFilesError as e:
-                        logger.error(f"Failed to process file {_discovered_path.source_path}: {e}")
+                self._add_extra_file(
+                    _discovered_path, _discovered_path.source_path, probes[_discovered_path.source_path]
+                )
+
+    def _list_directories(self, paths: list[Path]) -> dict[Path, ExtraFilesError]:
+        """
+        List the files in each of the paths that are directories, concurrently, into directory_listings.
+
+        Args:
+            paths: Paths to list, paths already listed are not listed again
+
+        Returns:
+            The error listing each path that couldn't be listed
+        """
+
+        def list_directory(path: Path) -> list[Path] | None | ExtraFilesError:
+            try:
+                return _list_directory(path)
+            except ExtraFilesError as e:
+                return e
+
+        paths_to_list = [path for path in dict.fromkeys(paths) if path not in self.directory_listings]
+        listing_errors = {}
+        with ThreadPoolExecutor(max_workers=DISCOVERY_MAX_WORKERS) as executor:
+            for path, listing in zip(paths_to_list, executor.map(list_directory, paths_to_list), strict=True):
+                if isinstance(listing, ExtraFilesError):
+                    listing_errors[path] = listing
+                else:
+                    self.directory_listings[path] = listing
+        return listing_errors
+
+    def _probe_files(self, files: dict[Path, bool]) -> dict[Path, bool | ExtraFilesError]:
+        """
+        Check each of the files concurrently, with _probe_file.
+
+        Args:
+            files: The files to check, and whether each is already known to be a file
+
+        Returns:
+            If each file is cleartext, or the error checking it
+        """
+        with ThreadPoolExecutor(max_workers=DISCOVERY_MAX_WORKERS) as executor:
+            return dict(zip(files, executor.map(_probe_file_or_error, files, files.values()), strict=True))
+
+    def _add_extra_file(self, discovered_path: DiscoveredPath, file_path: Path, probe: bool | ExtraFilesError) -> None:
+        """
+        Add a file found at a discovered path to the discovered extra files.
+
+        Args:
+            discovered_path: The discovered path the file was found at
+            file_path: Path to the file
+            probe: If the file is cleartext, or the error checking it
+        """
+        if isinstance(probe, ExtraFilesError):
+            logger.error(f"Failed to process file {file_path}: {probe}")
+            return
+
+        if file_path in self.discovered_extra_files:
+            # The same file or directory is used by several configuration keys, which all need it mounted
+            discovered_source_paths = self.discovered_extra_files[file_path].discovered_source_paths
+            if discovered_path not in discovered_source_paths:
+                discovered_source_paths.append(discovered_path)
+        else:
+            self.discovered_extra_files[file_path] = DiscoveredExtraFile(
+                filename=file_path.name,
+                discovered_source_paths=[discovered_path],
+                source_path=file_path,  # Store path for lazy loading
+                cleartext=probe,
+            )
+
+    def report_discovered_directories(self) -> None:
+        """
+        Summarise the files found in the directories discovered by discover_extra_files_from_config.
+        """
+        for directory, files_in_dir in self.discovered_directories:
+            self.summary_logger.info(f"📁 Found {len(files_in_dir)} files in directory: {directory}")
+            # Show the files being imported
+            for file_path in files_in_dir:
+                print_prompt(f"  📄 {Path(file_path).name}", style="default", logger=self.summary_logger)
+            if not files_in_dir:
+                print_prompt(
+                    f"⚠️  No files found in directory: {directory}",
+                    style="default",
+                    logger=self.summary_logger,
+                )
 
     def _handle_directory(self, discovered_path: DiscoveredPath, override_path: Path | None = None) -> list[str]:
         """
@@ -208,38 +384,32 @@ class ExtraFilesDiscovery:
 
         Args:
             discovered_path: Path to the directory to process
+            override_path: Optional directory to use instead of discovered_path.source_path
         """
         logger.info(f"Processing directory: {discovered_path.source_path}")
 
         # Get all files in the directory (non-recursive)
         discovered_path.is_dir = True
-        try:
-            files_in_dir = []
-            list_path = Path(discovered_path.source_path)
-            if override_path:
-                list_path = override_path
-            for item in list_path.iterdir():
-                if item.is_file():
-                    files_in_dir.append(str(item))
-                    try:
-                        extra_file = self._discover_extra_file(discovered_path, item)
-                        if extra_file:
-                            self.discovered_extra_files[item] = extra_file
-                    except ExtraFilesError as e:
-                        logger.error(f"Failed to process file {item}: {e}")
-
-            return files_in_dir
-
-        except Exception as e:
-            logger.error(f"Failed to process directory {discovered_path}: {e}")
-            raise ExtraFilesError(f"Failed to process directory {discovered_path}: {e}") from e
+        list_path = override_path or Path(discovered_path.source_path)
+        listing_errors = self._list_directories([list_path])
+        if list_path in listing_errors:
+            logger.error(f"Failed to process directory {discovered_path}: {listing_errors[list_path]}")
+            raise ExtraFilesError(
+                f"Failed to process directory {discovered_path}: {listing_errors[list_path]}"
+            ) from listing_errors[list_path]
+
+        files_in_dir = self.directory_listings[list_path] or []
+        probes = self._probe_files(dict.fromkeys(files_in_dir, True))
+        for file_path in files_in_dir:
+            self._add_extra_file(discovered_path, file_path, probes[file_path])
+        return [str(file_path) for file_path in files_in_dir]
 
     def prompt_for_missing_files(self) -> None:
         """
         Prompt user for alternative paths when files are missing.
         """
         # Check if quiet mode is enabled
-        if self.global_options.quiet_mode and self.missing_file_paths:
+        if self.global_options.quiet_mode and not self.global_options.non_interactive and self.missing_file_paths:
             missing_files = [str(fp.source_path) for fp in self.missing_file_paths]
             raise ExtraFilesError(
                 f"Missing extra files in quiet mode: {', '.join(missing_files)}. "
@@ -280,6 +450,7 @@ class ExtraFilesDiscovery:
                     "Provide a directory to search for files",
                 ],
                 global_options=self.global_options,
+                answer_key=f"extra_files.{file_path.config_key}",
             )
 
             if choice == "Provide alternative path for this file":
@@ -320,6 +491,7 @@ class ExtraFilesDiscovery:
                 "Please enter the correct file path (or 'skip' to ignore):",
                 validator=validate_file_path,
                 global_options=self.global_options,
+                answer_key=f"extra_files.{discovered_path.config_key}.path",
             )
 
             if new_path.lower() == "skip":
@@ -360,6 +532,7 @@ class ExtraFilesDiscovery:
                 "Enter directory path:",
                 validator=validate_directory,
                 global_options=self.global_options,
+                answer_key=f"extra_files.{discovered_path.config_key}.directory",
             )
 
             dir_path = Path(search_dir)
@@ -386,6 +559,7 @@ class ExtraFilesDiscovery:
                     "Try another directory?",
                     default=False,
                     global_options=self.global_options,
+                    answer_key=f"extra_files.{discovered_path.config_key}.retry",
                 )
                 if not retry:
                     print_prompt("   ⚠️  Skipping directory search...", style="default", logger=self.summary_logger)
@@ -408,26 +582,6 @@ class ExtraFilesDiscovery:
             )
             print_separator(logger=self.summary_logger)
 
-    def _is_binary_file(self, path: Path) -> bool:
-        """
-        Detect if a file is binary by checking for null bytes.
-
-        Args:
-            path: Path to the file to check
-
-        Returns:
-            True if the file appears to be binary, False otherwise
-        """
-        try:
-            with open(path, "rb") as f:
-                # Read a sample of the file (first 1024 bytes)
-                sample = f.read(1024)
-                # Check for null bytes which are common in binary files
-                return b"\x00" in sample
-        except Exception as e:
-            logger.warning(f"Could not determine if file {path} is binary: {e}")
-            return False
-
     def _discover_extra_file(
         self, discovered_path: DiscoveredPath, override_path: Path | None = None
     ) -> DiscoveredExtraFile:
@@ -445,36 +599,13 @@ class ExtraFilesDiscovery:
             ExtraFilesError: If file doesn't exist or isn't readable
         """
         file_path = override_path or Path(discovered_path.source_path)
-        extra_file = DiscoveredExtraFile(
+        return DiscoveredExtraFile(
             filename=file_path.name,
             discovered_source_paths=[discovered_path],
             source_path=file_path,  # Store path for lazy loading
+            cleartext=_probe_file(file_path),
         )
 
-        # Validate file exists
-        if not file_path.exists():
-            raise ExtraFilesError(f"Extra file does not exist: {file_path}")
-
-        # Validate it's a file (not a directory)
-        if not file_path.is_file():
-            raise ExtraFilesError(f"Extra file path is not a file: {file_path}")
-
-        # Check if file is binary BEFORE attempting to read
-        if self._is_binary_file(file_path):
-            extra_file.cleartext = False
-            # Don't read binary files - they can't be ConfigMaps anyway
-            return extra_file
-
-        # Validate we have permission to read the file
-        try:
-            with open(file_path):
-                pass  # Just test opening, don't read content yet
-        except PermissionError as err:
-            raise ExtraFilesError(f"Permission denied when reading file: {file_path}") from err
-
-        # DON'T read content here - defer to when ConfigMap is created (saves memory)
-        return extra_file
-
 
 class GenericExtraFileDiscovery(ExtraFilesDiscoveryStrategy):
     """Generic extra file discovery for components without special rules."""
@@ -0,0 +1,313 @@
+# Copyright 2026 Element Creations Ltd
+#
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Fleet migrations, which migrate many source deployments listed in a manifest in one invocation.
+"""
+
+import json
+import logging
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from itertools import repeat
+from pathlib import Path
+from typing import Any
+
+from .element_web import ELEMENT_WEB_STRATEGY_NAME
+from .engine import MigrationEngine
+from .hookshot import HOOKSHOT_STRATEGY_NAME
+from .inputs import InputProcessor, ValidationError
+from .mas import MAS_STRATEGY_NAME
+from .models import GlobalOptions
+from .outputs import create_output_dir, generate_helm_values, write_outputs, write_unanswered_prompts
+from .profiling import MigrationProfiler
+from .rich_output import disable_console, print_table
+from .synapse import SYNAPSE_STRATEGY_NAME
+from .utils import UnansweredPromptError, prompt_for_database_choice
+
+logger = logging.getLogger("migration")
+
+# Estate names are a single path component, so that each estate's outputs stay in their own directory
+ESTATE_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+@dataclass
+class Estate:
+    """A source deployment to migrate, with the paths of its configuration files."""
+
+    name: str
+    synapse_config: str
+    mas_config: str | None = None
+    element_web_config: str | None = None
+    well_known_dir: str | None = None
+    well_known_client: str | None = None
+    well_known_server: str | None = None
+    well_known_support: str | None = None
+    hookshot_config: str | None = None
+    database_mode: str | None = None  # "existing" or "ess-managed", prompted for if not set
+    answers: str | None = None  # Path to the answers file for prompts
+
+    def load_inputs(self) -> InputProcessor:
+        """
+        Load the configuration files of all the estate's components.
+
+        Returns:
+            InputProcessor with an input for each component
+
+        Raises:
+            ValidationError: If input validation fails
+        """
+        input_processor = InputProcessor()
+        input_processor.load_migration_input(name=SYNAPSE_STRATEGY_NAME, config_path=self.synapse_config)
+
+        if self.mas_config:
+            input_processor.load_migration_input(name=MAS_STRATEGY_NAME, config_path=self.mas_config)
+
+        if self.element_web_config:
+            input_processor.load_migration_input(name=ELEMENT_WEB_STRATEGY_NAME, config_path=self.element_web_config)
+
+        if self.well_known_dir or self.well_known_client or self.well_known_server or self.well_known_support:
+            input_processor.load_well_known_inputs(
+                dir_path=self.well_known_dir,
+                client_path=self.well_known_client,
+                server_path=self.well_known_server,
+                support_path=self.well_known_support,
+            )
+
+        if self.hookshot_config:
+            input_processor.load_migration_input(name=HOOKSHOT_STRATEGY_NAME, config_path=self.hookshot_config)
+
+        return input_processor
+
+
+@dataclass
+class EstateResult:
+    """The outcome of migrating one estate of a fleet."""
+
+    name: str
+    output_dir: str
+    succeeded: bool = False
+    error: str | None = None
+    duration_seconds: float = 0.0
+    override_warnings: list[str] = field(default_factory=list)
+    underride_warnings: list[str] = field(default_factory=list)
+    conflicts: list[str] = field(default_factory=list)  # ESS paths given different values by different components
+    unanswered_prompts: list[dict[str, Any]] = field(default_factory=list)
+
+
+def load_fleet_manifest(manifest_path: str) -> list[Estate]:
+    """
+    Load the estates listed in a fleet manifest.
+
+    The manifest has an `estates` list, where each estate has a unique `name` and the same options as the
+    command line, in snake_case, e.g. `synapse_config`. Relative paths are relative to the manifest.
+
+    Args:
+        manifest_path: Path to the YAML or JSON fleet manifest
+
+    Returns:
+        The estates to migrate
+
+    Raises:
+        ValidationError: If the manifest is invalid
+    """
+    manifest = InputProcessor.load_yaml_file(manifest_path)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("estates"), list) or not manifest["estates"]:
+        raise ValidationError(f"Fleet manifest {manifest_path} must have a non-empty estates list")
+
+    manifest_dir = Path(manifest_path).parent
+    option_names = {estate_field.name for estate_field in fields(Estate)}
+    path_option_names = option_names - {"name", "database_mode"}
+    estates = []
+    for index, estate_options in enumerate(manifest["estates"]):
+        if (
+            not isinstance(estate_options, dict)
+            or "name" not in estate_options
+            or "synapse_config" not in estate_options
+        ):
+            raise ValidationError(f"Estate {index} of fleet manifest {manifest_path} needs a name and synapse_config")
+        # Names are used as the estate's output directory within the fleet's output directory
+        if not isinstance(estate_options["name"], str) or not ESTATE_NAME_PATTERN.fullmatch(estate_options["name"]):
+            raise ValidationError(
+                f"Estate {index} of fleet manifest {manifest_path} has an invalid name {estate_options['name']!r}, "
+                "names must be letters, digits, '.', '_' or '-' and start with a letter or digit"
+            )
+        unknown_options = set(estate_options) - option_names
+        if unknown_options:
+            raise ValidationError(
+                f"Estate {estate_options['name']} has unknown options: {', '.join(sorted(unknown_options))}"
+            )
+
+        if estate_options.get("database_mode") not in (None, "existing", "ess-managed"):
+            raise ValidationError(f"Estate {estate_options['name']} database_mode must be existing or ess-managed")
+
+        invalid_path_options = sorted(
+            option
+            for option in path_option_names & set(estate_options)
+            if estate_options[option] is not None and not isinstance(estate_options[option], str)
+        )
+        if invalid_path_options:
+            raise ValidationError(
+                f"Estate {estate_options['name']} options must be paths: {', '.join(invalid_path_options)}"
+            )
+
+        estate_options = {
+            option: str(manifest_dir / value) if option in path_option_names and value is not None else value
+            for option, value in estate_options.items()
+        }
+        estates.append(Estate(**estate_options))
+
+    names = [estate.name for estate in estates]
+    duplicate_names = sorted({name for name in names if names.count(name) > 1})
+    if duplicate_names:
+        raise ValidationError(f"Fleet manifest {manifest_path} has duplicate estates: {', '.join(duplicate_names)}")
+    return estates
+
+
+def migrate_estate(estate: Estate, output_dir: str, profile: bool = False) -> EstateResult:
+    """
+    Migrate one estate without prompting, writing its outputs and summary log to its own output directory.
+
+    This runs in a worker process, so any failure is returned in the result rather than raised.
+
+    Args:
+        estate: The estate to migrate
+        output_dir: The estate's output directory
+        profile: Write the timings of the migration's phases to migration-profile.json in the output directory
+
+    Returns:
+        The outcome of the migration
+    """
+    start = time.monotonic()
+    result = EstateResult(name=estate.name, output_dir=output_dir)
+
+    # The summary and logs of each estate go to its own log rather than being interleaved on the console.
+    # Workers forked from the main process inherit its handlers, so they are set aside for the migration
+    disable_console()
+    inherited_handlers = logger.handlers[:]
+    for handler in inherited_handlers:
+        logger.removeHandler(handler)
+    summary_logger = logging.getLogger(f"migration:summary:{estate.name}")
+    summary_logger.propagate = False
+    summary_logger.setLevel(logging.INFO)
+    summary_fh = None
+
+    global_options = GlobalOptions(
+        quiet_mode=True, non_interactive=True, profiler=MigrationProfiler() if profile else None
+    )
+    if global_options.profiler:
+        global_options.profiler.start()
+    try:
+        # Within the try so that an estate whose output directory can't be created fails on its own
+        create_output_dir(output_dir)
+        summary_fh = logging.FileHandler(Path(output_dir) / "migration-summary.log")
+        summary_fh.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        summary_logger.addHandler(summary_fh)
+        logger.addHandler(summary_fh)
+
+        input_processor = estate.load_inputs()
+        if estate.answers:
+            global_options.answers = InputProcessor.load_answers(estate.answers)
+        if estate.database_mode:
+            global_options.use_existing_database = estate.database_mode == "existing"
+        else:
+            global_options.use_existing_database = prompt_for_database_choice(summary_logger, global_options)
+
+        engine = MigrationEngine(
+            input_processor=input_processor, summary_logger=summary_logger, global_options=global_options
+        )
+        ess_values = engine.run_migration()
+        result.override_warnings = engine.override_warnings
+        result.underride_warnings = engine.underride_warnings
+        result.conflicts = sorted(engine.value_source_tracking.get_conflicts())
+        if global_options.unanswered_prompts:
+            raise UnansweredPromptError(
+                f"{len(global_options.unanswered_prompts)} prompts have no answer in non-interactive mode"
+            )
+
+        write_outputs(
+            helm_values=generate_helm_values(ess_values),
+            secrets=engine.secrets,
+            configmaps=engine.configmaps,
+            output_dir=output_dir,
+        )
+        result.succeeded = True
+    except Exception as e:
+        logger.error(f"Migration of {estate.name} failed: {e}")
+        result.error = str(e)
+        if global_options.unanswered_prompts:
+            write_unanswered_prompts(global_options.unanswered_prompts, output_dir)
+    finally:
+        if summary_fh:
+            summary_logger.removeHandler(summary_fh)
+            logger.removeHandler(summary_fh)
+            summary_fh.close()
+        for handler in inherited_handlers:
+            logger.addHandler(handler)
+        if global_options.profiler:
+            global_options.profiler.stop()
+            if Path(output_dir).is_dir():
+                global_options.profiler.write(Path(output_dir) / "migration-profile.json")
+
+    result.unanswered_prompts = global_options.unanswered_prompts
+    result.duration_seconds = round(time.monotonic() - start, 3)
+    return result
+
+
+def run_fleet(
+    manifest_path: str,
+    output_dir: str,
+    summary_logger: logging.Logger,
+    max_workers: int | None = None,
+    profile: bool = False,
+) -> list[EstateResult]:
+    """
+    Migrate every estate of a fleet manifest in a process pool.
+
+    Each estate's outputs are written to a directory named after it in the output directory, and the outcome
+    of all of them to fleet-summary.json.
+
+    Args:
+        manifest_path: Path to the fleet manifest
+        output_dir: Directory to write each estate's output directory and the fleet summary to
+        summary_logger: Logger for the aggregate summary
+        max_workers: Number of estates to migrate at once, defaults to the number of CPUs
+        profile: Write the timings of each estate's migration to migration-profile.json in its directory
+
+    Returns:
+        The outcome of each estate, in manifest order
+
+    Raises:
+        ValidationError: If the manifest is invalid
+    """
+    estates = load_fleet_manifest(manifest_path)
+    estate_output_dirs = [str(Path(output_dir) / estate.name) for estate in estates]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(migrate_estate, estates, estate_output_dirs, repeat(profile)))
+
+    print_table(
+        [
+            [
+                result.name,
+                "✅" if result.succeeded else f"❌ {result.error}",
+                len(result.override_warnings),
+                len(result.underride_warnings),
+                ", ".join(result.conflicts),
+                f"{result.duration_seconds:.1f}s",
+            ]
+            for result in results
+        ],
+        headers=["Estate", "Result", "Overrides", "Underrides", "Conflicts", "Duration"],
+        title="🚚 FLEET MIGRATION SUMMARY",
+        logger=summary_logger,
+    )
+
+    summary_path = Path(output_dir) / "fleet-summary.json"
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump({"estates": [asdict(result) for result in results]}, f, indent=2)
+    logger.info(f"Fleet summary written to {summary_path}")
+    return results
@@ -10,17 +10,28 @@ Handles loading and parsing of configuration files.
 
 import json
 import logging
+import mmap
+import os
+import stat
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal, overload
 
 import yaml
 
 from .models import MigrationError, MigrationInput
 from .well_known import WELL_KNOWN_FILE_PATTERNS, WELL_KNOWN_STRATEGY_NAMES
 
+try:
+    from yaml import CSafeLoader as FastSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as FastSafeLoader  # type: ignore[assignment]
+
 logger = logging.getLogger("migration")
 
+# YAML files at least this large are memory-mapped for parsing rather than read into memory first
+MMAP_MIN_FILE_SIZE = 4 * 1024 * 1024
+
 
 class ValidationError(MigrationError):
     """Exception for input validation failures."""
@@ -50,12 +61,15 @@ class InputProcessor:
         return None
 
     @staticmethod
-    def load_yaml_file(path: str) -> dict[str, Any]:
+    def load_yaml_file(path: str, use_mmap: bool | None = None) -> dict[str, Any]:
         """
         Load and parse a YAML file.
 
+        The file is parsed with libyaml when it is available, and is validated and read with a single open.
+
         Args:
             path: Path to the YAML file
+            use_mmap: Memory-map the file rather than reading it, defaults to doing so for large files
 
         Returns:
             Parsed YAML content as dictionary
@@ -66,11 +80,13 @@ class InputProcessor:
             ValidationError: If file validation fails
         """
         try:
-            # Validate file exists and is readable
-            InputProcessor._validate_file_path(path)
-
-            with open(path, encoding="utf-8") as f:
-                content = yaml.safe_load(f) or {}
+            # Validate file exists and is readable, with the same open as reading it
+            data = InputProcessor._read_file(path, use_mmap=use_mmap)
+            try:
+                content = yaml.load(data, Loader=FastSafeLoader) or {}
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
 
             # Validate YAML content is not empty for required files
             if not content:
@@ -98,11 +114,8 @@ class InputProcessor:
             ValidationError: If file validation fails
         """
         try:
-            # Validate file exists and is readable
-            InputProcessor._validate_file_path(path)
-
-            with open(path, encoding="utf-8") as f:
-                content = json.load(f) or {}
+            # Validate file exists and is readable, with the same open as reading it
+            content = json.loads(InputProcessor._read_file(path, use_mmap=False)) or {}
 
             # Validate JSON content is not empty for required files
             if not content:
@@ -116,34 +129,67 @@ class InputProcessor:
             logger.error(f"Failed to load JSON file {path}: {e}")
             raise
 
+    @overload
+    @staticmethod
+    def _read_file(path: str, use_mmap: Literal[False]) -> bytes: ...
+
+    @overload
+    @staticmethod
+    def _read_file(path: str, use_mmap: bool | None = None) -> bytes | mmap.mmap: ...
+
     @staticmethod
-    def _validate_file_path(path: str) -> None:
+    def _read_file(path: str, use_mmap: bool | None = None) -> bytes | mmap.mmap:
         """
-        Validate that a file path exists and is readable.
+        Validate that a file path exists and is readable, and read it with the same open.
 
         Args:
-            path: Path to validate
+            path: Path to validate and read
+            use_mmap: Memory-map the file rather than reading it, defaults to doing so for large files
+
+        Returns:
+            The content of the file, or a read-only memory map of it that the caller must close
 
         Raises:
             ValidationError: If file doesn't exist or isn't readable
         """
-        file_path = Path(path)
+        try:
+            with open(path, "rb") as f:
+                file_stat = os.fstat(f.fileno())
+                if not stat.S_ISREG(file_stat.st_mode):
+                    raise ValidationError(f"Path is not a file: {path}")
+
+                if not file_stat.st_size > 0:
+                    logger.warning(f"File is empty: {path}")
+                    return b""
+
+                if use_mmap if use_mmap is not None else file_stat.st_size >= MMAP_MIN_FILE_SIZE:
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                return f.read()
+        except FileNotFoundError as err:
+            raise ValidationError(f"File does not exist: {path}") from err
+        except IsADirectoryError as err:
+            raise ValidationError(f"Path is not a file: {path}") from err
+        except PermissionError as err:
+            raise ValidationError(f"No read permission for file: {path}") from err
 
-        if not file_path.exists():
-            raise ValidationError(f"File does not exist: {path}")
+    @staticmethod
+    def load_answers(path: str) -> dict[str, Any]:
+        """
+        Load the answers to prompts for non-interactive migrations.
 
-        if not file_path.is_file():
-            raise ValidationError(f"Path is not a file: {path}")
+        Args:
+            path: Path to a YAML or JSON file mapping answer keys to answers
 
-        if not file_path.stat().st_size > 0:
-            logger.warning(f"File is empty: {path}")
+        Returns:
+            Answers by answer key
 
-        # Check read permissions
-        try:
-            with open(path):
-                pass  # Just test opening
-        except PermissionError as err:
-            raise ValidationError(f"No read permission for file: {path}") from err
+        Raises:
+            ValidationError: If the file isn't a mapping of answers
+        """
+        answers = InputProcessor.load_yaml_file(path)
+        if not isinstance(answers, dict):
+            raise ValidationError(f"Answers file {path} must contain a mapping of answer keys to answers")
+        return {str(answer_key): answer for answer_key, answer in answers.items()}
 
     def load_migration_input(
         self,
@@ -8,9 +8,15 @@ Migration service.
 """
 
 import base64
-import copy
+import codecs
+import gzip
+import hashlib
+import io
 import logging
+import shlex
+from contextlib import AbstractContextManager
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
 from .conflicts import DiscoveredSecretTracking
@@ -25,20 +31,270 @@ from .models import (
     TransformationSpec,
     ValueSourceTracking,
 )
+from .profiling import (
+    ADDITIONAL_CONFIG_FILTERING_PHASE,
+    EXTRA_FILE_DISCOVERY_PHASE,
+    MOUNTS_PHASE,
+    SECRET_DISCOVERY_PHASE,
+    SECRETS_PHASE,
+    TRANSFORMATIONS_PHASE,
+    profile_phase,
+)
 from .secrets import SecretDiscovery
 from .utils import (
+    filter_out_paths,
     find_matching_schema_key,
     get_nested_value,
     press_enter_to_continue,
-    remove_nested_value,
     set_nested_value,
-    sort_tracked_values_for_filtering,
     to_kebab_case,
     yaml_dump_with_pipe_for_multiline,
 )
 
 logger = logging.getLogger("migration")
 
+# Size of the chunks extra files are read in when hashing or gzipping them
+EXTRA_FILE_CHUNK_SIZE = 64 * 1024
+
+# Kubernetes' limit on the total size of the keys and values of a ConfigMap
+CONFIGMAP_MAX_DATA_SIZE = 1024 * 1024
+
+# Default image of the init container that unpacks gzipped extra files, which needs sh, mkdir, cp and gunzip
+UNPACK_IMAGE = "docker.io/library/busybox:1.37"
+
+
+def _digest_text_file(path: Path) -> str:
+    """
+    Hash the content of a UTF-8 text file, reading it in chunks rather than all at once.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex SHA-256 digest of the file content
+
+    Raises:
+        OSError: If the file can't be read
+        UnicodeDecodeError: If the file isn't valid UTF-8
+    """
+    digest = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        while chunk := f.read(EXTRA_FILE_CHUNK_SIZE):
+            decoder.decode(chunk)
+            digest.update(chunk)
+    decoder.decode(b"", final=True)
+    return digest.hexdigest()
+
+
+def _gzip_file(path: Path, max_size: int) -> bytes | None:
+    """
+    Gzip the content of a file, reading it in chunks rather than all at once.
+
+    Args:
+        path: Path to the file
+        max_size: Maximum size of the gzipped content
+
+    Returns:
+        The gzipped content, or None if it is larger than max_size
+
+    Raises:
+        OSError: If the file can't be read
+    """
+    buffer = io.BytesIO()
+    # No mtime so that the gzipped content only depends on the file content
+    with open(path, "rb") as f, gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gzip_file:
+        while chunk := f.read(EXTRA_FILE_CHUNK_SIZE):
+            gzip_file.write(chunk)
+            if buffer.tell() > max_size:
+                return None
+    return buffer.getvalue() if buffer.tell() <= max_size else None
+
+
+def _pack_configmap_keys(key_sizes: dict[str, int], max_size: int) -> list[list[str]]:
+    """
+    Pack ConfigMap keys into as few ConfigMaps as possible, keeping the total size of each under max_size.
+
+    This is a first-fit decreasing bin packing, so places the largest keys first.
+
+    Args:
+        key_sizes: Size of each key, including its content
+        max_size: Maximum total size of the keys of a ConfigMap
+
+    Returns:
+        The keys of each ConfigMap, in the order of key_sizes
+    """
+    bin_sizes: list[int] = []
+    bin_by_key: dict[str, int] = {}
+    for key, size in sorted(key_sizes.items(), key=lambda item: (-item[1], item[0])):
+        bin_index = next(
+            (index for index, bin_size in enumerate(bin_sizes) if bin_size + size <= max_size), len(bin_sizes)
+        )
+        if bin_index == len(bin_sizes):
+            bin_sizes.append(0)
+        bin_sizes[bin_index] += size
+        bin_by_key[key] = bin_index
+
+    bins: list[list[str]] = [[] for _ in bin_sizes]
+    for key in key_sizes:
+        bins[bin_by_key[key]].append(key)
+    return bins
+
+
+def _unpack_init_container(
+    unpacked_files: dict[str, tuple[str, str, bool]], unpacked_volume_name: str, image: str
+) -> dict[str, Any]:
+    """
+    Build an init container that unpacks gzipped files, and copies the other files of their directories, into a volume.
+
+    Args:
+        unpacked_files: For each path to unpack to within the volume, the name of the ConfigMap the file is in,
+            its key, and whether it's gzipped. ConfigMaps are mounted from volumes of the same names
+        unpacked_volume_name: Name of the volume to unpack the files into
+        image: Image of the init container, which needs sh, mkdir, cp and gunzip
+
+    Returns:
+        The init container
+    """
+    unpacked_dirs = dict.fromkeys(
+        str(Path(unpacked_path).parent) for unpacked_path in unpacked_files if "/" in unpacked_path
+    )
+    commands = [f"mkdir -p {shlex.quote(f'/unpacked/{unpacked_dir}')}" for unpacked_dir in unpacked_dirs]
+    for unpacked_path, (configmap_name, key, gzipped) in unpacked_files.items():
+        imported_path = shlex.quote(f"/imported/{configmap_name}/{key}")
+        quoted_unpacked_path = shlex.quote(f"/unpacked/{unpacked_path}")
+        if gzipped:
+            commands.append(f"gunzip -c {imported_path} > {quoted_unpacked_path}")
+        else:
+            commands.append(f"cp {imported_path} {quoted_unpacked_path}")
+    configmap_names = dict.fromkeys(configmap_name for configmap_name, _, _ in unpacked_files.values())
+    return {
+        "name": "unpack-imported-files",
+        "image": image,
+        "command": ["sh", "-c", " && ".join(commands)],
+        "volumeMounts": [
+            {"name": configmap_name, "mountPath": f"/imported/{configmap_name}", "readOnly": True}
+            for configmap_name in configmap_names
+        ]
+        + [{"name": unpacked_volume_name, "mountPath": "/unpacked"}],
+        "securityContext": {
+            "allowPrivilegeEscalation": False,
+            "capabilities": {"drop": ["ALL"]},
+            "readOnlyRootFilesystem": True,
+        },
+    }
+
+
+def _packed_configmaps(
+    configmap_name: str,
+    configmap_key_sizes: dict[str, int],
+    configmap_files: dict[str, Path],
+    configmap_file_digests: dict[str, str],
+    compressed_files: dict[str, bytes],
+) -> tuple[list[ConfigMap], dict[str, str]]:
+    """
+    Split the files to import across as many ConfigMaps as are needed to keep each under the size limit.
+
+    Args:
+        configmap_name: Name of the first ConfigMap, the others are numbered after it
+        configmap_key_sizes: Size of each ConfigMap key, including its content
+        configmap_files: Source file of each ConfigMap key stored as is
+        configmap_file_digests: Digest of the content of each of configmap_files
+        compressed_files: Gzipped content of each ConfigMap key too large to be stored as is
+
+    Returns:
+        The ConfigMaps, and the name of the ConfigMap each key is in
+    """
+    configmaps: list[ConfigMap] = []
+    configmap_names_by_key: dict[str, str] = {}
+    for index, keys in enumerate(_pack_configmap_keys(configmap_key_sizes, CONFIGMAP_MAX_DATA_SIZE)):
+        name = configmap_name if index == 0 else f"{configmap_name}-{index + 1}"
+        configmaps.append(
+            ConfigMap(
+                name=name,
+                data={},
+                files={key: configmap_files[key] for key in keys if key in configmap_files},
+                file_digests={key: configmap_file_digests[key] for key in keys if key in configmap_files},
+                binary_data={
+                    f"{key}.gz": base64.b64encode(compressed_files[key]).decode("ascii")
+                    for key in keys
+                    if key in compressed_files
+                },
+            )
+        )
+        configmap_names_by_key.update(dict.fromkeys(keys, name))
+    return configmaps, configmap_names_by_key
+
+
+def _mounted_files(
+    extra_files_discovery: ExtraFilesDiscovery, configmap_keys: dict[Path, str]
+) -> list[tuple[Path, str, str]]:
+    """
+    List the files to mount for the paths of the configuration that weren't skipped.
+
+    Args:
+        extra_files_discovery: The discovered extra files
+        configmap_keys: ConfigMap key of each imported file, by its source path
+
+    Returns:
+        The source file or directory, path relative to the base mount path and ConfigMap key of each mounted file
+    """
+    mounted_files: list[tuple[Path, str, str]] = []
+    for extra_file in extra_files_discovery.discovered_extra_files.values():
+        for discovered_path in extra_file.discovered_source_paths:
+            if discovered_path.skipped_reason:
+                continue
+
+            # See update_paths_in_config() for the `additional` side of this behaviour
+            # If it is a directory, files must be mounted as child of the directory name
+            # If it is a file, files must be mounted as child of the `extra` folder
+            if discovered_path.is_dir:
+                mounted_path = f"{discovered_path.source_path.name}/{extra_file.filename}"
+            else:
+                mounted_path = extra_file.filename
+            sub_path = (
+                configmap_keys.get(extra_file.source_path, extra_file.filename)
+                if extra_file.source_path is not None
+                else extra_file.filename
+            )
+            mounted_files.append((discovered_path.source_path, mounted_path, sub_path))
+    return mounted_files
+
+
+def _unpacked_files(
+    mounted_files: list[tuple[Path, str, str]],
+    compressed_files: dict[str, bytes],
+    configmap_names_by_key: dict[str, str],
+) -> tuple[set[Path], dict[str, tuple[str, str, bool]]]:
+    """
+    Find the mounted files to unpack into a volume rather than mount with a subPath.
+
+    Gzipped files can't be mounted with a subPath of the volume they're unpacked into, as the chart's own
+    init containers mount extraVolumeMounts and run before extraInitContainers. The kubelet would create the
+    missing subPaths as directories before the files are unpacked. Instead, gzipped files, and the whole
+    directories they're in, are unpacked into a volume mounted as a directory, which the config points at.
+
+    Args:
+        mounted_files: The source file or directory, path relative to the base mount path and ConfigMap key
+            of each mounted file
+        compressed_files: Gzipped content of each ConfigMap key too large to be stored as is
+        configmap_names_by_key: Name of the ConfigMap each key is in
+
+    Returns:
+        The source files and directories to unpack, and the files to unpack as for _unpack_init_container()
+    """
+    unpacked_source_paths = {source_path for source_path, _, sub_path in mounted_files if sub_path in compressed_files}
+    unpacked_files: dict[str, tuple[str, str, bool]] = {}
+    for source_path, mounted_path, sub_path in mounted_files:
+        if source_path in unpacked_source_paths:
+            gzipped = sub_path in compressed_files
+            unpacked_files[mounted_path] = (
+                configmap_names_by_key[sub_path],
+                f"{sub_path}.gz" if gzipped else sub_path,
+                gzipped,
+            )
+    return unpacked_source_paths, unpacked_files
+
 
 def additional_config_transformer(
     config_value_transformer: "ConfigValueTransformer",
@@ -85,41 +341,41 @@ def additional_config_transformer(
         config_value_transformer.strategy_name
     )
 
-    filtered_config = copy.deepcopy(source_config)
-
-    # Filter out values already processed by other transformations
-    # Sort tracked values so list indices are removed in descending order to avoid shifting
-    sorted_tracked = sort_tracked_values_for_filtering(tracked_source_paths)
-    for source_path in sorted_tracked:
-        remove_nested_value(filtered_config, source_path, remove_empty_parent=True)
-
-    # Note: This runs after filtering so we check the remaining config
-    # Store warnings for future engine logging
-    config_path_suffix = f'["{file_name}"].config' if use_file_object_format else f'["{file_name}"]'
-
-    # Check for override configs (ESS-managed values that users should not override)
-    if override_configs and component_root_key:
-        for override_config in override_configs:
-            if get_nested_value(filtered_config, override_config) is not None:
-                warning = (
-                    f"⚠️  '{override_config}' found in {component_root_key}.additional"
-                    f"{config_path_suffix} - ESS manages this, your setting may be ignored"
-                )
-                config_value_transformer.override_warnings.append(warning)
-
-    # Check for underride configs (ESS defaults that users can override)
-    if underride_configs and component_root_key:
-        for underride_config in underride_configs:
-            if get_nested_value(filtered_config, underride_config) is not None:
-                warning = (
-                    f"ℹ️  '{underride_config}' found in {component_root_key}.additional"
-                    f"{config_path_suffix} - ESS default, your value overrides it"
-                )
-                config_value_transformer.underride_warnings.append(warning)
+    with profile_phase(
+        config_value_transformer.global_options.profiler,
+        config_value_transformer.strategy_name,
+        ADDITIONAL_CONFIG_FILTERING_PHASE,
+    ):
+        # Filter out values already processed by other transformations in a single pass over the config
+        filtered_config = filter_out_paths(source_config, tracked_source_paths)
+
+        # Note: This runs after filtering so we check the remaining config
+        # Store warnings for future engine logging
+        config_path_suffix = f'["{file_name}"].config' if use_file_object_format else f'["{file_name}"]'
+
+        # Check for override configs (ESS-managed values that users should not override)
+        if override_configs and component_root_key:
+            for override_config in override_configs:
+                if get_nested_value(filtered_config, override_config) is not None:
+                    warning = (
+                        f"⚠️  '{override_config}' found in {component_root_key}.additional"
+                        f"{config_path_suffix} - ESS manages this, your setting may be ignored"
+                    )
+                    config_value_transformer.override_warnings.append(warning)
+
+        # Check for underride configs (ESS defaults that users can override)
+        if underride_configs and component_root_key:
+            for underride_config in underride_configs:
+                if get_nested_value(filtered_config, underride_config) is not None:
+                    warning = (
+                        f"ℹ️  '{underride_config}' found in {component_root_key}.additional"
+                        f"{config_path_suffix} - ESS default, your value overrides it"
+                    )
+                    config_value_transformer.underride_warnings.append(warning)
 
-    # Update file paths if extra files were discovered
-    if extra_files_discovery:
-        config_value_transformer.update_paths_in_config(filtered_config, extra_files_discovery)
+        # Update file paths if extra files were discovered
+        if extra_files_discovery:
+            config_value_transformer.update_paths_in_config(filtered_config, extra_files_discovery)
 
     # Check if there are existing entries in the component's additional section
     component_config = config_value_transformer.ess_config.get(component_root_key, {})
@@ -180,6 +436,9 @@ class ConfigValueTransformer:
     override_warnings: list[str] = field(default_factory=list)  # Warnings about ESS-managed overrides
     underride_warnings: list[str] = field(default_factory=list)  # Warnings about ESS default configurations
     strategy_name: str = ""  # Name of the strategy (for source tracking)
+    unpacked_source_paths: set[Path] = field(
+        default_factory=set
+    )  # Extra files and directories mounted from the volume gzipped files are unpacked into
 
     def transform_from_config(
         self,
@@ -277,12 +536,18 @@ class ConfigValueTransformer:
     ):
         # Get the base mount path for the component
         base_mount_path = f"/etc/{extra_files_discovery.strategy.component_root_key}/extra"
+        unpacked_mount_path = f"/etc/{extra_files_discovery.strategy.component_root_key}/extra-unpacked"
         for discovered_path in extra_files_discovery.discovered_file_paths:
             if discovered_path.skipped_reason:
                 continue
             # If it is a directory, files will be mounted as child of the directory name
             # If it is a file, files will be mounted as child of the `extra` folder
-            mounted_path = f"{base_mount_path}/{discovered_path.source_path.name}"
+            # See _unpacked_files() for why files and directories with gzipped files are elsewhere
+            mounted_path = (
+                f"{unpacked_mount_path}/{discovered_path.source_path.name}"
+                if discovered_path.source_path in self.unpacked_source_paths
+                else f"{base_mount_path}/{discovered_path.source_path.name}"
+            )
             original_value = get_nested_value(source_config, discovered_path.config_key)
             set_nested_value(source_config, discovered_path.config_key, mounted_path)
             logging.info(f"Updated config: {discovered_path.config_key} = {original_value} -> {mounted_path}")
@@ -341,7 +606,9 @@ class ConfigValueTransformer:
             credential_config = {"secret": owning_secret_name, "secretKey": secret_key}
 
             # Validate that the secret key matches a schema entry (supports wildcard patterns)
-            matching_key = find_matching_schema_key(secret_key, secret_discovery.strategy.ess_secret_schema)
+            matching_key = find_matching_schema_key(
+                secret_key, secret_discovery.strategy.ess_secret_schema, secret_discovery.schema_matcher
+            )
             if matching_key is None:
                 raise RuntimeError(f"No ESS configuration mapping found for secret key: {secret_key}")
 
@@ -359,14 +626,18 @@ class ConfigValueTransformer:
         base_mount_path = f"/etc/{component_root_key}/extra"
 
         configmap_name = f"imported-{to_kebab_case(component_root_key)}"
+        unpacked_volume_name = f"{configmap_name}-unpacked"
         extra_volume_mounts: list[dict[str, Any]] = []
         extra_volumes: list[dict[str, Any]] = []
 
-        configmap_data = {}
-
-        # Maximum file size to load into ConfigMap (1MB)
-        # Larger files are skipped to prevent memory issues
-        MAX_EXTRA_FILE_SIZE = 1 * 1024 * 1024
+        # ConfigMap keys of the files to import, whose content is only read again when the ConfigMap is written
+        configmap_files: dict[str, Path] = {}
+        configmap_file_digests: dict[str, str] = {}
+        # ConfigMap keys of the files too large for a ConfigMap, gzipped to be unpacked by an init container
+        compressed_files: dict[str, bytes] = {}
+        configmap_key_sizes: dict[str, int] = {}
+        configmap_keys: dict[Path, str] = {}
+        configmap_keys_by_digest: dict[str, str] = {}
 
         for discovered_extra_file in extra_files_discovery.discovered_extra_files.values():
             # Skip non-cleartext files (binary files)
@@ -374,32 +645,68 @@ class ConfigValueTransformer:
                 logger.debug(f"Skipping non-cleartext file: {discovered_extra_file.filename}")
                 continue
 
-            # Skip files that are too large
-            if (
-                discovered_extra_file.source_path is not None
-                and discovered_extra_file.source_path.stat().st_size > MAX_EXTRA_FILE_SIZE
-            ):
-                logger.warning(
-                    f"Skipping large file {discovered_extra_file.source_path} "
-                    f"({discovered_extra_file.source_path.stat().st_size} bytes > {MAX_EXTRA_FILE_SIZE} bytes)"
-                )
-                press_enter_to_continue(self.summary_logger, self.global_options)
+            source_path = discovered_extra_file.source_path
+            if source_path is None:
+                logger.warning(f"No source_path for discovered extra file: {discovered_extra_file.filename}")
                 continue
 
-            # Read content from source_path (lazy loading - content read once here, not during discovery)
-            if discovered_extra_file.source_path is not None:
-                try:
-                    with open(discovered_extra_file.source_path, encoding="utf-8") as f:
-                        content = f.read()
-                    configmap_data[discovered_extra_file.filename] = content
-                except Exception as e:
-                    logger.warning(f"Failed to read file {discovered_extra_file.source_path}: {e}")
-                    continue
-            else:
-                logger.warning(f"No source_path for discovered extra file: {discovered_extra_file.filename}")
+            # Hash the content from source_path (lazy loading - content not read during discovery)
+            try:
+                file_size = source_path.stat().st_size
+                digest = _digest_text_file(source_path)
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"Failed to read file {source_path}: {e}")
+                continue
+
+            # Files with the same content share a ConfigMap key, mounted at each of their paths
+            if digest in configmap_keys_by_digest:
+                configmap_key = configmap_keys_by_digest[digest]
+                logger.debug(f"{source_path} has the same content as ConfigMap key {configmap_key}, sharing it")
+                configmap_keys[source_path] = configmap_key
                 continue
 
-        configmap = ConfigMap(name=configmap_name, data=configmap_data)
+            configmap_key = discovered_extra_file.filename
+            if configmap_key in configmap_key_sizes:
+                # A different file with the same name
+                configmap_key = f"{Path(configmap_key).stem}-{digest[:8]}{Path(configmap_key).suffix}"
+
+            if len(configmap_key.encode()) + file_size <= CONFIGMAP_MAX_DATA_SIZE:
+                configmap_files[configmap_key] = source_path
+                configmap_file_digests[configmap_key] = digest
+                configmap_key_sizes[configmap_key] = len(configmap_key.encode()) + file_size
+            else:
+                compressed = None
+                if self.global_options.compress_large_extra_files:
+                    try:
+                        compressed = _gzip_file(
+                            source_path, CONFIGMAP_MAX_DATA_SIZE - len(f"{configmap_key}.gz".encode())
+                        )
+                    except OSError as e:
+                        logger.warning(f"Failed to read file {source_path}: {e}")
+                        continue
+
+                # Skip files that are too large
+                if compressed is None:
+                    logger.warning(
+                        f"Skipping large file {source_path} "
+                        f"({file_size} bytes > {CONFIGMAP_MAX_DATA_SIZE} bytes"
+                        f"{', even when gzipped' if self.global_options.compress_large_extra_files else ''})"
+                    )
+                    press_enter_to_continue(self.summary_logger, self.global_options)
+                    continue
+
+                logger.info(f"Gzipped large file {source_path} from {file_size} to {len(compressed)} bytes")
+                compressed_files[configmap_key] = compressed
+                configmap_key_sizes[configmap_key] = len(f"{configmap_key}.gz".encode()) + len(compressed)
+
+            configmap_keys_by_digest[digest] = configmap_key
+            configmap_keys[source_path] = configmap_key
+
+        configmaps, configmap_names_by_key = _packed_configmaps(
+            configmap_name, configmap_key_sizes, configmap_files, configmap_file_digests, compressed_files
+        )
+        if not configmaps:
+            configmaps.append(ConfigMap(name=configmap_name, data={}))
 
         # Add skipped paths to tracking for filtering
         for discovered_path in extra_files_discovery.discovered_file_paths:
@@ -411,29 +718,45 @@ class ConfigValueTransformer:
                     source_path=discovered_path.config_key,
                 )
 
-        for extra_file in extra_files_discovery.discovered_extra_files.values():
-            for discovered_path in extra_file.discovered_source_paths:
-                if discovered_path.skipped_reason:
-                    continue
+        mounted_files = _mounted_files(extra_files_discovery, configmap_keys)
+        self.unpacked_source_paths, unpacked_files = _unpacked_files(
+            mounted_files, compressed_files, configmap_names_by_key
+        )
+        for source_path, mounted_path, sub_path in mounted_files:
+            # See _unpacked_files() for why these aren't mounted with a subPath
+            if source_path in self.unpacked_source_paths:
+                continue
 
-                # See update_paths_in_config() for the `additional` side of this behaviour
-                # If it is a directory, files must be mounted as child of the directory name
-                # If it is a file, files must be mounted as child of the `extra` folder
-                if discovered_path.is_dir:
-                    mounted_path = f"{base_mount_path}/{discovered_path.source_path.name}/{extra_file.filename}"
-                else:
-                    mounted_path = f"{base_mount_path}/{extra_file.filename}"
-                extra_volume_mounts.append(
-                    {"name": configmap_name, "mountPath": mounted_path, "subPath": extra_file.filename}
-                )
-        if extra_volume_mounts:
-            extra_volumes.append(
-                {
-                    "name": configmap_name,
-                    "configMap": {"name": configmap_name},
-                }
+            extra_volume_mount = {
+                "name": configmap_names_by_key.get(sub_path, configmap_name),
+                "mountPath": f"{base_mount_path}/{mounted_path}",
+                "subPath": sub_path,
+            }
+            # The same file or directory can be used by several configuration keys
+            if extra_volume_mount not in extra_volume_mounts:
+                extra_volume_mounts.append(extra_volume_mount)
+        if unpacked_files:
+            extra_volume_mounts.append(
+                {"name": unpacked_volume_name, "mountPath": f"/etc/{component_root_key}/extra-unpacked"}
             )
-            config_maps.append(configmap)
+
+        if extra_volume_mounts:
+            for configmap in configmaps:
+                extra_volumes.append(
+                    {
+                        "name": configmap.name,
+                        "configMap": {"name": configmap.name},
+                    }
+                )
+                config_maps.append(configmap)
+
+            if unpacked_files:
+                extra_volumes.append({"name": unpacked_volume_name, "emptyDir": {}})
+                config.setdefault("extraInitContainers", []).append(
+                    _unpack_init_container(
+                        unpacked_files, unpacked_volume_name, self.global_options.unpack_image or UNPACK_IMAGE
+                    )
+                )
 
         extra_volume_mounts.sort(key=lambda x: x["mountPath"])
 
@@ -472,6 +795,9 @@ class MigrationService:
     results: list[TransformationResult] = field(default_factory=list)  # List of transformation results
     global_options: GlobalOptions = field(default_factory=GlobalOptions)  # Global migration options
     secret_discovery: SecretDiscovery | None = field(default=None)  # Secret discovery instance for this migrator
+    extra_files_discovery: ExtraFilesDiscovery | None = field(
+        default=None
+    )  # Extra files discovery instance for this migrator
 
     def __post_init__(self):
         self.override_configs = self.migration.override_configs
@@ -494,21 +820,16 @@ class MigrationService:
                 global_options=self.global_options,
                 secret_tracking=self.secret_tracking,
             )
-            self.secret_discovery.discover_secrets(self.input.config)
+            with self.profile_phase(SECRET_DISCOVERY_PHASE):
+                self.secret_discovery.discover_secrets(self.input.config)
             # Note: prompt_for_missing_secrets() and validate_required_secrets()
             # are called in MigrationEngine after all strategies have run
         else:
             self.secret_discovery = None
 
-        # Step 2: Discover extra files
-        extra_files_discovery = ExtraFilesDiscovery(
-            source_file=self.input.config_path,
-            strategy=self.extra_files_strategy,
-            secrets_strategy=self.secret_discovery_strategy,
-            summary_logger=self.summary_logger,
-            global_options=self.global_options,
-        )
-        extra_files_discovery.discover_extra_files_from_config(self.input.config)
+        # Step 2: Discover extra files, unless the engine already has done so concurrently with other migrators
+        extra_files_discovery = self.extra_files_discovery or self.discover_extra_files()
+        extra_files_discovery.report_discovered_directories()
         # Prompt for missing files then validate
         extra_files_discovery.prompt_for_missing_files()
         extra_files_discovery.validate_extra_files()
@@ -528,25 +849,58 @@ class MigrationService:
 
         # Step 3: Handle extra files mounts for the component using the transformer's method
         # This will update the root ESS config directly and create Kubernetes ConfigMaps
-        config_to_ess_transformer.handle_extra_files_mounts(
-            extra_files_discovery,
-            self.extra_files_strategy.component_root_key,
-            self.configmaps,
-        )
+        with self.profile_phase(MOUNTS_PHASE):
+            config_to_ess_transformer.handle_extra_files_mounts(
+                extra_files_discovery,
+                self.extra_files_strategy.component_root_key,
+                self.configmaps,
+            )
 
         # Step 4: Apply component transformations
         # Note: component_root_key and other context are passed through TransformationSpec lambdas
-        config_to_ess_transformer.transform_from_config(
-            self.input.config,
-            self.migration.transformations,
-            extra_files_discovery=extra_files_discovery,
-        )
+        # The additional config filtering done by the transformations is timed as its own phase when profiling
+        with self.profile_phase(TRANSFORMATIONS_PHASE):
+            config_to_ess_transformer.transform_from_config(
+                self.input.config,
+                self.migration.transformations,
+                extra_files_discovery=extra_files_discovery,
+            )
 
         # Step 6: Store results and override/underride warnings
         self.results.extend(config_to_ess_transformer.results)
         self.override_warnings.extend(config_to_ess_transformer.override_warnings)
         self.underride_warnings.extend(config_to_ess_transformer.underride_warnings)
 
+    def discover_extra_files(self) -> ExtraFilesDiscovery:
+        """
+        Discover the extra files referenced by the input config.
+
+        This only reads the input config and the filesystem, without prompting or touching any state shared
+        with other migrators, so the engine can run it for several migrators concurrently.
+        """
+        self.extra_files_discovery = ExtraFilesDiscovery(
+            source_file=self.input.config_path,
+            strategy=self.extra_files_strategy,
+            secrets_strategy=self.secret_discovery_strategy,
+            summary_logger=self.summary_logger,
+            global_options=self.global_options,
+        )
+        with self.profile_phase(EXTRA_FILE_DISCOVERY_PHASE):
+            self.extra_files_discovery.discover_extra_files_from_config(self.input.config)
+        return self.extra_files_discovery
+
+    def profile_phase(self, phase_name: str) -> AbstractContextManager[None]:
+        """
+        Time a phase of this migration if profiling.
+
+        Args:
+            phase_name: Name of the phase, e.g. TRANSFORMATIONS_PHASE
+
+        Returns:
+            Context manager timing the phase
+        """
+        return profile_phase(self.global_options.profiler, self.migration.name, phase_name)
+
     def register_secret_sources(self, transformer: ConfigValueTransformer) -> None:
         """
         Register value sources for all discovered secrets for filtering purposes.
@@ -581,7 +935,8 @@ class MigrationService:
         )
         config_to_ess_transformer.strategy_name = self.migration.name
 
-        config_to_ess_transformer.handle_secrets(
-            self.secret_discovery,
-            self.secrets,
-        )
+        with self.profile_phase(SECRETS_PHASE):
+            config_to_ess_transformer.handle_secrets(
+                self.secret_discovery,
+                self.secrets,
+            )
@@ -7,10 +7,14 @@
 Data models for the migration script using Python dataclasses.
 """
 
-from collections.abc import Callable
+import hashlib
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .profiling import MigrationProfiler
 
 
 @dataclass
@@ -21,6 +25,15 @@ class GlobalOptions:
 
     use_existing_database: bool | None = None
     quiet_mode: bool | None = None
+    parallel_discovery: bool | None = None  # Discover the extra files of all components concurrently
+    compress_large_extra_files: bool | None = None  # Gzip extra files too large for a ConfigMap
+    unpack_image: str | None = None  # Image of the init container unpacking gzipped extra files, if not the default
+    non_interactive: bool | None = None  # Never prompt, answering prompts not in answers with their defaults
+    answers: dict[str, Any] = field(default_factory=dict)  # Answers to prompts by answer key, used up once answered
+    unanswered_prompts: list[dict[str, Any]] = field(
+        default_factory=list
+    )  # Prompts which non-interactive mode had no answer or default for
+    profiler: "MigrationProfiler | None" = None  # Records the time of each migration phase when profiling
 
 
 @dataclass
@@ -114,18 +127,55 @@ class ConfigMap:
     name: str  # Name of the Kubernetes ConfigMap
     data: dict[str, str]  # Dictionary of configuration key-value pairs
     namespace: str | None = None  # Optional namespace for the ConfigMap (None for default namespace)
+    files: dict[str, Path] = field(
+        default_factory=dict
+    )  # Keys whose value is the content of a file, only read when the ConfigMap is written
+
+    file_digests: dict[str, str] = field(
+        default_factory=dict
+    )  # SHA-256 of the content of files when they were imported, checked when they're read
+    binary_data: dict[str, str] = field(default_factory=dict)  # Base64 encoded binary key-value pairs
+
+    def iter_data(self) -> Iterator[tuple[str, str]]:
+        """
+        Iterate over the ConfigMap's data, reading the content of each file only when it is reached.
+
+        Raises:
+            OSError: If a file can't be read
+            UnicodeDecodeError: If a file isn't valid UTF-8
+            MigrationError: If a file has changed since it was imported
+        """
+        yield from self.data.items()
+        for key, path in self.files.items():
+            with open(path, "rb") as f:
+                content = f.read()
+            # Files with the same content when imported share a key, so a file that has changed since must not be used
+            if key in self.file_digests and hashlib.sha256(content).hexdigest() != self.file_digests[key]:
+                raise MigrationError(f"{path} has changed since it was imported into ConfigMap {self.name}")
+            # Universal newlines, as when reading the file in text mode
+            yield key, content.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
 
     def to_manifest(self) -> dict[str, Any]:
-        """Convert to Kubernetes manifest format."""
+        """
+        Convert to Kubernetes manifest format, reading the content of its files.
+
+        Raises:
+            OSError: If a file can't be read
+            UnicodeDecodeError: If a file isn't valid UTF-8
+            MigrationError: If a file has changed since it was imported
+        """
         metadata = {"name": self.name}
         if self.namespace:
             metadata["namespace"] = self.namespace
-        return {
+        manifest: dict[str, Any] = {
             "apiVersion": "v1",
             "kind": "ConfigMap",
             "metadata": metadata,
-            "data": self.data,
+            "data": dict(self.iter_data()),
         }
+        if self.binary_data:
+            manifest["binaryData"] = self.binary_data
+        return manifest
 
 
 @dataclass
@@ -166,30 +216,40 @@ class ValueSourceTracking:
     """Tracks all sources for ESS configuration values across strategies."""
 
     sources: dict[str, list[ValueSource]] = field(default_factory=dict)
+    # Indexes kept up to date by add_source, so that queries don't need to scan every source
+    _source_paths_by_strategy: dict[str, list[str]] = field(default_factory=dict, init=False, repr=False)
+    _sources_with_values: dict[str, list[ValueSource]] = field(default_factory=dict, init=False, repr=False)
+    _conflicting_paths: dict[str, None] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for ess_path, srcs in self.sources.items():
+            for source in srcs:
+                self._index_source(ess_path, source)
+
+    def _index_source(self, ess_path: str, source: ValueSource) -> None:
+        if source.source_path is not None:
+            self._source_paths_by_strategy.setdefault(source.strategy_name, []).append(source.source_path)
+
+        if source.value is None:
+            return
+        srcs_with_values = self._sources_with_values.setdefault(ess_path, [])
+        srcs_with_values.append(source)
+        if ess_path not in self._conflicting_paths and source.strategy_name != srcs_with_values[0].strategy_name:
+            self._conflicting_paths[ess_path] = None
 
     def add_source(self, ess_path: str, strategy_name: str, value: Any | None, source_path: str) -> None:
         """Add a source for an ESS path."""
         if ess_path not in self.sources:
             self.sources[ess_path] = []
-        self.sources[ess_path].append(ValueSource(strategy_name=strategy_name, source_path=source_path, value=value))
+        source = ValueSource(strategy_name=strategy_name, source_path=source_path, value=value)
+        self.sources[ess_path].append(source)
+        self._index_source(ess_path, source)
 
     def get_conflicts(self) -> dict[str, list[ValueSource]]:
         """Get all ESS paths that have multiple sources from different strategies."""
-        conflicts = {}
-        for path, srcs in self.sources.items():
-            # Filter out sources with None values
-            srcs_with_values = [s for s in srcs if s.value is not None]
-            if len(srcs_with_values) > 1:
-                strategies = set(s.strategy_name for s in srcs_with_values)
-                if len(strategies) > 1:
-                    conflicts[path] = srcs_with_values
-        return conflicts
+        # Sources with None values are ignored
+        return {path: list(self._sources_with_values[path]) for path in self._conflicting_paths}
 
     def get_tracked_source_paths(self, strategy_name: str) -> list[str]:
         """Get all source paths that have been tracked (for filtering in additional config)."""
-        return [
-            s.source_path
-            for srcs in self.sources.values()
-            for s in srcs
-            if s.source_path is not None and s.strategy_name == strategy_name
-        ]
+        return list(self._source_paths_by_strategy.get(strategy_name, []))
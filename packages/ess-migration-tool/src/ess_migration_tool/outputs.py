@@ -8,14 +8,16 @@ Output generation module for the migration script.
 Handles creation of Helm values and Kubernetes resources.
 """
 
+import json
 import logging
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, TextIO
 
-import yaml
+from .models import ConfigMap, GlobalOptions, MigrationError, Secret
+from .yaml_emitter import dump_manifests, dump_with_pipe_for_multiline
 
-from .models import ConfigMap, Secret
-from .utils import yaml_dump_with_pipe_for_multiline
+if TYPE_CHECKING:
+    from .engine import MigrationEngine
 
 logger = logging.getLogger("migration")
 
@@ -32,7 +34,7 @@ def generate_helm_values(ess_values: dict[str, Any]) -> str:
     """
     # Use the same YAML dumping logic as yaml_dump_with_pipe_for_multiline
     # for consistency across the codebase
-    return yaml_dump_with_pipe_for_multiline(ess_values)
+    return dump_with_pipe_for_multiline(ess_values)
 
 
 def write_outputs(
@@ -40,6 +42,7 @@ def write_outputs(
     secrets: list[Secret],
     configmaps: list[ConfigMap],
     output_dir: str = "output",
+    combine_manifests: bool = False,
 ) -> tuple[str, list[str], list[str]]:
     """
     Write migration outputs to files.
@@ -47,6 +50,8 @@ def write_outputs(
     Args:
         helm_values: Helm values YAML content
         output_dir: Directory to write outputs to
+        combine_manifests: Write all the ConfigMaps and Secrets to a single manifests.yaml, which is then
+            the only secret path and configmap path
 
     Returns:
         Tuple of (values_path, secret_paths, configmap_paths)
@@ -55,11 +60,16 @@ def write_outputs(
     # Write Helm values with error handling
     values_path = _write_helm_values(helm_values, output_dir)
 
-    # Write Secrets with error handling
-    written_secrets = _write_secrets(secrets, output_dir)
+    if combine_manifests:
+        manifests_path = _write_combined_manifests(configmaps, secrets, output_dir)
+        written_secrets = [manifests_path] if secrets else []
+        written_configmaps = [manifests_path] if configmaps else []
+    else:
+        # Write Secrets with error handling
+        written_secrets = _write_secrets(secrets, output_dir)
 
-    # Write ConfigMaps with error handling
-    written_configmaps = _write_configmaps(configmaps, output_dir)
+        # Write ConfigMaps with error handling
+        written_configmaps = _write_configmaps(configmaps, output_dir)
 
     logger.info(f"Migration outputs written successfully to {output_dir}")
     logger.info(f"- Helm values: {values_path}")
@@ -86,6 +96,110 @@ def create_output_dir(output_dir: str) -> None:
     logger.info(f"Created output directory: {output_dir}")
 
 
+def write_unanswered_prompts(unanswered_prompts: list[dict[str, Any]], output_dir: str) -> str:
+    """
+    Write the prompts non-interactive mode couldn't answer, so that they can be added to the answers file.
+
+    Args:
+        unanswered_prompts: The unanswered prompts, with their answer key, message, type and options
+        output_dir: Output directory path
+
+    Returns:
+        Path to the written report
+    """
+    report_path = Path(output_dir) / "unanswered-prompts.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"unanswered_prompts": unanswered_prompts}, f, indent=2)
+
+    logger.info(f"Unanswered prompts written to {report_path}")
+    return str(report_path)
+
+
+def write_json_result(
+    stream: TextIO,
+    engine: "MigrationEngine | None",
+    global_options: GlobalOptions,
+    written_files: dict[str, Any] | None = None,
+    error: str | None = None,
+) -> bool:
+    """
+    Write the result of a migration as a single line JSON document, for automation to read instead of the summary.
+
+    The document is only written once complete. If a ConfigMap file can't be read, the document reports that
+    instead of the result. Secrets are only referenced by their name and keys, so that their values don't end up in
+    automation logs. Missing files are the extra files still missing after the prompts, neither found nor skipped.
+
+    Args:
+        stream: Stream to write the document to
+        engine: Engine that ran the migration, None if it failed before the migration started
+        global_options: Global options of the migration, with its unanswered prompts and profiler
+        written_files: Paths of the written values, Secrets and ConfigMaps, by kind
+        error: Why the migration failed, None if it succeeded
+
+    Returns:
+        Whether the document reports that the migration succeeded
+    """
+    try:
+        document = _json_result(engine, global_options, written_files, error)
+    except (OSError, UnicodeDecodeError, MigrationError) as e:
+        error = f"Failed to read the ConfigMap files: {e}"
+        logger.error(error)
+        document = _json_result(engine, global_options, written_files, error)
+    stream.write(document)
+    stream.write("\n")
+    stream.flush()
+    return error is None
+
+
+def _json_result(
+    engine: "MigrationEngine | None",
+    global_options: GlobalOptions,
+    written_files: dict[str, Any] | None,
+    error: str | None,
+) -> str:
+    """
+    Build the JSON document of the result of a migration, see write_json_result.
+
+    Raises:
+        OSError: If a ConfigMap file can't be read
+        UnicodeDecodeError: If a ConfigMap file isn't valid UTF-8
+        MigrationError: If a ConfigMap file has changed since it was imported
+    """
+    document: dict[str, Any] = {
+        "succeeded": error is None,
+        "error": error,
+        "values": engine.ess_config if engine and error is None else None,
+        "files": written_files or {},
+        "configmaps": [],
+        "secrets": [],
+        "override_warnings": [],
+        "underride_warnings": [],
+        "init_by_ess_secrets": [],
+        "missing_files": [],
+        "unanswered_prompts": global_options.unanswered_prompts,
+        "timings": global_options.profiler.to_dict() if global_options.profiler else None,
+    }
+    if engine:
+        if error is None:
+            document["configmaps"] = [configmap.to_manifest() for configmap in engine.configmaps]
+            document["secrets"] = [{"name": secret.name, "keys": list(secret.data)} for secret in engine.secrets]
+        document["override_warnings"] = engine.override_warnings
+        document["underride_warnings"] = engine.underride_warnings
+        document["init_by_ess_secrets"] = engine.init_by_ess_secrets
+        document["missing_files"] = [
+            {
+                "component": migrator.migration.name,
+                "source_file": missing_path.source_file,
+                "config_key": missing_path.config_key,
+                "path": str(missing_path.source_path),
+            }
+            for migrator in engine.migrators
+            if migrator.extra_files_discovery
+            for missing_path in migrator.extra_files_discovery.missing_file_paths
+        ]
+    return json.dumps(document)
+
+
 def _write_configmaps(configmaps: list[ConfigMap], output_dir: str) -> list[str]:
     """
     Write ConfigMap manifests to files with error handling.
@@ -112,7 +226,7 @@ def _write_configmaps(configmaps: list[ConfigMap], output_dir: str) -> list[str]
 
         # Write ConfigMap file
         with open(configmap_path, "w", encoding="utf-8") as f:
-            yaml.safe_dump(configmap.to_manifest(), f, sort_keys=False)
+            dump_manifests([configmap], f)
 
         written_files.append(str(configmap_path))
         logging.info(f"ConfigMap written to {configmap_path}")
@@ -120,6 +234,26 @@ def _write_configmaps(configmaps: list[ConfigMap], output_dir: str) -> list[str]
     return written_files
 
 
+def _write_combined_manifests(configmaps: list[ConfigMap], secrets: list[Secret], output_dir: str) -> str:
+    """
+    Write all ConfigMap and Secret manifests to a single multi-document file.
+
+    Args:
+        configmaps: List of ConfigMap manifests
+        secrets: List of Secret manifests
+        output_dir: Output directory path
+
+    Returns:
+        Path to the written manifests file
+    """
+    manifests_path = Path(output_dir) / "manifests.yaml"
+    with open(manifests_path, "w", encoding="utf-8") as f:
+        dump_manifests([*configmaps, *secrets], f, explicit_start=True)
+
+    logging.info(f"{len(configmaps)} ConfigMaps and {len(secrets)} Secrets written to {manifests_path}")
+    return str(manifests_path)
+
+
 def _write_secrets(secrets: list[Secret], output_dir: str) -> list[str]:
     """
     Write Secret manifests to files with error handling.
@@ -147,7 +281,7 @@ def _write_secrets(secrets: list[Secret], output_dir: str) -> list[str]:
 
             # Write Secret file
             with open(secret_path, "w", encoding="utf-8") as f:
-                yaml.safe_dump(secret.to_manifest(), f, sort_keys=False)
+                dump_manifests([secret], f)
 
             written_files.append(str(secret_path))
             logging.info(f"Secret written to {secret_path}")
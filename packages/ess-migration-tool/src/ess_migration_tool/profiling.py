@@ -0,0 +1,155 @@
+# Copyright 2026 Element Creations Ltd
+#
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Profiling of migration runs, timing each phase of each strategy's migration.
+"""
+
+import json
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Phases of MigrationService.migrate, in the order they run
+SECRET_DISCOVERY_PHASE = "secret_discovery"
+EXTRA_FILE_DISCOVERY_PHASE = "extra_file_discovery"
+MOUNTS_PHASE = "mounts"
+TRANSFORMATIONS_PHASE = "transformations"
+ADDITIONAL_CONFIG_FILTERING_PHASE = "additional_config_filtering"
+SECRETS_PHASE = "secrets"
+
+
+@dataclass
+class PhaseTiming:
+    """Time spent in a phase, excluding the time spent in phases nested in it."""
+
+    wall_seconds: float = 0.0  # Wall-clock time
+    cpu_seconds: float = 0.0  # CPU time of the whole process, including any other threads running meanwhile
+    calls: int = 0  # Number of times the phase ran
+
+
+@dataclass
+class MigrationProfiler:
+    """
+    Records the wall-clock and CPU time of each phase of each strategy's migration, and the peak memory.
+
+    Phases can be nested, e.g. the additional config filtering runs within the transformations, in which case
+    the time of the inner phase is only counted for it. Phases can run in several threads at once.
+    """
+
+    timings: dict[str, dict[str, PhaseTiming]] = field(default_factory=dict)  # Timings by strategy then phase
+    wall_seconds: float = 0.0  # Wall-clock time between start() and stop()
+    cpu_seconds: float = 0.0  # CPU time between start() and stop()
+    peak_memory_bytes: int | None = None  # Peak memory allocated by Python, if traced
+    trace_memory: bool = True  # Trace memory allocations to record the peak memory, which slows the migration down
+    _started_at: tuple[float, float] | None = field(default=None, repr=False)  # Wall-clock and CPU start times
+    _started_tracing: bool = field(default=False, repr=False)  # Whether start() started tracemalloc
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _local: threading.local = field(default_factory=threading.local, repr=False)  # Nested phases of each thread
+
+    def start(self) -> None:
+        """Start profiling, tracing memory allocations with tracemalloc if trace_memory is set."""
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+        self._started_at = (time.perf_counter(), time.process_time())
+
+    def stop(self) -> None:
+        """Stop profiling, recording the total time and the peak memory since start()."""
+        if self._started_at is None:
+            return
+        wall_start, cpu_start = self._started_at
+        self.wall_seconds = time.perf_counter() - wall_start
+        self.cpu_seconds = time.process_time() - cpu_start
+        if self.trace_memory:
+            self.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._started_at = None
+
+    @contextmanager
+    def phase(self, strategy_name: str, phase_name: str) -> Iterator[None]:
+        """
+        Time a phase of a strategy's migration.
+
+        Args:
+            strategy_name: Name of the strategy being migrated
+            phase_name: Name of the phase, e.g. TRANSFORMATIONS_PHASE
+        """
+        if not hasattr(self._local, "nested"):
+            self._local.nested = []
+        # Wall-clock and CPU time of the phases nested in this one
+        nested_times = [0.0, 0.0]
+        self._local.nested.append(nested_times)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._local.nested.pop()
+            if self._local.nested:
+                self._local.nested[-1][0] += wall
+                self._local.nested[-1][1] += cpu
+            with self._lock:
+                timing = self.timings.setdefault(strategy_name, {}).setdefault(phase_name, PhaseTiming())
+                timing.wall_seconds += wall - nested_times[0]
+                timing.cpu_seconds += cpu - nested_times[1]
+                timing.calls += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the profile to a JSON serializable dictionary."""
+        return {
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "strategies": {
+                strategy_name: {
+                    phase_name: {
+                        key: round(value, 6) if isinstance(value, float) else value
+                        for key, value in asdict(timing).items()
+                    }
+                    for phase_name, timing in phases.items()
+                }
+                for strategy_name, phases in self.timings.items()
+            },
+        }
+
+    def write(self, path: Path | str) -> None:
+        """
+        Write the profile as JSON.
+
+        Args:
+            path: Path to write the profile to
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def profile_phase(
+    profiler: MigrationProfiler | None, strategy_name: str, phase_name: str
+) -> AbstractContextManager[None]:
+    """
+    Time a phase of a strategy's migration if profiling, or do nothing otherwise.
+
+    Args:
+        profiler: Profiler to record the phase in, None when not profiling
+        strategy_name: Name of the strategy being migrated
+        phase_name: Name of the phase, e.g. TRANSFORMATIONS_PHASE
+
+    Returns:
+        Context manager timing the phase
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(strategy_name, phase_name)
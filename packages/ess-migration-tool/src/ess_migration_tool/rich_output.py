@@ -6,40 +6,48 @@
 """
 Rich output utilities for the migration tool.
 Provides styled console output using the Rich library for tables.
+
+Rich is slow to import, so it is only imported once something is printed to the console.
 """
 
 import logging
 import os
 from pathlib import Path
-from typing import Any
-
-from rich import box
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
-from rich.tree import Tree
+from typing import TYPE_CHECKING, Any
 
 from .models import GlobalOptions
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
 # Global console instance
-_console: Console | None = None
+_console: "Console | None" = None
+# Whether console output is disabled, only logging to the loggers
+_console_disabled = False
 
 
-def get_console() -> Console:
+def get_console() -> "Console":
     """Get or create the global Rich Console instance."""
     global _console
     if _console is None:
+        from rich.console import Console
+
         _console = Console()
     return _console
 
 
+def disable_console() -> None:
+    """Only log output to the loggers, without printing it to the console or importing Rich."""
+    global _console_disabled
+    _console_disabled = True
+
+
 def is_rich_enabled() -> bool:
     """
     Check if Rich output should be used.
-    Returns False if running under pytest or output is not a TTY.
+    Returns False if running under pytest, console output is disabled or output is not a TTY.
     """
-    if os.environ.get("PYTEST_CURRENT_TEST"):
+    if os.environ.get("PYTEST_CURRENT_TEST") or _console_disabled:
         return False
     return get_console().is_terminal
 
@@ -69,6 +77,12 @@ def print_table(
     # Print rows
     for row in data:
         logger.info("  ".join(str(cell) for cell in row))
+    if _console_disabled:
+        return
+
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
 
     # Rich is enabled - use styled table
     table = Table(
@@ -110,6 +124,12 @@ def print_section(
     # Log to file
     logger.info(text)
     logger.info(separator * len(text))
+    if _console_disabled:
+        return
+
+    from rich import box
+    from rich.panel import Panel
+    from rich.text import Text
 
     # Rich is enabled - use styled panel for section header
     panel = Panel(
@@ -137,6 +157,10 @@ def print_header(
     """
     # Log to file
     logger.info(text)
+    if _console_disabled:
+        return
+
+    from rich.text import Text
 
     # Rich is enabled - use styled text without panel
     get_console().print(Text(text, style=style))
@@ -154,6 +178,10 @@ def log_command(
         logger: Logger for fallback output when Rich is disabled
     """
     logger.info(f"   {command}")
+    if _console_disabled:
+        return
+
+    from rich.text import Text
 
     # Rich is enabled - use syntax highlighting
     syntax = Text()
@@ -185,6 +213,10 @@ def print_prompt(
         prefix: Prefix string to add before the message (default: "   ")
     """
     logger.info(f"{prefix}{message}")
+    if _console_disabled:
+        return
+
+    from rich.text import Text
 
     # Rich is enabled - use styled text
     styled = Text(f"{prefix}{message}", style=style)
@@ -202,6 +234,8 @@ def print_separator(
         logger: Logger to use for fallback output when Rich is disabled
     """
     logger.info("=" * 60)
+    if _console_disabled:
+        return
 
     # Rich is enabled - use a styled separator with terminal width
     console = get_console()
@@ -223,6 +257,11 @@ def print_output_tree(
         logger: Logger to use for fallback output when Rich is disabled
     """
     logger.info(f"📁 Output files written to: {output_dir}")
+    if _console_disabled:
+        return
+
+    from rich.text import Text
+    from rich.tree import Tree
 
     console = get_console()
     output_path = Path(output_dir)
@@ -289,6 +328,8 @@ class ProgressReporter:
         bar = "[" + "▰" * completed + "▱" * (bar_width - completed) + "]"
 
         if is_rich_enabled():
+            from rich.text import Text
+
             # Rich is enabled - use styled output
             step_msg_rich = Text.assemble(
                 (f"📦 Step {self.current_step + 1}/{len(self.all_steps)} ", "bold"),
@@ -303,8 +344,12 @@ class ProgressReporter:
             step_msg_plain = f"📦 Step {self.current_step + 1}/{len(self.all_steps)} ({progress:.0f}%): {step_name}"
             print_prompt(step_msg_plain, style="default", logger=self.summary_logger)
 
-        # Pause for user input after each step (unless in quiet mode or testing)
-        if not os.environ.get("PYTEST_CURRENT_TEST") and not self.global_options.quiet_mode:
+        # Pause for user input after each step (unless in quiet or non-interactive mode or testing)
+        if (
+            not os.environ.get("PYTEST_CURRENT_TEST")
+            and not self.global_options.quiet_mode
+            and not self.global_options.non_interactive
+        ):
             print_prompt("   Press Enter to continue...", style="default", logger=self.summary_logger)
             get_console().input()
 
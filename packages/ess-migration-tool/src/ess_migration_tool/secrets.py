@@ -14,6 +14,7 @@ from .interfaces import SecretDiscoveryStrategy
 from .models import DiscoverableSecret, DiscoveredSecret, GlobalOptions, SecretConfig
 from .rich_output import print_prompt, print_section, print_separator
 from .utils import (
+    SchemaKeyMatcher,
     find_matching_schema_key,
     get_nested_value,
     is_wildcard_pattern,
@@ -44,6 +45,10 @@ class SecretDiscovery:
     missing_required_secrets: list[tuple[DiscoveredSecret, str | None]] = field(
         default_factory=list
     )  # (DiscoveredSecret, error_message) for required but missing/failed secrets
+    schema_matcher: SchemaKeyMatcher = field(init=False, repr=False)  # Wildcard key matcher for the strategy's schema
+
+    def __post_init__(self) -> None:
+        self.schema_matcher = SchemaKeyMatcher(tuple(self.strategy.ess_secret_schema))
 
     def discover_secrets(self, config_data: dict) -> None:
         """Discover secrets from configuration data."""
@@ -58,7 +63,9 @@ class SecretDiscovery:
         )
         for secret_key, discovered_secret in component_secrets.items():
             # Check for exact match or wildcard pattern match
-            matching_schema_key = find_matching_schema_key(secret_key, self.strategy.ess_secret_schema)
+            matching_schema_key = find_matching_schema_key(
+                secret_key, self.strategy.ess_secret_schema, self.schema_matcher
+            )
             if matching_schema_key is None:
                 raise RuntimeError(f"Discovered component-specific secret '{secret_key}' not found in schema")
             # Get the precedence flag from the schema
@@ -79,7 +86,9 @@ class SecretDiscovery:
             secret_key = discovered_secret.secret_key
 
             # Find matching schema key (could be wildcard pattern)
-            matching_schema_key = find_matching_schema_key(secret_key, self.strategy.ess_secret_schema)
+            matching_schema_key = find_matching_schema_key(
+                secret_key, self.strategy.ess_secret_schema, self.schema_matcher
+            )
             if matching_schema_key is None:
                 logger.warning(f"Component-specific failed secret '{secret_key}' not found in schema: {error_message}")
                 continue
@@ -280,7 +289,7 @@ class SecretDiscovery:
             return
 
         # Check if quiet mode is enabled
-        if self.global_options.quiet_mode:
+        if self.global_options.quiet_mode and not self.global_options.non_interactive:
             missing_list = ", ".join(ds.secret_key for ds, _ in self.missing_required_secrets)
             raise SecretsError(
                 f"Missing required {self.strategy.name} secrets in quiet mode: {missing_list}. "
@@ -301,7 +310,9 @@ class SecretDiscovery:
             config_key = discovered_secret.config_key
 
             # Find matching schema key (supports wildcard patterns)
-            matching_schema_key = find_matching_schema_key(secret_key, self.strategy.ess_secret_schema)
+            matching_schema_key = find_matching_schema_key(
+                secret_key, self.strategy.ess_secret_schema, self.schema_matcher
+            )
             assert matching_schema_key is not None
             discoverable_secret = self.strategy.ess_secret_schema[matching_schema_key]
 
@@ -323,6 +334,7 @@ class SecretDiscovery:
                 self.summary_logger,
                 "Please paste the secret value:",
                 global_options=self.global_options,
+                answer_key=f"secrets.{secret_key}",
             )
             self.discovered_secrets[secret_key] = DiscoveredSecret(
                 source_file=self.source_file,
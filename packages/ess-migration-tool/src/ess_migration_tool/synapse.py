@@ -12,8 +12,6 @@ from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Any
 
-from rapidfuzz import fuzz, process
-
 from .interfaces import DataMigrationProtocol, ExtraFilesDiscoveryStrategy, SecretDiscoveryStrategy
 from .migration import ConfigValueTransformer, MigrationStrategy, TransformationSpec, additional_config_transformer
 from .models import DiscoverableSecret, DiscoveredSecret, GlobalOptions, MigrationError, SecretConfig
@@ -81,6 +79,7 @@ def prompt_user_for_worker(
         f"Please select the worker type of instance {instance_name}:",
         matched_worker_types,
         global_options,
+        answer_key=f"workers.{instance_name}",
     )
     return selected_worker
 
@@ -94,6 +93,9 @@ def extract_workers_from_instance_map(
     if instance_map is None:
         return None
 
+    # rapidfuzz is only needed by Synapse deployments with workers, so isn't imported until then
+    from rapidfuzz import fuzz, process
+
     for instance_name in instance_map:
         matches = process.extract(instance_name, worker_types, scorer=fuzz.WRatio, limit=3)
         very_high_probable_matches = [m[0] for m in matches if m[1] > 90]
@@ -180,6 +182,7 @@ def prompt_for_ingress_host(
         config_value_transformer.summary_logger,
         "Enter ingress host:",
         kwargs["global_options"],
+        answer_key="synapse.ingress_host",
     )
 
 
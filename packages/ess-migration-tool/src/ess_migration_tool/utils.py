@@ -3,22 +3,19 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 
 
+import copy
+import functools
 import logging
 import os
 import urllib.parse
 from collections import defaultdict
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Any
 
-import yaml
-from cryptography.hazmat.backends import default_backend
-
-# Key detection imports (moved to module level as requested)
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import ec, rsa
-
 from .models import GlobalOptions, MigrationError
 from .rich_output import get_console, is_rich_enabled, print_prompt, print_section
+from .yaml_emitter import dump_with_pipe_for_multiline
 
 
 def parse_postgres_uri(uri: str) -> dict[str, Any]:
@@ -98,37 +95,260 @@ def yaml_dump_with_pipe_for_multiline(data: Any) -> str:
         YAML string with pipe characters for multi-line strings
     """
 
-    # Use a custom representer for strings with newlines
-    def multiline_string_representer(dumper: yaml.Dumper, data: str) -> yaml.Node:
-        if isinstance(data, str) and "\n" in data:
-            # Use literal style (|) for multi-line strings
-            return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+    # The dumper is built once, in the shared YAML emitter
+    return dump_with_pipe_for_multiline(data)
+
+
+@dataclass(frozen=True)
+class ConfigPath:
+    """
+    A dot-separated config path, parsed once into its components.
+
+    Paths are parsed with `ConfigPath.parse`, which caches the result so the same path string
+    is only ever scanned once. The string based helpers below (`get_nested_value`,
+    `set_nested_value`, `remove_nested_value`, `path_matches_pattern`) are thin wrappers
+    around the operations of this class.
+    """
+
+    parts: tuple[str, ...]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def parse(path: str) -> "ConfigPath":
+        """
+        Parse a path string that may contain single-quoted keys with dots.
+
+        Single-quoted keys are treated as single path components even if they contain dots.
+        This allows keys containing dots to be used in paths by wrapping them in single quotes.
+
+        Examples:
+            'a.b.c' -> ('a', 'b', 'c')
+            "a.'my.key'.b" -> ('a', 'my.key', 'b')
+            "a.'foo.bar'.'baz.mux'" -> ('a', 'foo.bar', 'baz.mux')
+            'a.b.' → ('a', 'b', '')
+
+        Args:
+            path: Path string, potentially containing single-quoted components
+
+        Returns:
+            The parsed path, with quoted parts preserving their dots
+        """
+        if not path:
+            return ConfigPath(())
+
+        parts: list[str] = []
+        current_part: list[str] = []
+        in_quotes = False
+
+        for char in path:
+            if char == "'":
+                # Toggle quotes
+                in_quotes = not in_quotes
+            elif char == "." and not in_quotes:
+                # End of current part (only split on dots outside quotes)
+                parts.append("".join(current_part))
+                current_part = []
+                continue
+            else:
+                current_part.append(char)
+
+        # Add the last part
+        parts.append("".join(current_part))
+
+        return ConfigPath(tuple(parts))
+
+    def __str__(self) -> str:
+        return ".".join(f"'{part}'" if "." in part else part for part in self.parts)
+
+    @property
+    def parent(self) -> "ConfigPath":
+        """The path without its final component."""
+        return ConfigPath(self.parts[:-1])
+
+    def get(self, config: dict[str, Any]) -> Any:
+        """
+        Get the value at this path.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            The value at this path, or None if not found
+        """
+        parts = self.parts
+        if not parts:
+            return None
+
+        # Direct key (no nesting)
+        if len(parts) == 1:
+            return config.get(parts[0])
+
+        # Nested path
+        current = config
+
+        # Navigate to the value
+        for i, part in enumerate(parts):
+            if isinstance(current, dict):
+                if part not in current:
+                    return None
+                current = current[part]
+            elif isinstance(current, list):
+                try:
+                    current = current[int(part)]
+                except (IndexError, ValueError):
+                    return None
+            elif i != len(parts) - 1:
+                return None  # Can't navigate further
+
+        return current
+
+    def set(self, config: dict[str, Any], value: Any) -> None:
+        """
+        Set the value at this path, creating any missing dicts and lists along the way.
+        Numeric components index into (and extend) lists.
+
+        Args:
+            config: Configuration dictionary to modify
+            value: Value to set
+        """
+        parts = self.parts
+        if not parts:
+            return
+
+        # Handle single-part path (no nesting)
+        if len(parts) == 1:
+            config[parts[0]] = value
+            return
+
+        current: dict[str, Any] | list[Any] = config
+
+        for i, part in enumerate(parts[:-1]):
+            next_part = parts[i + 1] if i + 1 < len(parts) else None
+
+            if isinstance(current, list):
+                # Current is a list, treat part as integer index
+                try:
+                    idx = int(part)
+                except ValueError:
+                    return  # Invalid index
+                # Extend list if needed
+                while idx >= len(current):
+                    current.append(None)
+                if current[idx] is None:
+                    # Create appropriate type for next level
+                    current[idx] = [] if (next_part and next_part.isdigit()) else {}
+                current = current[idx]
+
+            elif isinstance(current, dict):
+                if part in current:
+                    # Already exists, navigate to it
+                    current = current[part]
+                else:
+                    # Create new structure
+                    # If next part is numeric, create a list here (for array indices)
+                    # Otherwise create a dict
+                    if next_part and next_part.isdigit():
+                        current[part] = []
+                    else:
+                        current[part] = {}
+                    current = current[part]
+            else:
+                # Can't navigate further, start over
+                current = {}
+                config[parts[0]] = current
+
+        # Set final value
+        final_part = parts[-1]
+        if isinstance(current, list):
+            try:
+                idx = int(final_part)
+            except ValueError:
+                return
+            while idx >= len(current):
+                current.append(None)
+            current[idx] = value
         else:
-            # Use regular style for single-line strings
-            return dumper.represent_scalar("tag:yaml.org,2002:str", data)
+            current[final_part] = value
+
+    def remove(self, config: dict[str, Any], remove_empty_parent: bool = False) -> None:
+        """
+        Remove the value at this path.
+
+        Args:
+            config: Configuration dictionary
+            remove_empty_parent: Also remove each parent left empty by the removal
+        """
+        parts = self.parts
+        if not parts:
+            return
 
-    # Create a custom YAML dumper
-    class CustomYAMLDumper(yaml.SafeDumper):
-        def ignore_aliases(self, data: Any) -> bool:
-            return True
+        # Direct key (no nesting)
+        if len(parts) == 1:
+            if parts[0] in config:
+                del config[parts[0]]
+            return
+
+        # Nested path
+        current = config
+
+        # Navigate to the parent (all parts except the last)
+        for part in parts[:-1]:
+            if isinstance(current, dict):
+                if part not in current:
+                    return
+                current = current[part]
+            elif isinstance(current, list):
+                try:
+                    current = current[int(part)]
+                except (IndexError, ValueError):
+                    return
+
+        # Remove the final key
+        final_key = parts[-1]
 
-    CustomYAMLDumper.add_representer(str, multiline_string_representer)  # type: ignore[arg-type]
+        if isinstance(current, dict) and final_key in current:
+            del current[final_key]
+        elif isinstance(current, list):
+            try:
+                idx = int(final_key)
+                if idx < len(current):
+                    del current[idx]
+            except ValueError:
+                pass
 
-    return yaml.dump(data, Dumper=CustomYAMLDumper, default_flow_style=False, sort_keys=False, width=float("inf"))
+        if remove_empty_parent and not current:
+            self.parent.remove(config, remove_empty_parent)
+
+    def matches(self, pattern: "ConfigPath") -> bool:
+        """
+        Check if this concrete path matches a wildcard pattern.
+
+        The wildcard `*` in the pattern matches exactly one path component.
+        All other components must match exactly.
+
+        Args:
+            pattern: Pattern like "certificates.*.value"
+
+        Returns:
+            True if this path matches pattern
+        """
+        if len(self.parts) != len(pattern.parts):
+            return False
+
+        for path_part, pattern_part in zip(self.parts, pattern.parts, strict=True):
+            if pattern_part == "*":
+                continue
+            elif path_part != pattern_part:
+                return False
+
+        return True
 
 
 def parse_path(path: str) -> list[str]:
     """
     Parse a path string that may contain single-quoted keys with dots.
 
-    Single-quoted keys are treated as single path components even if they contain dots.
-    This allows keys containing dots to be used in paths by wrapping them in single quotes.
-
-    Examples:
-        'a.b.c' -> ['a', 'b', 'c']
-        "a.'my.key'.b" -> ['a', 'my.key', 'b']
-        "a.'foo.bar'.'baz.mux'" -> ['a', 'foo.bar', 'baz.mux']
-        'a.b.' → ['a', 'b', '']
+    See `ConfigPath.parse` for the syntax.
 
     Args:
         path: Path string, potentially containing single-quoted components
@@ -136,29 +356,7 @@ def parse_path(path: str) -> list[str]:
     Returns:
         List of path components, with quoted parts preserving their dots
     """
-    if not path:
-        return []
-
-    parts: list[str] = []
-    current_part: list[str] = []
-    in_quotes = False
-
-    for char in path:
-        if char == "'":
-            # Toggle quotes
-            in_quotes = not in_quotes
-        elif char == "." and not in_quotes:
-            # End of current part (only split on dots outside quotes)
-            parts.append("".join(current_part))
-            current_part = []
-            continue
-        else:
-            current_part.append(char)
-
-    # Add the last part
-    parts.append("".join(current_part))
-
-    return parts
+    return list(ConfigPath.parse(path).parts)
 
 
 def set_nested_value(config: dict[str, Any], path: str, value: Any) -> None:
@@ -173,64 +371,7 @@ def set_nested_value(config: dict[str, Any], path: str, value: Any) -> None:
               to wrap keys containing dots (e.g., "a.'my.key'.b")
         value: Value to set
     """
-    parts = parse_path(path)
-    if not parts:
-        return
-
-    # Handle single-part path (no nesting)
-    if len(parts) == 1:
-        config[parts[0]] = value
-        return
-
-    current: dict[str, Any] | list[Any] = config
-
-    for i, part in enumerate(parts[:-1]):
-        next_part = parts[i + 1] if i + 1 < len(parts) else None
-
-        if isinstance(current, list):
-            # Current is a list, treat part as integer index
-            try:
-                idx = int(part)
-            except ValueError:
-                return  # Invalid index
-            # Extend list if needed
-            while idx >= len(current):
-                current.append(None)
-            if current[idx] is None:
-                # Create appropriate type for next level
-                current[idx] = [] if (next_part and next_part.isdigit()) else {}
-            current = current[idx]
-
-        elif isinstance(current, dict):
-            if part in current:
-                # Already exists, navigate to it
-                current = current[part]
-            else:
-                # Create new structure
-                # If next part is numeric, create a list here (for array indices)
-                # Otherwise create a dict
-                if next_part and next_part.isdigit():
-                    current[part] = []
-                else:
-                    current[part] = {}
-                current = current[part]
-        else:
-            # Can't navigate further, start over
-            current = {}
-            config[parts[0]] = current
-
-    # Set final value
-    final_part = parts[-1]
-    if isinstance(current, list):
-        try:
-            idx = int(final_part)
-        except ValueError:
-            return
-        while idx >= len(current):
-            current.append(None)
-        current[idx] = value
-    else:
-        current[final_part] = value
+    ConfigPath.parse(path).set(config, value)
 
 
 def is_wildcard_pattern(pattern: str) -> bool:
@@ -253,22 +394,72 @@ def path_matches_pattern(path: str, pattern: str) -> bool:
     Returns:
         True if path matches pattern
     """
-    path_parts = parse_path(path)
-    pattern_parts = parse_path(pattern)
+    return ConfigPath.parse(path).matches(ConfigPath.parse(pattern))
 
-    if len(path_parts) != len(pattern_parts):
-        return False
 
-    for path_part, pattern_part in zip(path_parts, pattern_parts, strict=True):
-        if pattern_part == "*":
-            continue
-        elif path_part != pattern_part:
-            return False
+@dataclass
+class _SchemaKeyNode:
+    """A node of the SchemaKeyMatcher trie, for one path component."""
 
-    return True
+    children: dict[str, "_SchemaKeyNode"] = field(default_factory=dict)
+    wildcard: "_SchemaKeyNode | None" = None
+    # The (schema order, key) of the first wildcard key ending at this node
+    key: tuple[int, str] | None = None
 
 
-def find_matching_schema_key(path: str, schema: dict[str, Any]) -> str | None:
+class SchemaKeyMatcher:
+    """
+    Matches concrete paths against the wildcard keys of a schema in a single walk.
+
+    The wildcard keys are compiled into a trie of their path components, with `*` components
+    kept on a separate branch. Walking the trie with a path follows both the exact and the `*`
+    branch at each level, so every matching key is found without testing keys one by one.
+    When several keys match, the first in schema order wins, as for a linear scan.
+    """
+
+    def __init__(self, schema_keys: tuple[str, ...]):
+        self._root = _SchemaKeyNode()
+        for order, schema_key in enumerate(schema_keys):
+            if not is_wildcard_pattern(schema_key):
+                continue
+            node = self._root
+            for part in ConfigPath.parse(schema_key).parts:
+                if part == "*":
+                    if node.wildcard is None:
+                        node.wildcard = _SchemaKeyNode()
+                    node = node.wildcard
+                else:
+                    node = node.children.setdefault(part, _SchemaKeyNode())
+            if node.key is None:
+                node.key = (order, schema_key)
+
+    def match(self, path: str) -> str | None:
+        """
+        Find the first wildcard schema key matching the given concrete path.
+
+        Args:
+            path: Concrete path like "matrixAuthenticationService.certificates.0.value"
+
+        Returns:
+            The matching wildcard schema key, or None
+        """
+        parts = ConfigPath.parse(path).parts
+        best: tuple[int, str] | None = None
+        nodes = [(self._root, 0)]
+        while nodes:
+            node, depth = nodes.pop()
+            if depth == len(parts):
+                if node.key is not None and (best is None or node.key < best):
+                    best = node.key
+                continue
+            if parts[depth] in node.children:
+                nodes.append((node.children[parts[depth]], depth + 1))
+            if node.wildcard is not None:
+                nodes.append((node.wildcard, depth + 1))
+        return best[1] if best is not None else None
+
+
+def find_matching_schema_key(path: str, schema: dict[str, Any], matcher: SchemaKeyMatcher | None = None) -> str | None:
     """
     Find a schema key that matches the given concrete path.
 
@@ -277,6 +468,7 @@ def find_matching_schema_key(path: str, schema: dict[str, Any]) -> str | None:
     Args:
         path: Concrete path like "matrixAuthenticationService.certificates.0.value"
         schema: Dict of {schema_key: SecretConfig}
+        matcher: SchemaKeyMatcher already built for the schema, to reuse across lookups
 
     Returns:
         The matching schema key (exact or wildcard pattern), or None
@@ -284,11 +476,9 @@ def find_matching_schema_key(path: str, schema: dict[str, Any]) -> str | None:
     if path in schema:
         return path
 
-    for schema_key in schema:
-        if is_wildcard_pattern(schema_key) and path_matches_pattern(path, schema_key):
-            return schema_key
-
-    return None
+    if matcher is None:
+        matcher = SchemaKeyMatcher(tuple(schema))
+    return matcher.match(path)
 
 
 def get_nested_value(config: dict[str, Any], path: str) -> Any:
@@ -304,32 +494,7 @@ def get_nested_value(config: dict[str, Any], path: str) -> Any:
     Returns:
         The value at the specified path, or None if not found
     """
-    parts = parse_path(path)
-    if not parts:
-        return None
-
-    # Direct key (no nesting)
-    if len(parts) == 1:
-        return config.get(parts[0])
-
-    # Nested path
-    current = config
-
-    # Navigate to the value
-    for i, part in enumerate(parts):
-        if isinstance(current, dict):
-            if part not in current:
-                return None
-            current = current[part]
-        elif isinstance(current, list):
-            try:
-                current = current[int(part)]
-            except (IndexError, ValueError):
-                return None
-        elif i != len(parts) - 1:
-            return None  # Can't navigate further
-
-    return current
+    return ConfigPath.parse(path).get(config)
 
 
 def remove_nested_value(config: dict[str, Any], path: str, remove_empty_parent: bool = False) -> None:
@@ -341,48 +506,9 @@ def remove_nested_value(config: dict[str, Any], path: str, remove_empty_parent:
         config: Configuration dictionary
         path: Dot-separated path to the value to remove. Use single quotes
               to wrap keys containing dots (e.g., "a.'my.key'.b")
+        remove_empty_parent: Also remove each parent left empty by the removal
     """
-    parts = parse_path(path)
-    if not parts:
-        return
-
-    # Direct key (no nesting)
-    if len(parts) == 1:
-        if parts[0] in config:
-            del config[parts[0]]
-        return
-
-    # Nested path
-    current = config
-
-    # Navigate to the parent (all parts except the last)
-    for part in parts[:-1]:
-        if isinstance(current, dict):
-            if part not in current:
-                return
-            current = current[part]
-        elif isinstance(current, list):
-            try:
-                current = current[int(part)]
-            except (IndexError, ValueError):
-                return
-
-    # Remove the final key
-    final_key = parts[-1]
-
-    if isinstance(current, dict) and final_key in current:
-        del current[final_key]
-    elif isinstance(current, list):
-        try:
-            idx = int(final_key)
-            if idx < len(current):
-                del current[idx]
-        except ValueError:
-            pass
-
-    if remove_empty_parent and not current:
-        formatted_parts = [f"'{part}'" if "." in part else part for part in parts[:-1]]
-        remove_nested_value(config, ".".join(formatted_parts), remove_empty_parent)
+    ConfigPath.parse(path).remove(config, remove_empty_parent)
 
 
 def extract_hostname_from_url(_, url: str, **kwargs: Any) -> str:
@@ -430,6 +556,11 @@ def detect_key_type(content: bytes) -> str:
         String indicating key type: "rsa", "ecdsaPrime256v1", "ecdsaSecp256k1", "ecdsaSecp384r1", or "unknown"
     """
     try:
+        # cryptography is slow to import, so is only imported when there are keys to detect
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
         # Try to load as PEM first (check for PEM headers)
         if b"-----BEGIN" in content:
             key = serialization.load_pem_private_key(content, password=None, backend=default_backend())
@@ -460,46 +591,103 @@ def detect_key_type(content: bytes) -> str:
         return "unknown"
 
 
-def sort_tracked_values_for_filtering(tracked_values: list[str]) -> list[str]:
+@dataclass
+class _RemovalNode:
+    """A node of the tree of paths to remove in `filter_out_paths`, for one path component."""
+
+    children: dict[str, "_RemovalNode"] = field(default_factory=dict)
+    # Whether a path to remove ends here
+    removed: bool = False
+
+
+# Returned by _filter_out when a value is removed entirely
+_REMOVED = object()
+
+
+def _filter_out(value: Any, node: _RemovalNode) -> Any:
+    if node.removed:
+        return _REMOVED
+
+    if isinstance(value, dict):
+        filtered_dict: dict[Any, Any] = {}
+        removed_any = False
+        for key, child_value in value.items():
+            # Keys which no path goes through are kept as they are
+            child_node = node.children.get(key) if isinstance(key, str) else None
+            if child_node is None:
+                filtered_dict[key] = copy.deepcopy(child_value)
+                continue
+            child_value = _filter_out(child_value, child_node)
+            if child_value is _REMOVED:
+                removed_any = True
+            else:
+                filtered_dict[key] = child_value
+        filtered: dict[Any, Any] | list[Any] = filtered_dict
+    elif isinstance(value, list):
+        # List indices are resolved against the original list, so removing one never shifts another
+        nodes_by_index: dict[int, list[_RemovalNode]] = defaultdict(list)
+        for part, child_node in node.children.items():
+            try:
+                index = int(part)
+            except ValueError:
+                continue
+            if -len(value) <= index < len(value):
+                nodes_by_index[index % len(value)].append(child_node)
+        filtered_list: list[Any] = []
+        removed_any = False
+        for index, item in enumerate(value):
+            if index not in nodes_by_index:
+                filtered_list.append(copy.deepcopy(item))
+                continue
+            for child_node in nodes_by_index[index]:
+                item = _filter_out(item, child_node)
+                if item is _REMOVED:
+                    removed_any = True
+                    break
+            else:
+                filtered_list.append(item)
+        filtered = filtered_list
+    else:
+        # Paths can't continue through a scalar. As with remove_nested_value, the scalar is then treated
+        # as an empty parent, and so removed if it's falsy
+        return value if value else _REMOVED
+
+    # Containers emptied by the removal of their contents, or which are the direct parent of a removed
+    # path and are empty, are removed too
+    has_removed_child = any(child_node.removed for child_node in node.children.values())
+    if not filtered and (removed_any or has_removed_child):
+        return _REMOVED
+    return filtered
+
+
+def filter_out_paths(config: dict[str, Any], paths: list[str]) -> dict[str, Any]:
     """
-    Sort tracked values so that list indices are processed in descending order.
-    This prevents the list shifting problem when removing indices sequentially.
-    Supports single-quoted keys containing dots (e.g., "a.'my.key'.0").
+    Copy a config without the values at the given paths, or any parents they leave empty.
 
-    For example: ['secrets.keys.0', 'secrets.keys.1', 'secrets.keys.2'] ->
-    ['secrets.keys.2', 'secrets.keys.1', 'secrets.keys.0']
+    This gives the same result as copying the config and calling
+    `remove_nested_value(..., remove_empty_parent=True)` for each path, but walks the config once.
+    All list indices refer to positions in the original config. Removed sub-trees are never copied.
+    Supports single-quoted keys containing dots (e.g., "a.'my.key'.0").
 
     Args:
-        tracked_values: List of dot-separated config paths. Use single quotes
-              to wrap keys containing dots (e.g., "a.'my.key'.0")
+        config: Configuration dictionary, which isn't modified
+        paths: Dot-separated paths of the values to remove
 
     Returns:
-        Sorted list of paths with list indices in descending order within each parent
-    """
-    # Separate paths: regular paths and paths ending with numeric indices
-    regular_paths = []
-    indexed_paths_by_parent: dict[str, list] = defaultdict(list)
-
-    for path in tracked_values:
-        parsed_parts = parse_path(path)
-        if len(parsed_parts) >= 1 and parsed_parts[-1].isdigit():
-            # This is a list index path like 'secrets.keys.2' or 'secrets.'my.key'.2'
-            # Reconstruct parent path from all parts except the last
-            parent_parts = parsed_parts[:-1]
-            parent = ".".join(parent_parts)
-            index = parsed_parts[-1]
-            indexed_paths_by_parent[parent].append((int(index), path))
-        else:
-            regular_paths.append(path)
-
-    # Sort indexed paths by parent (sorted for determinism), then by index descending
-    sorted_indexed: list[str] = []
-    for parent in sorted(indexed_paths_by_parent.keys()):
-        sorted_indexed.extend(
-            path for _, path in sorted(indexed_paths_by_parent[parent], key=lambda x: x[0], reverse=True)
-        )
+        The filtered copy of the config
+    """
+    root = _RemovalNode()
+    for path in paths:
+        parts = ConfigPath.parse(path).parts
+        if not parts:
+            continue
+        node = root
+        for part in parts:
+            node = node.children.setdefault(part, _RemovalNode())
+        node.removed = True
 
-    return regular_paths + sorted_indexed
+    filtered = _filter_out(config, root)
+    return {} if filtered is _REMOVED else filtered
 
 
 def prompt_for_database_choice(summary_logger: logging.Logger, global_options: GlobalOptions) -> bool:
@@ -509,7 +697,7 @@ def prompt_for_database_choice(summary_logger: logging.Logger, global_options: G
     Returns:
         True if user wants to use existing database, False for ESS-managed PostgreSQL
     """
-    if global_options.quiet_mode:
+    if global_options.quiet_mode and not global_options.non_interactive:
         raise MigrationError("Quiet mode is enabled. Cannot prompt for database choice.")
 
     print_section("🗃️  DATABASE CONFIGURATION CHOICE", logger=summary_logger)
@@ -548,6 +736,7 @@ def prompt_for_database_choice(summary_logger: logging.Logger, global_options: G
         ["Use existing database", "Install PostgreSQL with ESS"],
         default="Use existing database",
         global_options=global_options,
+        answer_key="database",
     )
 
     if choice == "Use existing database":
@@ -560,7 +749,58 @@ def prompt_for_database_choice(summary_logger: logging.Logger, global_options: G
         return False
 
 
+class UnansweredPromptError(MigrationError):
+    """Exception for prompts that non-interactive mode can't carry on without answering."""
+
+    pass
+
+
+def _answer_from_file(global_options: GlobalOptions, answer_key: str) -> Any | None:
+    # Each answer is only used once, so that prompts repeated until they get a different answer can't loop forever
+    return global_options.answers.pop(answer_key, None)
+
+
+def _unanswered(
+    summary_logger: logging.Logger,
+    global_options: GlobalOptions,
+    answer_key: str,
+    prompt: str,
+    prompt_type: str,
+    default: Any | None,
+    placeholder: Any,
+    options: list[str] | None = None,
+) -> Any:
+    """
+    Answer a prompt that non-interactive mode has no answer for.
+
+    Args:
+        summary_logger: Logger for displaying prompts and messages
+        global_options: Global options, where the prompt is recorded if it can't be answered
+        answer_key: The key the prompt is answered by in the answers file
+        prompt: The prompt message
+        prompt_type: The kind of prompt: value, choice or yes_no
+        default: The prompt's default, used as its answer if set
+        placeholder: The answer used to carry on the migration when there's no default
+        options: The options of a choice prompt
+
+    Returns:
+        The prompt's default, or else the placeholder
+    """
+    if default is not None:
+        print_prompt(f"{prompt} {default} (default)", logger=summary_logger)
+        return default
+
+    unanswered_prompt: dict[str, Any] = {"key": answer_key, "prompt": prompt, "type": prompt_type}
+    if options is not None:
+        unanswered_prompt["options"] = options
+    global_options.unanswered_prompts.append(unanswered_prompt)
+    logging.warning(f"No answer for prompt '{answer_key}' in non-interactive mode")
+    return placeholder
+
+
 def press_enter_to_continue(summary_logger: logging.Logger, global_options: GlobalOptions) -> None:
+    if global_options.non_interactive:
+        return
     if not global_options.quiet_mode and not os.environ.get("PYTEST_CURRENT_TEST"):
         print_prompt("Press Enter to continue...", logger=summary_logger)
         if is_rich_enabled():
@@ -575,6 +815,7 @@ def prompt_value(
     global_options: GlobalOptions,
     validator: Callable[[str], tuple[bool, str]] | None = None,
     default: str | None = None,
+    answer_key: str | None = None,
 ) -> str:
     """
     Generic function to prompt user for a text value.
@@ -584,13 +825,31 @@ def prompt_value(
         prompt: The prompt message to display
         validator: Optional function that takes input string and returns (is_valid, error_message)
         default: Optional default value if user presses Enter
+        answer_key: Key of the answer in the answers file, defaults to the prompt message
 
     Returns:
         The user's input value (stripped)
 
     Raises:
-        MigrationError: If user cancels the operation (Ctrl+C or EOF)
+        MigrationError: If user cancels the operation (Ctrl+C or EOF), or the answer from the answers file is invalid
+        UnansweredPromptError: If non-interactive mode has no valid value to carry on with
     """
+    answer_key = answer_key or prompt
+    answer = _answer_from_file(global_options, answer_key)
+    if answer is not None:
+        value = str(answer).strip()
+        if validator is not None:
+            is_valid, error_message = validator(value)
+            if not is_valid:
+                raise MigrationError(f"Invalid answer for '{answer_key}': {error_message}")
+        return value
+
+    if global_options.non_interactive:
+        value = _unanswered(summary_logger, global_options, answer_key, prompt, "value", default, placeholder="")
+        if validator is not None and not validator(value)[0]:
+            raise UnansweredPromptError(f"No answer for '{answer_key}' in non-interactive mode")
+        return value
+
     if global_options.quiet_mode:
         raise MigrationError("Quiet mode is enabled. Cannot prompt for value.")
 
@@ -631,6 +890,7 @@ def prompt_choice(
     options: list[str],
     global_options: GlobalOptions,
     default: str | None = None,
+    answer_key: str | None = None,
 ) -> str:
     """
     Prompt user to select from a numbered list of options.
@@ -641,13 +901,29 @@ def prompt_choice(
         options: List of option strings to choose from
         default: Optional default choice (value, not index). If provided and user
                  presses Enter, returns this value.
+        answer_key: Key of the answer in the answers file, defaults to the prompt message.
+                    The answer can be the option string or its number.
 
     Returns:
         The selected option string (not the index)
 
     Raises:
-        MigrationError: If user cancels the operation (Ctrl+C or EOF)
+        MigrationError: If user cancels the operation (Ctrl+C or EOF), or the answer from the answers file is invalid
     """
+    answer_key = answer_key or prompt
+    answer = _answer_from_file(global_options, answer_key)
+    if answer is not None:
+        if str(answer) in options:
+            return str(answer)
+        if str(answer).isdigit() and 0 < int(answer) <= len(options):
+            return options[int(answer) - 1]
+        raise MigrationError(f"Invalid answer for '{answer_key}': {answer} is not one of {', '.join(options)}")
+
+    if global_options.non_interactive:
+        return _unanswered(
+            summary_logger, global_options, answer_key, prompt, "choice", default, options[0], options=options
+        )
+
     if global_options.quiet_mode:
         raise MigrationError("Quiet mode is enabled. Cannot prompt for choice.")
 
@@ -696,6 +972,7 @@ def prompt_yes_no(
     prompt: str,
     global_options: GlobalOptions,
     default: bool | None = None,
+    answer_key: str | None = None,
 ) -> bool:
     """
     Prompt user for a yes/no answer.
@@ -704,13 +981,26 @@ def prompt_yes_no(
         summary_logger: Logger for displaying prompts and messages
         prompt: The prompt message to display
         default: Optional default value if user presses Enter
+        answer_key: Key of the answer in the answers file, defaults to the prompt message
 
     Returns:
         True for yes, False for no
 
     Raises:
-        MigrationError: If user cancels the operation (Ctrl+C or EOF)
+        MigrationError: If user cancels the operation (Ctrl+C or EOF), or the answer from the answers file is invalid
     """
+    answer_key = answer_key or prompt
+    answer = _answer_from_file(global_options, answer_key)
+    if answer is not None:
+        if str(answer).strip().lower() in ("yes", "y", "true", "t", "1"):
+            return True
+        if str(answer).strip().lower() in ("no", "n", "false", "f", "0"):
+            return False
+        raise MigrationError(f"Invalid answer for '{answer_key}': {answer} is not yes or no")
+
+    if global_options.non_interactive:
+        return _unanswered(summary_logger, global_options, answer_key, prompt, "yes_no", default, placeholder=False)
+
     if global_options.quiet_mode:
         raise MigrationError("Quiet mode is enabled. Cannot prompt for input.")
 
@@ -0,0 +1,197 @@
+# Copyright 2026 Element Creations Ltd
+#
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+YAML emitting for the migration outputs.
+
+The dumpers are built once, and use libyaml where it is available and gives the same output as the pure-Python
+emitter, as it is much faster for large values files.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from typing import Any, TextIO
+
+import yaml
+
+from .models import ConfigMap, Secret
+
+try:
+    from yaml import CSafeDumper as FastSafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as FastSafeDumper  # type: ignore[assignment]
+
+YAML_STR_TAG = "tag:yaml.org,2002:str"
+YAML_MAP_TAG = "tag:yaml.org,2002:map"
+
+_NO_SCALAR = object()
+
+# libyaml takes the line width as a C int, so can't be given an infinite width like the pure-Python emitter
+UNLIMITED_WIDTH = 2**31 - 1
+
+
+def _represent_str_with_pipe_for_multiline(dumper: yaml.SafeDumper, data: str) -> yaml.Node:
+    if "\n" in data:
+        # Use literal style (|) for multi-line strings
+        return dumper.represent_scalar(YAML_STR_TAG, data, style="|")
+    # Use regular style for single-line strings
+    return dumper.represent_scalar(YAML_STR_TAG, data)
+
+
+class PipeMultilineDumper(FastSafeDumper):  # type: ignore[misc,valid-type]
+    """Safe dumper that uses the literal style (|) for multi-line strings and never emits aliases."""
+
+    def ignore_aliases(self, data: Any) -> bool:
+        return True
+
+
+class PurePipeMultilineDumper(yaml.SafeDumper):
+    """PipeMultilineDumper with the pure-Python emitter, for data that libyaml would lay out differently."""
+
+    def ignore_aliases(self, data: Any) -> bool:
+        return True
+
+
+PipeMultilineDumper.add_representer(str, _represent_str_with_pipe_for_multiline)  # type: ignore[arg-type]
+PurePipeMultilineDumper.add_representer(str, _represent_str_with_pipe_for_multiline)  # type: ignore[arg-type]
+
+
+def _laid_out_differently_by_libyaml(data: Any) -> bool:
+    """
+    Check if libyaml would lay out some data differently to the pure-Python emitter.
+
+    libyaml measures whether a key is short enough to be a simple key (`key: value`) in bytes rather than
+    characters, with a different limit, and treats empty keys and keys with line breaks differently. It also
+    ends the document with `...` when it ends with a multi-line string that keeps its trailing line breaks.
+
+    Args:
+        data: Data to check
+
+    Returns:
+        True if the data has keys which aren't short printable ASCII, or ends with a string with trailing line
+        breaks, or is a single scalar
+    """
+
+    def has_differing_keys(data: Any) -> bool:
+        if isinstance(data, dict):
+            return any(
+                (isinstance(key, str) and not (0 < len(key) < 120 and key.isascii() and key.isprintable()))
+                or has_differing_keys(value)
+                for key, value in data.items()
+            )
+        if isinstance(data, list):
+            return any(has_differing_keys(item) for item in data)
+        return False
+
+    if not isinstance(data, dict | list):
+        return True
+
+    def last_scalar(data: Any) -> Any:
+        # Empty lists and dicts don't end what libyaml considers an open-ended string
+        if isinstance(data, dict | list):
+            for item in reversed(list(data.values()) if isinstance(data, dict) else data):
+                scalar = last_scalar(item)
+                if scalar is not _NO_SCALAR:
+                    return scalar
+            return _NO_SCALAR
+        return data
+
+    last_value = last_scalar(data)
+    line_breaks = "\n\x85\u2028\u2029"
+    if (
+        isinstance(last_value, str)
+        and "\n" in last_value
+        and last_value[-1] in line_breaks
+        and (len(last_value) == 1 or last_value[-2] in line_breaks)
+    ):
+        return True
+
+    return has_differing_keys(data)
+
+
+def dump_with_pipe_for_multiline(data: Any) -> str:
+    """
+    Dump data as YAML, using the literal style (|) for multi-line strings and never wrapping lines.
+
+    Args:
+        data: Data to serialize to YAML
+
+    Returns:
+        YAML string with pipe characters for multi-line strings
+    """
+    dumper = PurePipeMultilineDumper if _laid_out_differently_by_libyaml(data) else PipeMultilineDumper
+    return yaml.dump(data, Dumper=dumper, default_flow_style=False, sort_keys=False, width=UNLIMITED_WIDTH)
+
+
+def dump_manifests(resources: Iterable[ConfigMap | Secret], stream: TextIO, explicit_start: bool = False) -> None:
+    """
+    Dump Kubernetes resources as YAML documents, one after another.
+
+    Each document is the same as `yaml.safe_dump(resource.to_manifest(), sort_keys=False)` would give.
+    ConfigMaps read the content of their files one at a time as they are written, and use the pure-Python
+    emitter, as libyaml folds long quoted strings at different places.
+
+    Args:
+        resources: Resources to dump
+        stream: Stream to write the YAML to
+        explicit_start: Start each document with `---`, as is needed for more than one document
+    """
+    for resource in resources:
+        if isinstance(resource, ConfigMap):
+            _dump_configmap(resource, stream, explicit_start)
+        else:
+            yaml.dump(
+                resource.to_manifest(),
+                stream,
+                Dumper=FastSafeDumper,
+                sort_keys=False,
+                explicit_start=explicit_start,
+            )
+
+
+def _dump_configmap(configmap: ConfigMap, stream: TextIO, explicit_start: bool) -> None:
+    """
+    Dump a ConfigMap manifest as YAML, reading the content of its files one at a time as they are written.
+
+    This gives the same YAML as `yaml.safe_dump(configmap.to_manifest(), stream, sort_keys=False)`, without
+    holding the content of all the files of the ConfigMap in memory at once.
+
+    Args:
+        configmap: ConfigMap to dump
+        stream: Stream to write the YAML to
+        explicit_start: Start the document with `---`
+    """
+    dumper = yaml.SafeDumper(stream, sort_keys=False)
+
+    def emit_scalar(value: str) -> None:
+        # Quote the value only where the serializer would, e.g. for "true" or "123"
+        implicit = (
+            dumper.resolve(yaml.ScalarNode, value, (True, False)) == YAML_STR_TAG,
+            dumper.resolve(yaml.ScalarNode, value, (False, True)) == YAML_STR_TAG,
+        )
+        dumper.emit(yaml.ScalarEvent(None, YAML_STR_TAG, implicit, value))
+
+    def emit_mapping(items: Iterable[tuple[str, Any]]) -> None:
+        dumper.emit(yaml.MappingStartEvent(None, YAML_MAP_TAG, True, flow_style=False))
+        for key, value in items:
+            emit_scalar(key)
+            if isinstance(value, dict):
+                emit_mapping(value.items())
+            elif isinstance(value, Iterator):
+                emit_mapping(value)
+            else:
+                emit_scalar(value)
+        dumper.emit(yaml.MappingEndEvent())
+
+    manifest = replace(configmap, files={}).to_manifest()
+    manifest["data"] = configmap.iter_data()
+    try:
+        dumper.open()
+        dumper.emit(yaml.DocumentStartEvent(explicit=explicit_start))
+        emit_mapping(manifest.items())
+        dumper.emit(yaml.DocumentEndEvent(explicit=False))
+        dumper.close()
+    finally:
+        dumper.dispose()
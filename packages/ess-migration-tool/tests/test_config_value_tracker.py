@@ -406,3 +406,30 @@ def test_get_conflicts_preserves_real_conflicts():
     conflicts = tracking.get_conflicts()
     assert "serverName" in conflicts
     assert len(conflicts["serverName"]) == 2
+
+
+def test_value_source_tracking_indexes_match_scanning():
+    """Test that the incrementally indexed queries match scanning every tracked source."""
+    tracking = ValueSourceTracking()
+    for index in range(20000):
+        value = None if index % 7 == 0 else index % 3
+        tracking.add_source(f"path{index % 6001}", f"Strategy{index % 3}", value, f"source{index}")
+
+    for strategy_name in ("Strategy0", "Strategy1", "Unknown"):
+        assert sorted(tracking.get_tracked_source_paths(strategy_name)) == sorted(
+            source.source_path
+            for sources in tracking.sources.values()
+            for source in sources
+            if source.strategy_name == strategy_name
+        )
+
+    expected_conflicts = {}
+    for path, sources in tracking.sources.items():
+        sources_with_values = [source for source in sources if source.value is not None]
+        if len({source.strategy_name for source in sources_with_values}) > 1:
+            expected_conflicts[path] = sources_with_values
+    assert expected_conflicts
+    assert tracking.get_conflicts() == expected_conflicts
+
+    # Tracking built from existing sources is indexed too
+    assert ValueSourceTracking(sources=tracking.sources).get_conflicts() == expected_conflicts
@@ -6,14 +6,30 @@
 Pytest tests for extra files discovery functionality.
 """
 
+import base64
+import gzip
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
 import pytest
-from ess_migration_tool.extra_files import ExtraFilesDiscovery, ExtraFilesError
+import yaml
+from ess_migration_tool.element_web import ELEMENT_WEB_STRATEGY_NAME
+from ess_migration_tool.engine import MigrationEngine
+from ess_migration_tool.extra_files import ExtraFilesDiscovery, ExtraFilesError, GenericExtraFileDiscovery
+from ess_migration_tool.inputs import InputProcessor
 from ess_migration_tool.interfaces import ExtraFilesDiscoveryStrategy, SecretDiscoveryStrategy
-from ess_migration_tool.models import DiscoverableSecret, DiscoveredPath, GlobalOptions, SecretConfig
+from ess_migration_tool.models import (
+    ConfigMap,
+    DiscoverableSecret,
+    DiscoveredPath,
+    GlobalOptions,
+    MigrationError,
+    SecretConfig,
+)
+from ess_migration_tool.outputs import write_outputs
+from ess_migration_tool.synapse import SYNAPSE_STRATEGY_NAME
 
 
 def test_validate_extra_files_success(tmp_path):
@@ -478,3 +494,310 @@ def test_permission_error_handling(tmp_path):
 
     # Clean up: restore permissions for cleanup
     restricted_file.chmod(0o644)
+
+
+def test_parallel_discovery_matches_serial_migration(
+    synapse_config_with_signing_key,
+    synapse_config_with_email_templates,
+    synapse_config_with_ca_federation_list,
+    basic_element_web_config,
+    write_config,
+):
+    """Test that discovering extra files concurrently gives the same migration as discovering them serially."""
+    synapse_config_file = write_config(
+        synapse_config_with_signing_key | synapse_config_with_email_templates | synapse_config_with_ca_federation_list,
+        "synapse.yaml",
+        "yaml",
+    )
+    element_web_config_file = write_config(basic_element_web_config, "config.json", "json")
+
+    def run_migration(parallel_discovery):
+        input_processor = InputProcessor()
+        input_processor.load_migration_input(name=SYNAPSE_STRATEGY_NAME, config_path=str(synapse_config_file))
+        input_processor.load_migration_input(name=ELEMENT_WEB_STRATEGY_NAME, config_path=str(element_web_config_file))
+        global_options = GlobalOptions(use_existing_database=True, parallel_discovery=parallel_discovery)
+        engine = MigrationEngine(
+            input_processor=input_processor, summary_logger=logging.getLogger(), global_options=global_options
+        )
+        return engine.run_migration(), engine.configmaps
+
+    serial_ess_config, serial_configmaps = run_migration(parallel_discovery=False)
+    parallel_ess_config, parallel_configmaps = run_migration(parallel_discovery=True)
+
+    assert parallel_ess_config == serial_ess_config
+    assert parallel_configmaps == serial_configmaps
+    assert "extraVolumeMounts" in parallel_ess_config["synapse"]
+
+
+def test_identical_extra_files_share_configmap_key(
+    tmp_path, synapse_config_with_signing_key, synapse_config_with_email_templates, write_config
+):
+    """Test that extra files with the same content are imported once and mounted at each of their paths."""
+    (tmp_path / "ca").mkdir()
+    (tmp_path / "ca" / "ca1.pem").write_text("CA")
+    (tmp_path / "ca" / "ca2.pem").write_text("CA")
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "ca1.pem").write_text("Other CA")
+    synapse_config_file = write_config(
+        synapse_config_with_signing_key
+        | synapse_config_with_email_templates
+        | {
+            "federation_custom_ca_list": [
+                str(tmp_path / "ca" / "ca1.pem"),
+                str(tmp_path / "ca" / "ca2.pem"),
+                str(tmp_path / "other" / "ca1.pem"),
+            ]
+        },
+        "synapse.yaml",
+        "yaml",
+    )
+
+    input_processor = InputProcessor()
+    input_processor.load_migration_input(name=SYNAPSE_STRATEGY_NAME, config_path=str(synapse_config_file))
+    engine = MigrationEngine(
+        input_processor=input_processor,
+        summary_logger=logging.getLogger(),
+        global_options=GlobalOptions(use_existing_database=True),
+    )
+    ess_config = engine.run_migration()
+
+    [configmap] = engine.configmaps
+    data = configmap.to_manifest()["data"]
+    # ca1.pem and ca2.pem share a key, and the other ca1.pem gets a key of its own
+    assert len(data) == 4
+    assert data["ca1.pem"] == "CA"
+    [other_ca_key] = [key for key in data if key.startswith("ca1-")]
+    assert data[other_ca_key] == "Other CA"
+
+    sub_paths = {mount["mountPath"]: mount["subPath"] for mount in ess_config["synapse"]["extraVolumeMounts"]}
+    assert sub_paths["/etc/synapse/extra/ca1.pem"] in ("ca1.pem", other_ca_key)
+    assert sub_paths["/etc/synapse/extra/ca2.pem"] == "ca1.pem"
+    assert sub_paths["/etc/synapse/extra/email_templates/registration.html"] == "registration.html"
+
+    # ca2.pem is mounted from ca1.pem's content, so changing ca1.pem before writing must not go unnoticed
+    (tmp_path / "ca" / "ca1.pem").write_text("Changed CA")
+    with pytest.raises(MigrationError, match="has changed since it was imported"):
+        configmap.to_manifest()
+
+
+def test_configmap_files_are_written_like_safe_dump(tmp_path):
+    """Test that streaming the files of a ConfigMap gives the same YAML as dumping its whole manifest."""
+    contents = {
+        "template.html": "<p>multi\nline</p>\n\n  indented\twith unicode é ☃\n",
+        "empty.txt": "",
+        "boolean.txt": "true",
+        "number.txt": "123",
+        "flow.txt": "it's: a - [x] {y} # z\nfoo   \n",
+    }
+    for filename, content in contents.items():
+        (tmp_path / filename).write_text(content)
+    configmap = ConfigMap(
+        name="imported-synapse",
+        data={"inline": "null"},
+        namespace="ess",
+        files={filename: tmp_path / filename for filename in contents},
+    )
+
+    write_outputs(helm_values="", secrets=[], configmaps=[configmap], output_dir=str(tmp_path))
+
+    written = (tmp_path / "imported-synapse-configmap.yaml").read_text()
+    assert written == yaml.safe_dump(configmap.to_manifest(), sort_keys=False)
+    assert yaml.safe_load(written)["data"] == {"inline": "null"} | contents
+
+
+def migrate_with_ca_files(write_config, synapse_config, ca_files, global_options):
+    """Migrate a Synapse config with federation_custom_ca_list set to the given files."""
+    synapse_config_file = write_config(
+        synapse_config | {"federation_custom_ca_list": [str(ca_file) for ca_file in ca_files]},
+        "synapse.yaml",
+        "yaml",
+    )
+    input_processor = InputProcessor()
+    input_processor.load_migration_input(name=SYNAPSE_STRATEGY_NAME, config_path=str(synapse_config_file))
+    engine = MigrationEngine(
+        input_processor=input_processor, summary_logger=logging.getLogger(), global_options=global_options
+    )
+    return engine.run_migration(), engine.configmaps
+
+
+def test_extra_files_split_across_configmaps(tmp_path, synapse_config_with_signing_key, write_config):
+    """Test that extra files too large for one ConfigMap together are split across several."""
+    ca_files = [tmp_path / f"ca{index}.pem" for index in range(3)]
+    for index, ca_file in enumerate(ca_files):
+        ca_file.write_text(str(index) * 400 * 1024)
+
+    ess_config, configmaps = migrate_with_ca_files(
+        write_config, synapse_config_with_signing_key, ca_files, GlobalOptions(use_existing_database=True)
+    )
+
+    assert [configmap.name for configmap in configmaps] == ["imported-synapse", "imported-synapse-2"]
+    volume_by_key = {}
+    for configmap in configmaps:
+        data = configmap.to_manifest()["data"]
+        assert sum(len(key) + len(value) for key, value in data.items()) <= 1024 * 1024
+        volume_by_key |= dict.fromkeys(data, configmap.name)
+    assert sorted(volume_by_key) == ["ca0.pem", "ca1.pem", "ca2.pem"]
+
+    assert ess_config["synapse"]["extraVolumes"] == [
+        {"name": "imported-synapse", "configMap": {"name": "imported-synapse"}},
+        {"name": "imported-synapse-2", "configMap": {"name": "imported-synapse-2"}},
+    ]
+    for mount in ess_config["synapse"]["extraVolumeMounts"]:
+        assert mount["name"] == volume_by_key[mount["subPath"]]
+
+
+def test_large_extra_files_gzipped(tmp_path, synapse_config_with_signing_key, write_config):
+    """Test that extra files too large for a ConfigMap are only imported when they can be gzipped."""
+    large_content = "-----BEGIN CERTIFICATE-----\n" * 80 * 1024
+    (tmp_path / "large.pem").write_text(large_content)
+    (tmp_path / "small.pem").write_text("CA")
+    ca_files = [tmp_path / "large.pem", tmp_path / "small.pem"]
+
+    ess_config, configmaps = migrate_with_ca_files(
+        write_config, synapse_config_with_signing_key, ca_files, GlobalOptions(use_existing_database=True)
+    )
+    [configmap] = configmaps
+    assert list(configmap.to_manifest()["data"]) == ["small.pem"]
+    assert "binaryData" not in configmap.to_manifest()
+    assert "extraInitContainers" not in ess_config["synapse"]
+
+    ess_config, configmaps = migrate_with_ca_files(
+        write_config,
+        synapse_config_with_signing_key,
+        ca_files,
+        GlobalOptions(use_existing_database=True, compress_large_extra_files=True),
+    )
+    [configmap] = configmaps
+    manifest = configmap.to_manifest()
+    assert list(manifest["data"]) == ["small.pem"]
+    assert gzip.decompress(base64.b64decode(manifest["binaryData"]["large.pem.gz"])).decode() == large_content
+
+    assert {"name": "imported-synapse-unpacked", "emptyDir": {}} in ess_config["synapse"]["extraVolumes"]
+    # The unpacked volume is mounted as a directory, as the chart's init containers mount it before it's unpacked
+    assert [
+        mount for mount in ess_config["synapse"]["extraVolumeMounts"] if mount["name"] == "imported-synapse-unpacked"
+    ] == [{"name": "imported-synapse-unpacked", "mountPath": "/etc/synapse/extra-unpacked"}]
+    assert "/etc/synapse/extra-unpacked/large.pem" in ess_config["synapse"]["additional"]["00-imported.yaml"]["config"]
+    [init_container] = ess_config["synapse"]["extraInitContainers"]
+    assert init_container["image"] == "docker.io/library/busybox:1.37"
+    assert init_container["command"] == [
+        "sh",
+        "-c",
+        "gunzip -c /imported/imported-synapse/large.pem.gz > /unpacked/large.pem",
+    ]
+
+
+def test_unpack_init_container_kept_with_existing_init_containers(tmp_path, config_value_transformer):
+    """Test that the init container unpacking gzipped files is added after any existing init containers."""
+    large_file = tmp_path / "large.pem"
+    large_file.write_text("-----BEGIN CERTIFICATE-----\n" * 80 * 1024)
+
+    @dataclass
+    class TestStrategy(ExtraFilesDiscoveryStrategy):
+        @property
+        def ignored_config_keys(self):
+            return []
+
+    discovery = ExtraFilesDiscovery(
+        strategy=TestStrategy(),
+        summary_logger=logging.getLogger(),
+        secrets_strategy=None,
+        source_file="test.yaml",
+        global_options=GlobalOptions(),
+    )
+    discovery.discover_extra_files_from_config({"ca_file": str(large_file)})
+
+    transformer = config_value_transformer(__name__)
+    transformer.global_options.compress_large_extra_files = True
+    transformer.ess_config["synapse"] = {"extraInitContainers": [{"name": "existing"}]}
+    transformer.handle_extra_files_mounts(discovery, "synapse", [])
+
+    assert [container["name"] for container in transformer.ess_config["synapse"]["extraInitContainers"]] == [
+        "existing",
+        "unpack-imported-files",
+    ]
+
+
+def test_directories_with_large_extra_files_unpacked(tmp_path, synapse_config_with_signing_key, write_config):
+    """Test that a directory with a gzipped file is unpacked whole, with its other files, into the unpacked volume."""
+    templates_dir = tmp_path / "templates"
+    templates_dir.mkdir()
+    large_content = "<p>large</p>\n" * 100 * 1024
+    (templates_dir / "large.html").write_text(large_content)
+    (templates_dir / "small.html").write_text("<p>small</p>")
+    synapse_config_file = write_config(
+        synapse_config_with_signing_key | {"templates": {"custom_template_directory": str(templates_dir)}},
+        "synapse.yaml",
+        "yaml",
+    )
+    input_processor = InputProcessor()
+    input_processor.load_migration_input(name=SYNAPSE_STRATEGY_NAME, config_path=str(synapse_config_file))
+    engine = MigrationEngine(
+        input_processor=input_processor,
+        summary_logger=logging.getLogger(),
+        global_options=GlobalOptions(
+            use_existing_database=True, compress_large_extra_files=True, unpack_image="registry.example.com/busybox"
+        ),
+    )
+    ess_config = engine.run_migration()
+
+    # Nothing in the directory is mounted with a subPath, as the config points at the unpacked directory instead
+    assert ess_config["synapse"]["extraVolumeMounts"] == [
+        {"name": "imported-synapse-unpacked", "mountPath": "/etc/synapse/extra-unpacked"}
+    ]
+    additional_config = yaml.safe_load(ess_config["synapse"]["additional"]["00-imported.yaml"]["config"])
+    assert additional_config["templates"]["custom_template_directory"] == "/etc/synapse/extra-unpacked/templates"
+    [init_container] = ess_config["synapse"]["extraInitContainers"]
+    assert init_container["image"] == "registry.example.com/busybox"
+    assert init_container["command"] == [
+        "sh",
+        "-c",
+        "mkdir -p /unpacked/templates"
+        " && gunzip -c /imported/imported-synapse/large.html.gz > /unpacked/templates/large.html"
+        " && cp /imported/imported-synapse/small.html /unpacked/templates/small.html",
+    ]
+    assert {"name": "imported-synapse", "mountPath": "/imported/imported-synapse", "readOnly": True} in init_container[
+        "volumeMounts"
+    ]
+
+
+def test_paths_used_by_several_config_keys(tmp_path, monkeypatch):
+    """Test that a directory used by several configuration keys is listed once and found for all of them."""
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "header.html").write_text("header")
+    (tmp_path / "templates" / "footer.html").write_text("footer")
+    (tmp_path / "ca.pem").write_text("CA")
+    config_data = {
+        "template_dir": str(tmp_path / "templates"),
+        "templates": {"directory": str(tmp_path / "templates")},
+        "ca": str(tmp_path / "ca.pem"),
+        "federation_ca": [str(tmp_path / "ca.pem")],
+    }
+
+    listed_paths = []
+    original_scandir = os.scandir
+
+    def scandir(path):
+        listed_paths.append(Path(path))
+        return original_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    discovery = ExtraFilesDiscovery(
+        strategy=GenericExtraFileDiscovery(component_name="Test", component_root_key="test"),
+        summary_logger=logging.getLogger(),
+        secrets_strategy=None,
+        source_file="test.yaml",
+        global_options=GlobalOptions(),
+    )
+    discovery.discover_extra_files_from_config(config_data)
+
+    assert listed_paths.count(tmp_path / "templates") == 1
+    assert discovery.missing_file_paths == []
+    assert sorted(discovery.discovered_extra_files) == [
+        tmp_path / "ca.pem",
+        tmp_path / "templates" / "footer.html",
+        tmp_path / "templates" / "header.html",
+    ]
+    for extra_file in discovery.discovered_extra_files.values():
+        assert len(extra_file.discovered_source_paths) == 2
@@ -0,0 +1,135 @@
+# Copyright 2026 Element Creations Ltd
+#
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Tests for fleet migrations of many estates in one invocation.
+"""
+
+import json
+import logging
+import sys
+
+import pytest
+import yaml
+from ess_migration_tool import __main__
+from ess_migration_tool.fleet import Estate, load_fleet_manifest, migrate_estate
+from ess_migration_tool.inputs import ValidationError
+
+
+def test_fleet_migration(monkeypatch, tmp_path, synapse_config_with_signing_key, write_config):
+    """Test that every estate of a fleet manifest is migrated to its own output directory."""
+    write_config(synapse_config_with_signing_key, "synapse.yaml", "yaml")
+    broken_synapse_config = dict(synapse_config_with_signing_key)
+    del broken_synapse_config["macaroon_secret_key"]
+    write_config(broken_synapse_config, "broken-synapse.yaml", "yaml")
+    manifest_file = write_config(
+        {
+            "estates": [
+                {"name": "first", "synapse_config": "synapse.yaml", "database_mode": "existing"},
+                {"name": "second", "synapse_config": "synapse.yaml", "database_mode": "ess-managed"},
+                {"name": "broken", "synapse_config": "broken-synapse.yaml"},
+            ]
+        },
+        "fleet.yaml",
+        "yaml",
+    )
+    output_dir = tmp_path / "output"
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["migration", "--manifest", str(manifest_file), "--output-dir", str(output_dir), "--jobs", "2", "--profile"],
+    )
+    assert __main__.main() == 1
+
+    first_values = yaml.safe_load((output_dir / "first" / "values.yaml").read_text())
+    second_values = yaml.safe_load((output_dir / "second" / "values.yaml").read_text())
+    assert first_values["serverName"] == second_values["serverName"] == "test.example.com"
+    assert "postgres" in first_values["synapse"]
+    assert "postgres" not in second_values["synapse"]
+    assert (output_dir / "first" / "migration-summary.log").exists()
+    first_profile = json.loads((output_dir / "first" / "migration-profile.json").read_text())
+    assert "transformations" in first_profile["strategies"]["Synapse"]
+    assert not (output_dir / "broken" / "values.yaml").exists()
+
+    summary = json.loads((output_dir / "fleet-summary.json").read_text())
+    results = {result["name"]: result for result in summary["estates"]}
+    assert list(results) == ["first", "second", "broken"]
+    assert results["first"]["succeeded"]
+    assert results["second"]["succeeded"]
+    assert not results["broken"]["succeeded"]
+    assert [prompt["key"] for prompt in results["broken"]["unanswered_prompts"]] == ["secrets.synapse.macaroon"]
+    assert (output_dir / "broken" / "unanswered-prompts.json").exists()
+
+
+def test_estate_output_dir_failure(tmp_path, synapse_config_with_signing_key, write_config):
+    """Test that an estate whose output directory can't be created fails without raising."""
+    synapse_config_file = write_config(synapse_config_with_signing_key, "synapse.yaml", "yaml")
+    (tmp_path / "not-a-dir").write_text("")
+    output_dir = str(tmp_path / "not-a-dir" / "first")
+
+    result = migrate_estate(
+        Estate(name="first", synapse_config=str(synapse_config_file), database_mode="existing"), output_dir, True
+    )
+
+    assert not result.succeeded
+    assert result.error
+
+
+def test_estate_logs_stay_in_estate_log(tmp_path, synapse_config_with_signing_key, write_config):
+    """Test that an estate's logs only go to its own summary log, not the handlers of the main process."""
+    synapse_config_file = write_config(synapse_config_with_signing_key, "synapse.yaml", "yaml")
+    migration_logger = logging.getLogger("migration")
+    migration_logger.setLevel(logging.INFO)
+    records: list[logging.LogRecord] = []
+    main_handler = logging.Handler()
+    main_handler.emit = records.append  # type: ignore[method-assign]
+    migration_logger.addHandler(main_handler)
+    try:
+        result = migrate_estate(
+            Estate(name="first", synapse_config=str(synapse_config_file), database_mode="existing"),
+            str(tmp_path / "first"),
+        )
+        assert migration_logger.handlers[-1] is main_handler
+    finally:
+        migration_logger.removeHandler(main_handler)
+
+    assert result.succeeded
+    assert records == []
+    assert "Starting migration process" in (tmp_path / "first" / "migration-summary.log").read_text()
+
+
+def test_fleet_manifest_validation(tmp_path, write_config):
+    """Test that invalid fleet manifests are rejected before migrating anything."""
+    for estates, error in [
+        ([], "non-empty estates list"),
+        ([{"name": "first"}], "needs a name and synapse_config"),
+        ([{"name": "first", "synapse_config": "a.yaml", "unknown": True}], "unknown options: unknown"),
+        ([{"name": "first", "synapse_config": "a.yaml", "database_mode": "other"}], "database_mode"),
+        ([{"name": "first", "synapse_config": "a.yaml"}] * 2, "duplicate estates: first"),
+        ([{"name": "../other", "synapse_config": "a.yaml"}], "invalid name '../other'"),
+        ([{"name": "/tmp/other", "synapse_config": "a.yaml"}], "invalid name '/tmp/other'"),
+        ([{"name": "a/b", "synapse_config": "a.yaml"}], "invalid name 'a/b'"),
+        ([{"name": "..", "synapse_config": "a.yaml"}], "invalid name '..'"),
+        ([{"name": "", "synapse_config": "a.yaml"}], "invalid name ''"),
+        ([{"name": 42, "synapse_config": "a.yaml"}], "invalid name 42"),
+        ([{"name": ["first"], "synapse_config": "a.yaml"}], r"invalid name \['first'\]"),
+        ([{"name": "first", "synapse_config": 42}], "options must be paths: synapse_config"),
+        (
+            [{"name": "first", "synapse_config": "a.yaml", "mas_config": ["b.yaml"]}],
+            "options must be paths: mas_config",
+        ),
+    ]:
+        manifest_file = write_config({"estates": estates}, "fleet.yaml", "yaml")
+        with pytest.raises(ValidationError, match=error):
+            load_fleet_manifest(str(manifest_file))
+
+    manifest_file = write_config([{"name": "first", "synapse_config": "a.yaml"}], "fleet.yaml", "yaml")
+    with pytest.raises(ValidationError, match="non-empty estates list"):
+        load_fleet_manifest(str(manifest_file))
+
+    manifest_file = write_config(
+        {"estates": [{"name": "first", "synapse_config": "synapse/homeserver.yaml"}]}, "fleet.yaml", "yaml"
+    )
+    assert load_fleet_manifest(str(manifest_file))[0].synapse_config == str(tmp_path / "synapse/homeserver.yaml")
@@ -0,0 +1,61 @@
+# Copyright 2026 Element Creations Ltd
+#
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Tests for loading the input configuration files.
+"""
+
+import pytest
+import yaml
+from ess_migration_tool.inputs import InputProcessor, ValidationError
+from ess_migration_tool.yaml_emitter import FastSafeDumper
+
+
+@pytest.fixture
+def large_synapse_config():
+    """A megabyte sized Synapse configuration, with many appservices and inlined keys."""
+    return {
+        "server_name": "example.com",
+        "app_service_config_files": [f"/data/appservices/bridge-{index}.yaml" for index in range(5000)],
+        "trusted_key_servers": [
+            {"server_name": f"server-{index}.example.com", "verify_keys": {f"ed25519:key{index}": "A" * 43}}
+            for index in range(5000)
+        ],
+        "form_secret": "multi\nline\nsecret\n" * 1000,
+    }
+
+
+def test_load_yaml_file_read_and_mmap_match(tmp_path, large_synapse_config, monkeypatch):
+    """Test that reading and memory-mapping a large YAML file load the config that was written."""
+    config_path = tmp_path / "homeserver.yaml"
+    config_path.write_text(yaml.dump(large_synapse_config, Dumper=FastSafeDumper))
+
+    read_config = InputProcessor.load_yaml_file(str(config_path), use_mmap=False)
+    mmap_config = InputProcessor.load_yaml_file(str(config_path), use_mmap=True)
+
+    assert read_config == mmap_config == large_synapse_config
+    # Large files are memory-mapped by default
+    monkeypatch.setattr("ess_migration_tool.inputs.MMAP_MIN_FILE_SIZE", 1024)
+    assert InputProcessor.load_yaml_file(str(config_path)) == large_synapse_config
+
+
+def test_load_files_validation(tmp_path):
+    """Test that the files to load are validated by the same open as reading them."""
+    with pytest.raises(ValidationError, match="File does not exist"):
+        InputProcessor.load_yaml_file(str(tmp_path / "missing.yaml"))
+
+    with pytest.raises(ValidationError, match="Path is not a file"):
+        InputProcessor.load_json_file(str(tmp_path))
+
+    (tmp_path / "empty.yaml").write_text("")
+    assert InputProcessor.load_yaml_file(str(tmp_path / "empty.yaml"), use_mmap=True) == {}
+
+    (tmp_path / "config.json").write_text('{"default_server_config": {"m.homeserver": {}}}')
+    assert InputProcessor.load_json_file(str(tmp_path / "config.json")) == {
+        "default_server_config": {"m.homeserver": {}}
+    }
+
+    (tmp_path / "invalid.json").write_text("{")
+    with pytest.raises(ValidationError, match="Invalid JSON"):
+        InputProcessor.load_json_file(str(tmp_path / "invalid.json"))
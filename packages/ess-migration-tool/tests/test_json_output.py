@@ -0,0 +1,147 @@
+# Copyright 2026 Element Creations Ltd
+#
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Tests for the JSON document written by --output-format json.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import yaml
+from ess_migration_tool import __main__, outputs, rich_output
+
+
+def run_with_json_output(monkeypatch, capsys, synapse_config_file, output_dir, *extra_args):
+    """Run the CLI with --output-format json, returning its exit code and the document it wrote."""
+    # Restored after the test, as JSON output disables console output for the rest of the process
+    monkeypatch.setattr(rich_output, "_console_disabled", False)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "migration",
+            "--synapse-config",
+            str(synapse_config_file),
+            "--output-dir",
+            str(output_dir),
+            "--output-format",
+            "json",
+            *extra_args,
+        ],
+    )
+    exit_code = __main__.main()
+    stdout = capsys.readouterr().out
+    # The document is the only output, on a single line
+    assert stdout.count("\n") == 1
+    return exit_code, json.loads(stdout)
+
+
+def test_json_output(
+    monkeypatch, capsys, tmp_path, synapse_config_with_signing_key, synapse_config_with_email_templates, write_config
+):
+    """Test that the JSON document has the same values and manifests as the written files."""
+    synapse_config_file = write_config(
+        synapse_config_with_signing_key | synapse_config_with_email_templates, "synapse.yaml", "yaml"
+    )
+    output_dir = tmp_path / "output"
+
+    exit_code, document = run_with_json_output(monkeypatch, capsys, synapse_config_file, output_dir)
+
+    assert exit_code == 0
+    assert document["succeeded"]
+    assert document["error"] is None
+    assert document["values"] == yaml.safe_load((output_dir / "values.yaml").read_text())
+    assert document["files"]["values"] == str(output_dir / "values.yaml")
+    assert document["configmaps"] == [
+        yaml.safe_load((output_dir / f"{configmap['metadata']['name']}-configmap.yaml").read_text())
+        for configmap in document["configmaps"]
+    ]
+    assert document["configmaps"][0]["data"]["password_reset.html"] == "test_password_reset_content"
+
+    # Secrets are referenced without their values
+    secret_manifest = yaml.safe_load((output_dir / "imported-synapse-secret.yaml").read_text())
+    assert {"name": "imported-synapse", "keys": list(secret_manifest["data"])} in document["secrets"]
+    assert "macaroon" not in json.dumps(document["secrets"]).replace("synapse.macaroon", "")
+
+    assert document["missing_files"] == []
+    assert document["unanswered_prompts"] == []
+    assert "transformations" in document["timings"]["strategies"]["Synapse"]
+    # Memory is only traced with --profile
+    assert document["timings"]["peak_memory_bytes"] is None
+    assert not list(output_dir.glob("migration-profile-*.json"))
+
+
+def test_json_output_of_failed_migration(
+    monkeypatch, capsys, tmp_path, synapse_config_with_signing_key, synapse_config_with_ca_federation_list, write_config
+):
+    """Test that the JSON document reports why the migration failed, without prompting for missing files."""
+    missing_ca = str(tmp_path / "missing-ca.pem")
+    ca_list = [*synapse_config_with_ca_federation_list["federation_custom_ca_list"], missing_ca]
+    synapse_config_file = write_config(
+        synapse_config_with_signing_key | {"federation_custom_ca_list": ca_list}, "synapse.yaml", "yaml"
+    )
+
+    exit_code, document = run_with_json_output(monkeypatch, capsys, synapse_config_file, tmp_path / "output")
+
+    assert exit_code == 1
+    assert not document["succeeded"]
+    assert document["error"]
+    assert document["values"] is None
+    assert document["configmaps"] == []
+    assert [missing_file["path"] for missing_file in document["missing_files"]] == [missing_ca]
+    assert document["missing_files"][0]["component"] == "Synapse"
+    # Missing files default to being given another path, which has no default
+    answer_key = f"extra_files.{document['missing_files'][0]['config_key']}"
+    assert [prompt["key"] for prompt in document["unanswered_prompts"]] == [answer_key, f"{answer_key}.path"]
+
+
+def test_json_output_leaves_out_skipped_missing_files(
+    monkeypatch, capsys, tmp_path, synapse_config_with_signing_key, synapse_config_with_ca_federation_list, write_config
+):
+    """Test that missing files that the answers skip aren't reported as missing."""
+    ca_list = [*synapse_config_with_ca_federation_list["federation_custom_ca_list"], str(tmp_path / "missing-ca.pem")]
+    synapse_config_file = write_config(
+        synapse_config_with_signing_key | {"federation_custom_ca_list": ca_list}, "synapse.yaml", "yaml"
+    )
+    answers_file = write_config(
+        {f"extra_files.federation_custom_ca_list.{len(ca_list) - 1}": "Skip these files and continue"},
+        "answers.yaml",
+        "yaml",
+    )
+
+    exit_code, document = run_with_json_output(
+        monkeypatch, capsys, synapse_config_file, tmp_path / "output", "--answers", str(answers_file)
+    )
+
+    assert exit_code == 0
+    assert document["succeeded"]
+    assert document["missing_files"] == []
+
+
+def test_json_output_when_configmap_files_cant_be_read(
+    monkeypatch, capsys, tmp_path, synapse_config_with_signing_key, synapse_config_with_email_templates, write_config
+):
+    """Test that a ConfigMap file that can't be read for the JSON document gives a whole document reporting it."""
+    synapse_config_file = write_config(
+        synapse_config_with_signing_key | synapse_config_with_email_templates, "synapse.yaml", "yaml"
+    )
+    template_path = Path(synapse_config_with_email_templates["templates"]["custom_template_directory"])
+    original_write_outputs = outputs.write_outputs
+
+    def write_outputs_then_change_template(**kwargs):
+        written = original_write_outputs(**kwargs)
+        (template_path / "password_reset.html").write_text("changed")
+        return written
+
+    monkeypatch.setattr(outputs, "write_outputs", write_outputs_then_change_template)
+
+    exit_code, document = run_with_json_output(monkeypatch, capsys, synapse_config_file, tmp_path / "output")
+
+    assert exit_code == 1
+    assert not document["succeeded"]
+    assert "Failed to read the ConfigMap files" in document["error"]
+    assert "has changed since it was imported" in document["error"]
+    assert document["configmaps"] == []
@@ -2,9 +2,12 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import copy
 
 import pytest
 from ess_migration_tool.utils import (
+    ConfigPath,
+    filter_out_paths,
     find_matching_schema_key,
     get_nested_value,
     is_wildcard_pattern,
@@ -12,7 +15,6 @@ from ess_migration_tool.utils import (
     path_matches_pattern,
     remove_nested_value,
     set_nested_value,
-    sort_tracked_values_for_filtering,
 )
 
 
@@ -31,6 +33,24 @@ def test_parse_path():
     assert parse_path("") == []
 
 
+def test_config_path_is_parsed_once():
+    assert ConfigPath.parse("a.'my.key'.b") is ConfigPath.parse("a.'my.key'.b")
+    assert ConfigPath.parse("a.'my.key'.b").parts == ("a", "my.key", "b")
+    assert str(ConfigPath.parse("a.'my.key'.b")) == "a.'my.key'.b"
+    assert ConfigPath.parse("a.'my.key'.b").parent == ConfigPath.parse("a.'my.key'")
+
+
+def test_config_path_operations(sample_config):
+    path = ConfigPath.parse("a.b.d.1")
+    assert path.get(sample_config) == 20
+    path.set(sample_config, 25)
+    assert sample_config["a"]["b"]["d"] == [10, 25, 30]
+    path.remove(sample_config)
+    assert sample_config["a"]["b"]["d"] == [10, 30]
+    assert path.matches(ConfigPath.parse("a.*.d.*"))
+    assert not path.matches(ConfigPath.parse("a.*"))
+
+
 def test_get_nested_value(sample_config):
     # Test direct key access
     assert get_nested_value(sample_config, "a") == {"b": {"c": 42, "d": [10, 20, 30]}, "e": "hello"}
@@ -253,83 +273,65 @@ def test_find_matching_schema_key_multiple_patterns():
     assert find_matching_schema_key("z.5.y", schema) is None
 
 
-# Tests for sort_tracked_values_for_filtering
-
-
-def test_sort_tracked_values_basic():
-    """Test basic sorting of list indices in descending order."""
-    tracked = ["a", "b.0", "b.1", "b.2"]
-    result = sort_tracked_values_for_filtering(tracked)
-    # Regular paths first (in their original order), then indexed paths sorted descending
-    assert result == ["a", "b.2", "b.1", "b.0"]
-
-
-def test_sort_tracked_values_multiple_parents():
-    """Test sorting with multiple parent groups."""
-    tracked = ["secrets.keys.0", "secrets.encryption", "secrets.keys.1", "other.value", "secrets.keys.2"]
-    result = sort_tracked_values_for_filtering(tracked)
-    # Regular paths first, then each parent's indices in descending order
-    assert result == ["secrets.encryption", "other.value", "secrets.keys.2", "secrets.keys.1", "secrets.keys.0"]
-
-
-def test_sort_tracked_values_no_indices():
-    """Test with no list indices."""
-    tracked = ["a", "b.c", "d.e.f"]
-    result = sort_tracked_values_for_filtering(tracked)
-    assert result == ["a", "b.c", "d.e.f"]
-
-
-def test_sort_tracked_values_nested_list_indices():
-    """Test with deeply nested paths where last part is an index."""
-    tracked = ["a.b.c.0", "a.b.c.1", "a.b.c.2"]
-    result = sort_tracked_values_for_filtering(tracked)
-    assert result == ["a.b.c.2", "a.b.c.1", "a.b.c.0"]
-
+# Tests for quoted key support in nested value operations
 
-def test_sort_tracked_values_mixed_numeric_non_numeric():
-    """Test with mixed paths - some ending in numbers, some not."""
-    tracked = ["a.0", "b.name", "a.1", "c.5", "b.other"]
-    result = sort_tracked_values_for_filtering(tracked)
-    # Regular paths first (in original order), then indexed paths sorted by parent then by index descending
-    assert result == ["b.name", "b.other", "a.1", "a.0", "c.5"]
 
+def test_nested_operations_with_quoted_keys():
+    config = {}
+    set_nested_value(config, "a.'my.key'.b", "value")
+    assert get_nested_value(config, "a.'my.key'.b") == "value"
+    remove_nested_value(config, "a.'my.key'.b")
+    assert get_nested_value(config, "a.'my.key'.b") is None
 
-def test_sort_tracked_values_empty_list():
-    """Test with empty input."""
-    assert sort_tracked_values_for_filtering([]) == []
 
+def test_find_matching_schema_key_with_many_wildcards():
+    # Mirrors a schema with many wildcard keys, e.g. one per MAS private key, checked against a linear scan
+    schema = {f"matrixAuthenticationService.privateKeys.{index}.*": None for index in range(300)}
+    schema |= {f"component{index}.*.value": None for index in range(300)}
+    schema |= {"a.*.*": None, "a.b.*": None, "a.b.c": None, "'x.y'.*": None}
 
-def test_sort_tracked_values_single_element():
-    """Test with single element."""
-    assert sort_tracked_values_for_filtering(["a.0"]) == ["a.0"]
+    def linear_scan(path):
+        if path in schema:
+            return path
+        return next((key for key in schema if is_wildcard_pattern(key) and path_matches_pattern(path, key)), None)
 
+    paths = [f"matrixAuthenticationService.privateKeys.{index}.ecdsaPrime256v1" for index in range(0, 400, 7)]
+    paths += [f"component{index}.secret.value" for index in range(0, 400, 7)]
+    paths += ["a.b.c", "a.b.d", "a.c.d", "a.b", "'x.y'.z", "x.y.z", "component1.value", ""]
+    for path in paths:
+        assert find_matching_schema_key(path, schema) == linear_scan(path), path
 
-def test_sort_tracked_values_index_zero():
-    """Test that index 0 is handled correctly."""
-    tracked = ["keys.0"]
-    result = sort_tracked_values_for_filtering(tracked)
-    assert result == ["keys.0"]
 
+# Tests for filter_out_paths
 
-def test_sort_tracked_values_real_world_mas_keys():
-    """Test the real-world case from MAS individual keys migration."""
-    tracked = ["secrets.encryption", "secrets.keys.0", "secrets.keys.1", "secrets.keys.2"]
-    result = sort_tracked_values_for_filtering(tracked)
-    assert result == ["secrets.encryption", "secrets.keys.2", "secrets.keys.1", "secrets.keys.0"]
 
+def test_filter_out_paths(sample_config):
+    filtered = filter_out_paths(sample_config, ["a.b.c", "a.b.d.0", "a.b.d.2", "f.1.x", "missing.path", ""])
+    # List indices refer to the positions in the original config, whatever order the paths are given in
+    assert filtered == {"a": {"b": {"d": [20]}, "e": "hello"}, "f": [{"x": 1}, {"x": 3}]}
+    # The original config is left untouched and untouched values are copied
+    assert sample_config["a"]["b"]["d"] == [10, 20, 30]
+    assert filtered["f"][0] is not sample_config["f"][0]
 
-# Tests for quoted key support in nested value operations
 
+def test_filter_out_paths_removes_emptied_parents(sample_config):
+    filtered = filter_out_paths(sample_config, ["a.b.c", "a.b.d.0", "a.b.d.1", "a.b.d.2", "f.0.x", "'my.key'"])
+    assert filtered == {"a": {"e": "hello"}, "f": [{"x": 2}, {"x": 3}]}
 
-def test_nested_operations_with_quoted_keys():
-    config = {}
-    set_nested_value(config, "a.'my.key'.b", "value")
-    assert get_nested_value(config, "a.'my.key'.b") == "value"
-    remove_nested_value(config, "a.'my.key'.b")
-    assert get_nested_value(config, "a.'my.key'.b") is None
 
+def test_filter_out_paths_matches_sequential_removal():
+    config = {
+        "server_name": "example.com",
+        "listeners": [{"port": 8008}, {"port": 9000}],
+        "database": {"args": {"user": "synapse", "password": "secret"}},
+        "'my.key'": {"a": 1},
+        "my.key": {"b": 2},
+        "empty": {},
+    }
+    paths = ["server_name", "database.args.user", "database.args.password", "listeners.1", "'my.key'.b", "empty.x"]
 
-def test_sort_tracked_values_with_quoted_keys():
-    tracked = ["a.'my.key'.0", "a.'my.key'.1"]
-    result = sort_tracked_values_for_filtering(tracked)
-    assert result == ["a.'my.key'.1", "a.'my.key'.0"]
+    # Only one list index is removed, so sequential removal can't shift any other path
+    expected = copy.deepcopy(config)
+    for path in paths:
+        remove_nested_value(expected, path, remove_empty_parent=True)
+    assert filter_out_paths(config, paths) == expected
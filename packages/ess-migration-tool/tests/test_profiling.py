@@ -0,0 +1,81 @@
+# Copyright 2026 Element Creations Ltd
+#
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Tests for profiling the phases of migration runs.
+"""
+
+import json
+import sys
+import time
+
+from ess_migration_tool import __main__
+from ess_migration_tool.profiling import (
+    ADDITIONAL_CONFIG_FILTERING_PHASE,
+    EXTRA_FILE_DISCOVERY_PHASE,
+    MOUNTS_PHASE,
+    SECRET_DISCOVERY_PHASE,
+    SECRETS_PHASE,
+    TRANSFORMATIONS_PHASE,
+    MigrationProfiler,
+)
+
+
+def test_nested_phases_are_only_timed_once():
+    """Test that the time of a nested phase is not also counted for the phase it runs in."""
+    profiler = MigrationProfiler()
+    profiler.start()
+    with (
+        profiler.phase("Synapse", TRANSFORMATIONS_PHASE),
+        profiler.phase("Synapse", ADDITIONAL_CONFIG_FILTERING_PHASE),
+    ):
+        time.sleep(0.05)
+        memory = bytearray(1024 * 1024)
+    profiler.stop()
+    del memory
+
+    timings = profiler.timings["Synapse"]
+    assert timings[ADDITIONAL_CONFIG_FILTERING_PHASE].wall_seconds >= 0.05
+    assert timings[TRANSFORMATIONS_PHASE].wall_seconds < 0.05
+    assert timings[TRANSFORMATIONS_PHASE].calls == 1
+    assert profiler.wall_seconds >= 0.05
+    assert profiler.peak_memory_bytes is not None
+    assert profiler.peak_memory_bytes >= 1024 * 1024
+
+
+def test_main_writes_profile(monkeypatch, tmp_path, synapse_config_with_signing_key, write_config):
+    """Test that --profile writes the timings of each phase next to the migration summary."""
+    synapse_config_file = write_config(synapse_config_with_signing_key, "synapse.yaml", "yaml")
+    output_dir = tmp_path / "output"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "migration",
+            "--synapse-config",
+            str(synapse_config_file),
+            "--output-dir",
+            str(output_dir),
+            "--database-mode",
+            "existing",
+            "--non-interactive",
+            "--profile",
+        ],
+    )
+    assert __main__.main() == 0
+
+    summary_path = next(output_dir.glob("migration-summary-*.log"))
+    profile_path = output_dir / summary_path.name.replace("summary", "profile").replace(".log", ".json")
+    profile = json.loads(profile_path.read_text())
+    assert profile["peak_memory_bytes"] > 0
+    assert profile["wall_seconds"] > 0
+    assert set(profile["strategies"]["Synapse"]) == {
+        SECRET_DISCOVERY_PHASE,
+        EXTRA_FILE_DISCOVERY_PHASE,
+        MOUNTS_PHASE,
+        TRANSFORMATIONS_PHASE,
+        ADDITIONAL_CONFIG_FILTERING_PHASE,
+        SECRETS_PHASE,
+    }
+    assert profile["strategies"]["Synapse"][TRANSFORMATIONS_PHASE]["calls"] == 1
@@ -9,11 +9,15 @@ Tests for missing secrets and extra files handling.
 
 import asyncio
 import base64
+import json
 import logging
 import shutil
+import sys
 from io import StringIO
 
 import pytest
+import yaml
+from ess_migration_tool import __main__
 from ess_migration_tool.engine import MigrationEngine
 from ess_migration_tool.extra_files import ExtraFilesError
 from ess_migration_tool.inputs import InputProcessor
@@ -539,3 +543,89 @@ def test_database_choice_prompt_default(
             raise
     finally:
         log_capture_string.close()
+
+
+def test_non_interactive_migration_with_answers_file(
+    monkeypatch, tmp_path, synapse_config_with_signing_key, write_config
+):
+    """Test that a non-interactive migration takes its answers from the answers file and defaults."""
+    synapse_config = dict(synapse_config_with_signing_key)
+    del synapse_config["public_baseurl"]
+    del synapse_config["database"]["args"]["password"]
+    del synapse_config["macaroon_secret_key"]
+    synapse_config_file = write_config(synapse_config, "synapse.yaml", "yaml")
+    answers_file = write_config(
+        {
+            "synapse.ingress_host": "matrix.example.com",
+            "secrets.synapse.postgres.password": "test_db_password",
+            "secrets.synapse.macaroon": "test_macaroon",
+        },
+        "answers.yaml",
+        "yaml",
+    )
+    output_dir = tmp_path / "output"
+
+    def fail_on_input(prompt=""):
+        pytest.fail(f"Prompted in non-interactive mode: {prompt}")
+
+    monkeypatch.setattr("builtins.input", fail_on_input)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "migration",
+            "--synapse-config",
+            str(synapse_config_file),
+            "--output-dir",
+            str(output_dir),
+            "--answers",
+            str(answers_file),
+            "--non-interactive",
+        ],
+    )
+    assert __main__.main() == 0
+
+    values = yaml.safe_load((output_dir / "values.yaml").read_text())
+    assert values["synapse"]["ingress"]["host"] == "matrix.example.com"
+    # The database choice wasn't answered, so its default of using the existing database is used
+    assert "postgres" in values["synapse"]
+    secrets = {
+        key: base64.b64decode(value).decode()
+        for secret_file in output_dir.glob("*-secret.yaml")
+        for key, value in yaml.safe_load(secret_file.read_text())["data"].items()
+    }
+    assert secrets["synapse.postgres.password"] == "test_db_password"
+    assert secrets["synapse.macaroon"] == "test_macaroon"
+    assert not (output_dir / "unanswered-prompts.json").exists()
+
+
+def test_non_interactive_migration_reports_unanswered_prompts(
+    monkeypatch, tmp_path, synapse_config_with_signing_key, write_config
+):
+    """Test that a non-interactive migration reports every prompt it had no answer for at once."""
+    synapse_config = dict(synapse_config_with_signing_key)
+    del synapse_config["public_baseurl"]
+    del synapse_config["macaroon_secret_key"]
+    synapse_config_file = write_config(synapse_config, "synapse.yaml", "yaml")
+    output_dir = tmp_path / "output"
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "migration",
+            "--synapse-config",
+            str(synapse_config_file),
+            "--output-dir",
+            str(output_dir),
+            "--non-interactive",
+        ],
+    )
+    assert __main__.main() == 1
+
+    report = json.loads((output_dir / "unanswered-prompts.json").read_text())
+    assert [prompt["key"] for prompt in report["unanswered_prompts"]] == [
+        "synapse.ingress_host",
+        "secrets.synapse.macaroon",
+    ]
+    assert not (output_dir / "values.yaml").exists()
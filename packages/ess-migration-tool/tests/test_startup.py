@@ -0,0 +1,45 @@
+# Copyright 2026 Element Creations Ltd
+#
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Tests that the CLI starts without importing dependencies it doesn't need yet.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Dependencies that are slow to import, and are only needed by some migrations
+HEAVY_DEPENDENCIES = {"cryptography", "rapidfuzz", "rich"}
+
+
+def imported_modules(code: str, *args: str) -> set[str]:
+    """Run Python code in a new interpreter, returning the names of the modules it imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+
+
+@pytest.mark.parametrize("args", [["--help"], []])
+def test_cli_arguments_parsed_before_importing_migration(args):
+    """Test that --help and usage errors don't import the migration or its dependencies."""
+    modules = imported_modules("from ess_migration_tool.__main__ import main; main()", *args)
+
+    assert "ess_migration_tool.__main__" in modules
+    assert "ess_migration_tool.engine" not in modules
+    assert "yaml" not in modules
+    assert not modules & HEAVY_DEPENDENCIES
+
+
+def test_migration_imports_heavy_dependencies_when_used():
+    """Test that the migration only imports Rich, rapidfuzz and cryptography when it needs them."""
+    modules = imported_modules("import ess_migration_tool.engine, ess_migration_tool.fleet")
+
+    assert "ess_migration_tool.synapse" in modules
+    assert not modules & HEAVY_DEPENDENCIES
@@ -10,8 +10,12 @@ Tests that multi-line strings in additional configurations are properly formatte
 using the pipe (|) character for better readability in Helm charts.
 """
 
+from pathlib import Path
+
+import pytest
 import yaml
-from ess_migration_tool.outputs import generate_helm_values
+from ess_migration_tool.models import ConfigMap, Secret
+from ess_migration_tool.outputs import generate_helm_values, write_outputs
 from ess_migration_tool.utils import yaml_dump_with_pipe_for_multiline
 
 
@@ -182,3 +186,81 @@ encryption_enabled_by_default_for_room_type: invite
     additional_config_content = parsed["synapse"]["additional"]["00-imported.yaml"]["config"]
     assert "allowed_avatar_mimetypes" in additional_config_content
     assert "enable_metrics: true" in additional_config_content
+
+
+def pure_python_dump_with_pipe_for_multiline(data):
+    """The YAML that yaml_dump_with_pipe_for_multiline gave with only the pure-Python emitter."""
+
+    def multiline_string_representer(dumper, data):
+        if "\n" in data:
+            return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+        return dumper.represent_scalar("tag:yaml.org,2002:str", data)
+
+    class PurePythonDumper(yaml.SafeDumper):
+        def ignore_aliases(self, data):
+            return True
+
+    PurePythonDumper.add_representer(str, multiline_string_representer)
+    return yaml.dump(data, Dumper=PurePythonDumper, default_flow_style=False, sort_keys=False, width=float("inf"))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "value",
+        "true",
+        "123",
+        "line1\nline2",
+        "line1\nline2\n",
+        "trailing newlines\n\n",
+        "\n",
+        "  leading spaces\nline2\n",
+        "trailing spaces  \nline2",
+        "tabs\tand\r\ncarriage returns\n",
+        "unicode é ☃\nline2",
+        "control \x00 \x85 characters",
+        "a long line with spaces " * 20,
+        "quotes ' \" and: colons # hashes - [lists] {maps}\n",
+    ],
+)
+def test_yaml_dump_with_pipe_for_multiline_byte_identical(value):
+    """Test that the shared emitter gives exactly the YAML the pure-Python emitter does."""
+    for data in (
+        {"key": value},
+        {"list": [value, {"nested": value}], "after": [{}, []]},
+        {value: {"key": value}},
+        {value * 10: 1},
+        {"a": {"b": [1, 2.5, None, True, value, [], {}]}},
+        [value],
+    ):
+        assert yaml_dump_with_pipe_for_multiline(data) == pure_python_dump_with_pipe_for_multiline(data)
+
+
+def test_combined_manifests_match_separate_files(tmp_path):
+    """Test that the combined manifests file has the same documents as the separate files."""
+    (tmp_path / "template.html").write_text("<p>multi\nline</p>\n  é ☃\n")
+    configmaps = [
+        ConfigMap(name="imported-synapse", data={}, files={"template.html": tmp_path / "template.html"}),
+        ConfigMap(name="imported-synapse-2", data={"inline": "true"}),
+    ]
+    secrets = [Secret(name="imported-synapse", data={"synapse.signingKey": "ZWQyNTUxOSBhIGtleQ==" * 10})]
+    (tmp_path / "separate").mkdir()
+    (tmp_path / "combined").mkdir()
+
+    _, secret_paths, configmap_paths = write_outputs(
+        helm_values="", secrets=secrets, configmaps=configmaps, output_dir=str(tmp_path / "separate")
+    )
+    _, combined_secret_paths, combined_configmap_paths = write_outputs(
+        helm_values="",
+        secrets=secrets,
+        configmaps=configmaps,
+        output_dir=str(tmp_path / "combined"),
+        combine_manifests=True,
+    )
+
+    assert combined_secret_paths == combined_configmap_paths == [str(tmp_path / "combined" / "manifests.yaml")]
+    separate_documents = [Path(path).read_text() for path in configmap_paths + secret_paths]
+    for document, resource in zip(separate_documents, configmaps + secrets, strict=True):
+        assert document == yaml.safe_dump(resource.to_manifest(), sort_keys=False)
+    assert Path(combined_secret_paths[0]).read_text() == "".join(f"---\n{document}" for document in separate_documents)
@@ -4,5 +4,6 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 
 pytest_plugins = [
+    "manifests.template_sources",
     "manifests.utils",
 ]
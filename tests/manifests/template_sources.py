@@ -0,0 +1,134 @@
+# Copyright 2026 Element Creations Ltd
+#
+# SPDX-License-Identifier: AGPL-3.0-only
+
+# Records which chart templates each test's renders came from, via the `# Source:` comments helm emits, and uses
+# that to only run the tests that a change could affect with `--manifests-changed-since <git ref>`.
+#
+# Only templates that render to something have a `# Source:` comment. A template change could make it start
+# rendering for a values file that it previously rendered nothing for. As it's normally a component being enabled
+# that causes its templates to render, a changed template selects every test that rendered anything from the same
+# template directory. Any chart change that can't be traced like this (helpers, configs, values.yaml, the schema,
+# templates that no test has rendered, ...) selects every test.
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+CHART_PATH = "charts/matrix-stack"
+TESTS_PATH = "tests/manifests"
+TEMPLATE_SOURCES_CACHE_KEY = "ess-helm/manifests-template-sources"
+
+tests_template_sources: dict[str, set[str]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.addoption(
+        "--manifests-changed-since",
+        metavar="REF",
+        default=None,
+        help="Only run the manifest tests that changes since the given git ref could affect, based on the templates "
+        "each test rendered when it was last run",
+    )
+
+
+def record_template_sources(request: pytest.FixtureRequest, sources: frozenset[str]):
+    tests_template_sources.setdefault(request.node.nodeid, set()).update(sources)
+
+
+def changed_files_since(ref: str) -> set[str]:
+    changed_files = subprocess.run(
+        ["git", "diff", "--name-only", ref], capture_output=True, check=True, text=True
+    ).stdout.splitlines()
+    untracked_files = subprocess.run(
+        ["git", "ls-files", "--full-name", "--others", "--exclude-standard"], capture_output=True, check=True, text=True
+    ).stdout.splitlines()
+    return set(changed_files) | set(untracked_files)
+
+
+def template_dir(source: str) -> str:
+    # Sources are relative to the directory containing the chart, e.g. matrix-stack/templates/synapse/synapse.yaml
+    return str(Path(source).parent)
+
+
+def is_affected(
+    item: pytest.Item,
+    recorded_sources: set[str] | None,
+    changed_template_dirs: set[str],
+    changed_values_files: set[str],
+    changed_test_files: set[str],
+    chart_changed: bool,
+) -> bool:
+    if item.nodeid.split("::")[0] in changed_test_files:
+        return True
+
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None and callspec.params.get("values_file") in changed_values_files:
+        return True
+
+    # Tests that haven't been run before, or that didn't render anything but may read the chart directly
+    if not recorded_sources:
+        return chart_changed
+    return any(template_dir(source) in changed_template_dirs for source in recorded_sources)
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]):
+    ref = config.getoption("--manifests-changed-since", None)
+    cache = getattr(config, "cache", None)
+    if ref is None or cache is None:
+        return
+
+    all_recorded_sources: dict[str, list[str]] = cache.get(TEMPLATE_SOURCES_CACHE_KEY, {})
+    known_sources = {source for sources in all_recorded_sources.values() for source in sources}
+
+    changed_template_dirs = set[str]()
+    changed_values_files = set[str]()
+    changed_test_files = set[str]()
+    chart_changed = False
+    for changed_file in changed_files_since(ref):
+        if changed_file.startswith(f"{TESTS_PATH}/"):
+            if Path(changed_file).name.startswith("test_"):
+                changed_test_files.add(changed_file)
+            else:
+                # Test infrastructure
+                return
+        elif changed_file.startswith(f"{CHART_PATH}/"):
+            chart_changed = True
+            source = str(Path(changed_file).relative_to(Path(CHART_PATH).parent))
+            if changed_file.startswith((f"{CHART_PATH}/ci/", f"{CHART_PATH}/ci_extra/")):
+                changed_values_files.add(Path(changed_file).name)
+            elif source in known_sources:
+                changed_template_dirs.add(template_dir(source))
+            else:
+                return
+
+    selected = []
+    deselected = []
+    for item in items:
+        recorded_sources = all_recorded_sources.get(item.nodeid)
+        if is_affected(
+            item,
+            set(recorded_sources) if recorded_sources is not None else None,
+            changed_template_dirs,
+            changed_values_files,
+            changed_test_files,
+            chart_changed,
+        ):
+            selected.append(item)
+        else:
+            deselected.append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    cache = getattr(session.config, "cache", None)
+    if cache is None or not tests_template_sources:
+        return
+
+    all_recorded_sources: dict[str, list[str]] = cache.get(TEMPLATE_SOURCES_CACHE_KEY, {})
+    all_recorded_sources.update({nodeid: sorted(sources) for nodeid, sources in tests_template_sources.items()})
+    cache.set(TEMPLATE_SOURCES_CACHE_KEY, all_recorded_sources)
@@ -4,6 +4,7 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 
 import abc
+import functools
 import re
 from base64 import b64decode, b64encode
 from collections import Counter
@@ -14,6 +15,7 @@ import pytest
 
 from . import DeployableDetails, secret_values_files_to_test, values_files_to_test
 from .utils import (
+    RenderedManifests,
     get_or_empty,
     iterate_pod_template,
     workload_spec_containers,
@@ -39,6 +41,8 @@ def get_configmap(templates, other_configmaps, configmap_name):
     :param configmap_name: The name of the ConfigMap to retrieve.
     :return: A string containing the content of the ConfigMap, or an empty string if not found.
     """
+    if isinstance(templates, RenderedManifests) and f"ConfigMap/{configmap_name}" in templates.by_id:
+        return templates.by_id[f"ConfigMap/{configmap_name}"]
     for t in templates + other_configmaps:
         if t["kind"] == "ConfigMap" and t["metadata"]["name"] == configmap_name:
             return t
@@ -51,6 +55,8 @@ def get_secret(templates, other_secrets, secret_name):
     :param secret_name: The name of the Secret to retrieve.
     :return: A string containing the content of the Secret, or an empty string if not found.
     """
+    if isinstance(templates, RenderedManifests):
+        templates = [templates.secret_providers[secret_name]] if secret_name in templates.secret_providers else []
     for t in templates:
         if t["kind"] == "Secret" and t["metadata"]["name"] == secret_name:
             return t
@@ -86,29 +92,32 @@ def get_volume_from_mount(workload_spec, volume_mount):
     )
 
 
-def match_path_in_content(content: str) -> list[str]:
-    paths_found = []
+# The negative lookahead prevents matching subnets like "192.168.0.0/16", "fe80::/10"
+# And also things that do not start with / like "text/xml"
+# The pattern [^\s\n\")`:%;,/]+[^\s\n\")`:%;,]+ is a regex that will find paths like /path/to/file
+# It expects to find absolute paths only
+# It is possible to add noqa in the content to ignore this path
+PATH_IN_CONTENT_PATTERN = re.compile(r"((?<![0-9a-zA-Z:])/[^\s\n\")`:'%;,/]+[^\s\n\")`:'%;,]+(?!.*noqa))")
+READFILE_PATTERN = re.compile(r"{{\s+(?:readfile\s+)(?:^|\s|\".+)\s*}}")
+
+
+# The same ConfigMap contents, env values, etc are seen by many containers across many renders, so are only
+# scanned once per session
+@functools.cache
+def match_path_in_content(content: str) -> tuple[str, ...]:
+    paths_found: list[str] = []
     for match_in in content.split("\n"):
         for exclude in ["://", "/bin/sh", "helm.sh/"]:
             if exclude in match_in:
                 break
         else:
-            # The negative lookahead prevents matching subnets like "192.168.0.0/16", "fe80::/10"
-            # And also things that do not start with / like "text/xml"
-            # The pattern [^\s\n\")`:%;,/]+[^\s\n\")`:%;,]+ is a regex that will find paths like /path/to/file
-            # It expects to find absolute paths only
-            # It is possible to add noqa in the content to ignore this path
-            for match in re.findall(r"((?<![0-9a-zA-Z:])/[^\s\n\")`:'%;,/]+[^\s\n\")`:'%;,]+(?!.*noqa))", match_in):
-                paths_found.append(match)
-    return paths_found
+            paths_found += PATH_IN_CONTENT_PATTERN.findall(match_in)
+    return tuple(paths_found)
 
 
 def find_path_in_content(path, matches_in: list[str]):
-    for match_in in matches_in:
-        for match in re.findall(re.escape(path), match_in):
-            if match:
-                return True
-    return False
+    # Paths are matched literally, an empty path never matches
+    return bool(path) and any(path in match_in for match_in in matches_in)
 
 
 def is_matrix_tools_command(container_spec: dict, subcommand: str) -> bool:
@@ -174,11 +183,15 @@ class MountedSecret(SourceOfMountedPaths):
                 secret_name=template["metadata"]["name"], data=template_data, mount_point=volume_mount["mountPath"]
             )
 
-    def get_mounted_paths(self) -> list[tuple[ParentMount, MountNode | None]]:
+    @functools.cached_property
+    def _mounted_paths(self) -> list[tuple[ParentMount, MountNode | None]]:
         return [
             (ParentMount(self.mount_point), MountNode(k, b64decode(v).decode("utf-8"))) for k, v in self.data.items()
         ]
 
+    def get_mounted_paths(self) -> list[tuple[ParentMount, MountNode | None]]:
+        return self._mounted_paths
+
     def name(self) -> str:
         return f"Secret {self.secret_name}"
 
@@ -356,7 +369,7 @@ class ConfigMapPathConsumer(PathConsumer):
         return any(find_path_in_content(path, [content]) for _, content in self.data.items())
 
     def get_all_paths_in_content(self, deployable_details: DeployableDetails) -> list[str]:
-        paths = []
+        paths: list[str] = []
         for key, content in self.data.items():
             if key in deployable_details.skip_path_consistency_for_files:
                 continue
@@ -414,10 +427,15 @@ class GenericContainerSpecPathConsumer(PathConsumer):
         )
 
     def path_is_used_in_content(self, path) -> bool:
-        return find_path_in_content(path, self._all_container_content())
+        return find_path_in_content(path, [self._searchable_content])
+
+    @functools.cached_property
+    def _searchable_content(self) -> str:
+        # Paths never contain NUL, so they can't match across the joins
+        return "\0".join(self._all_container_content())
 
     def get_all_paths_in_content(self, deployable_details: DeployableDetails):
-        paths = []
+        paths: list[str] = []
         for content in self._all_container_content():
             paths += match_path_in_content(content)
         return paths
@@ -471,10 +489,7 @@ class RenderConfigContainerPathConsumer(PathConsumer):
                 assert "subPath" not in volume_mount, "render-config should not target a file mounted using `subPath`"
                 assert self.output.mount_node is not None
                 mutable_empty_dirs[volume["name"]].render_config_outputs[self.output.mount_node.node_name] = "\n".join(
-                    [
-                        re.sub(r"{{\s+(?:readfile\s+)(?:^|\s|\".+)\s*}}", "", content)
-                        for content in self.inputs_files.values()
-                    ]
+                    [READFILE_PATTERN.sub("", content) for content in self.inputs_files.values()]
                 )
 
     def path_is_used_in_content(self, path) -> bool:
@@ -494,7 +509,7 @@ class RenderConfigContainerPathConsumer(PathConsumer):
         )
 
     def get_all_paths_in_content(self, deployable_details: DeployableDetails):
-        paths = []
+        paths: list[str] = []
         for key, content in self.inputs_files.items():
             if key in deployable_details.skip_path_consistency_for_files:
                 continue
@@ -610,12 +625,15 @@ class ValidatedContainerConfig(ValidatedConfig):
             )
         return validated_config
 
-    def check_mounted_files_unique(self):
-        mounted_files = [
-            str(MountPath(parent_mount, mount_node))
+    def _mounted_paths(self) -> list[tuple[str, ParentMount, MountNode | None, SourceOfMountedPaths]]:
+        return [
+            (str(MountPath(parent_mount, mount_node)), parent_mount, mount_node, source)
             for source in self.sources_of_mounted_paths
             for parent_mount, mount_node in source.get_mounted_paths()
         ]
+
+    def check_mounted_files_unique(self):
+        mounted_files = [mounted_file for mounted_file, _, _, _ in self._mounted_paths()]
         assert len(mounted_files) == len(set(mounted_files)), (
             f"{self.template_id}/{self.name} : "
             f"Mounted files are not unique \n"
@@ -626,22 +644,21 @@ class ValidatedContainerConfig(ValidatedConfig):
     def check_paths_used_in_content(self):
         paths_not_found = []
         skipped_paths = []
-        for source in self.sources_of_mounted_paths:
-            for parent_mount, mount_node in source.get_mounted_paths():
-                if (
-                    str(MountPath(parent_mount, mount_node))
-                    in self.deployable_details.ignore_unreferenced_mounts.get(self.name, [])
-                    # for now we deliberately mount too many secrets in /secrets
-                    or parent_mount.path.startswith("/secrets")
-                    or (mount_node and mount_node.node_name in self.deployable_details.skip_path_consistency_for_files)
-                ):
-                    skipped_paths.append(str(MountPath(parent_mount, mount_node)))
-                    continue
-                for path_consumer in self.paths_consumers:
-                    if path_consumer.path_is_used_in_content(str(MountPath(parent_mount, mount_node))):
-                        break
-                else:
-                    paths_not_found.append((str(MountPath(parent_mount, mount_node)), source))
+        ignore_unreferenced_mounts = self.deployable_details.ignore_unreferenced_mounts.get(self.name, [])
+        for mounted_path, parent_mount, mount_node, source in self._mounted_paths():
+            if (
+                mounted_path in ignore_unreferenced_mounts
+                # for now we deliberately mount too many secrets in /secrets
+                or parent_mount.path.startswith("/secrets")
+                or (mount_node and mount_node.node_name in self.deployable_details.skip_path_consistency_for_files)
+            ):
+                skipped_paths.append(mounted_path)
+                continue
+            for path_consumer in self.paths_consumers:
+                if path_consumer.path_is_used_in_content(mounted_path):
+                    break
+            else:
+                paths_not_found.append((mounted_path, source))
         newline = chr(10)
 
         def _format_path_and_source(path_and_source):
@@ -656,18 +673,13 @@ class ValidatedContainerConfig(ValidatedConfig):
 
     def check_all_paths_matches_an_actual_mount(self):
         paths_which_do_not_match = []
+        # str.startswith accepts a tuple of prefixes to check them all at once
+        mounted_paths = tuple(mounted_path for mounted_path, _, _, _ in self._mounted_paths())
+        ignore_paths_mismatches = self.deployable_details.ignore_paths_mismatches.get(self.name, [])
         for path_consumer in self.paths_consumers:
             for path in path_consumer.get_all_paths_in_content(self.deployable_details):
-                for parent_mount, mount_node in (
-                    mounted
-                    for mounted_path in self.sources_of_mounted_paths
-                    for mounted in mounted_path.get_mounted_paths()
-                ):
-                    if path.startswith(str(MountPath(parent_mount, mount_node))):
-                        break
-                else:
-                    if path not in self.deployable_details.ignore_paths_mismatches.get(self.name, []):
-                        paths_which_do_not_match.append(path)
+                if not path.startswith(mounted_paths) and path not in ignore_paths_mismatches:
+                    paths_which_do_not_match.append(path)
         assert paths_which_do_not_match == [], (
             f"Paths which do not match an actual file in {self.template_id}/{self.name}: {paths_which_do_not_match}. "
             f"Skipped {self.deployable_details.skip_path_consistency_for_files}\n"
@@ -3,13 +3,26 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import json
 import os
 import pathlib
 from pathlib import Path
 
 import pytest
 
-from . import all_components_details, secret_values_files_to_test, values_files_to_test
+from . import (
+    PropertyType,
+    all_components_details,
+    all_deployables_details,
+    secret_values_files_to_test,
+    values_files_to_test,
+)
+from .utils import (
+    find_services_matching_selector,
+    find_workload_ids_matching_selector,
+    iterate_pod_template,
+    load_values,
+)
 
 
 def test_all_components_covered():
@@ -54,3 +67,51 @@ def test_validation_messages_will_be_first_processed_template():
     # and so we want our validation template to have run first
     paths.sort(key=lambda path: (len(path.parents), path), reverse=True)
     assert paths[0] == (Path("z_validation") / "validation.txt")
+
+
+@pytest.mark.parametrize("values_file", values_files_to_test | secret_values_files_to_test)
+@pytest.mark.asyncio_cooperative
+def test_values_changes_dont_leak_into_other_tests(values_file, values):
+    shared_values = json.dumps(load_values(values_file))
+
+    for deployable_details in all_deployables_details:
+        deployable_details.set_helm_values(values, PropertyType.Labels, {"leaked": "label"})
+        deployable_details.set_helm_values(values, PropertyType.Tolerations, [{"key": "leaked"}])
+    for component_values in values.values():
+        if isinstance(component_values, dict):
+            component_values.setdefault("leaked", []).append("leaked")
+
+    assert json.dumps(load_values(values_file)) == shared_values
+    assert json.dumps(values) != shared_values
+
+
+@pytest.mark.parametrize("values_file", values_files_to_test | secret_values_files_to_test)
+@pytest.mark.asyncio_cooperative
+def test_values_copies_dont_leak_into_other_tests(values_file, values):
+    shared_values = json.dumps(load_values(values_file))
+
+    for values_copy in [dict(values), {**values}, values | {}, values.copy()]:
+        for component_values in values_copy.values():
+            if isinstance(component_values, dict):
+                component_values.setdefault("leaked", []).append("leaked")
+                component_values["portType"] = "leaked"
+
+    assert json.dumps(load_values(values_file)) == shared_values
+
+
+@pytest.mark.parametrize("values_file", values_files_to_test | secret_values_files_to_test)
+@pytest.mark.asyncio_cooperative
+async def test_rendered_manifests_indexes_match_scanning(templates):
+    unindexed_templates = list(templates)
+    for template in templates:
+        for selector in [template["metadata"].get("labels", {}), template.get("spec", {}).get("selector", {})]:
+            assert find_services_matching_selector(templates, selector) == find_services_matching_selector(
+                unindexed_templates, selector
+            )
+            assert find_workload_ids_matching_selector(templates, selector) == find_workload_ids_matching_selector(
+                unindexed_templates, selector
+            )
+
+    assert [details.manifest_id for details in iterate_pod_template(templates)] == [
+        details.manifest_id for details in iterate_pod_template(unindexed_templates)
+    ]
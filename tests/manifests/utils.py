@@ -3,41 +3,127 @@
 #
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import asyncio
 import base64
-import copy
+import functools
+import hashlib
 import json
+import os
 import random
+import re
+import resource
 import shutil
 import string
+import subprocess
+import sys
 import tempfile
 from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import pyhelm3
 import pytest
 import yaml
-from frozendict import deepfreeze, frozendict
+from frozendict import frozendict
 
 from . import DeployableDetails, PropertyType, all_deployables_details
-
-template_cache: dict[str, list[frozendict[str, Any]]] = {}
-manifests_cache: dict[int, frozendict] = {}
+from .template_sources import record_template_sources
+
+template_cache: dict[str, "RenderedManifests"] = {}
+# Every frozen node (manifests, and each dict, list and string within them) seen in any cached render. Identical
+# sub-trees, such as labels, security contexts and whole containers, are shared between manifests and between renders.
+# Cached renders are kept for the whole session, so this only keeps alive nodes that they keep alive anyway
+interned_nodes: dict[Any, Any] = {}
+interning_stats = {"nodes": 0, "shared": 0}
 values_cache: dict[str, dict[str, Any]] = {}
+manifest_name_to_deployable_details: dict[str, DeployableDetails] = {}
+container_to_deployable_details: dict[tuple[str, str], DeployableDetails] = {}
+
+# Rendered output of `helm template` can also be persisted in the pytest cache directory so that it can be
+# re-used between sessions. Renders are keyed on everything that goes into them, including the release name and
+# namespace, so this is only worthwhile with --manifests-reuse-names which keeps these between sessions rather than
+# picking new random ones. Renders live under a directory named after the digest of the chart they came from, so any
+# change to a file in the chart makes them unreachable. Directories for charts that weren't rendered in a session are
+# removed at the end of it, as are the least recently used renders beyond MAX_CACHED_RENDERS.
+render_cache_dir: Path | None = None
+chart_digests: dict[str, str] = {}
+MAX_CACHED_RENDERS = 5000
+REUSED_NAMES_CACHE_KEY = "ess-helm/manifests-reused-names"
+
+# Renders in progress, by their in-memory cache key. This only de-duplicates identical renders requested at the same
+# time, which then share one helm process. Every distinct render still runs its own `helm template`, as Helm has no
+# long-lived mode to render several charts or values files in one process.
+inflight_renders: dict[str, asyncio.Future["RenderedManifests"]] = {}
+
+# The values files used by the selected tests, so they can all be rendered concurrently at the start of the session
+collected_values_files_key = pytest.StashKey[set[str]]()
+helm_processes = asyncio.Semaphore(os.cpu_count() or 1)
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.addoption(
+        "--manifests-reuse-names",
+        action="store_true",
+        default=False,
+        help="Render the manifests with the same random release name and namespace as the previous session that "
+        "used this option, so that unchanged renders can be loaded from the pytest cache",
+    )
 
 
-@pytest.fixture(scope="session")
-async def release_name():
+def pytest_configure(config: pytest.Config):
+    global render_cache_dir
+    cache = getattr(config, "cache", None)
+    if cache is not None and config.getoption("--manifests-reuse-names"):
+        render_cache_dir = cache.mkdir("ess-helm-manifest-renders")
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    if render_cache_dir is None or not chart_digests:
+        return
+    for chart_render_dir in render_cache_dir.iterdir():
+        if chart_render_dir.name not in chart_digests.values():
+            shutil.rmtree(chart_render_dir, ignore_errors=True)
+
+    # Renders are touched whenever they're read, so the oldest are the least recently used
+    cached_renders = sorted(render_cache_dir.glob("*/*.yaml"), key=lambda path: path.stat().st_mtime_ns, reverse=True)
+    for cached_render in cached_renders[MAX_CACHED_RENDERS:]:
+        cached_render.unlink(missing_ok=True)
+
+
+def random_names() -> tuple[str, str]:
     # As per test_names_arent_too_long we've only got 52 chars to play with
     # We give most (29) to the release_name (user controlled)
     # 'pytest-' is 7 chars, we need another 22 to get to 29.
-    return f"pytest-{''.join(random.choices(string.ascii_lowercase, k=22))}"
+    release_name = f"pytest-{''.join(random.choices(string.ascii_lowercase, k=22))}"
+    namespace = f"pytest-{''.join(random.choices(string.ascii_lowercase, k=10))}"
+    return release_name, namespace
+
+
+@pytest.fixture(scope="session")
+async def release_and_namespace(pytestconfig: pytest.Config) -> tuple[str, str]:
+    # Names are random each session to catch templates that only work for some names. With --manifests-reuse-names
+    # they're kept from the previous such session instead, so that renders can be found in the on-disk render cache
+    if not pytestconfig.getoption("--manifests-reuse-names"):
+        return random_names()
+
+    reused_names = pytestconfig.cache.get(REUSED_NAMES_CACHE_KEY, None)
+    if reused_names is not None:
+        return tuple(reused_names)
+    release_name, namespace = random_names()
+    pytestconfig.cache.set(REUSED_NAMES_CACHE_KEY, [release_name, namespace])
+    return release_name, namespace
 
 
 @pytest.fixture(scope="session")
-async def namespace():
-    return f"pytest-{''.join(random.choices(string.ascii_lowercase, k=10))}"
+async def release_name(release_and_namespace: tuple[str, str]):
+    return release_and_namespace[0]
+
+
+@pytest.fixture(scope="session")
+async def namespace(release_and_namespace: tuple[str, str]):
+    return release_and_namespace[1]
 
 
 @pytest.fixture(scope="session")
@@ -47,9 +133,18 @@ async def helm_client():
 
 @pytest.fixture
 async def temp_chart(helm_client):
+    # An overlay of the chart where only Chart.yaml is a real, writable, copy. Everything else is symlinked back
+    # to the chart so that there's no need to copy the whole tree for every test
     with tempfile.TemporaryDirectory() as tmpdirname:
-        shutil.copytree("charts/matrix-stack", Path(tmpdirname) / "matrix-stack")
-        yield Path(tmpdirname) / "matrix-stack"
+        chart_path = Path("charts/matrix-stack").absolute()
+        temp_chart_path = Path(tmpdirname) / "matrix-stack"
+        temp_chart_path.mkdir()
+        for chart_entry in chart_path.iterdir():
+            if chart_entry.name == "Chart.yaml":
+                shutil.copyfile(chart_entry, temp_chart_path / chart_entry.name)
+            else:
+                (temp_chart_path / chart_entry.name).symlink_to(chart_entry, target_is_directory=chart_entry.is_dir())
+        yield temp_chart_path
 
 
 @pytest.fixture(scope="session")
@@ -62,8 +157,127 @@ def base_values() -> dict[str, Any]:
     return yaml.safe_load(Path("charts/matrix-stack/values.yaml").read_text("utf-8"))
 
 
-@pytest.fixture
-def values(values_file) -> dict[str, Any]:
+def _copy_on_access(value: Any) -> Any:
+    if isinstance(value, CopyOnWriteDict | CopyOnWriteList):
+        return value
+    elif isinstance(value, dict):
+        return CopyOnWriteDict(value)
+    elif isinstance(value, list):
+        return CopyOnWriteList(value)
+    return value
+
+
+class CopyOnWriteDict(dict[str, Any]):
+    """A shallow copy of a (shared) values dict that only copies the nested dicts & lists that are accessed.
+
+    Any nested dict or list that is read out of this is replaced by a `CopyOnWriteDict` or `CopyOnWriteList`
+    that this owns, so changes made through it never reach the shared tree. Sub-trees that are never touched
+    remain shared with the original.
+    """
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, dict | list) and not isinstance(value, CopyOnWriteDict | CopyOnWriteList):
+            value = _copy_on_access(value)
+            super().__setitem__(key, value)
+        return value
+
+    def __iter__(self):
+        # Overriding this stops `dict(...)`, `{**...}` & `.update(...)` from taking CPython's fast path that copies
+        # the underlying entries directly, so they go through `keys()` & `__getitem__` and get the nested copies
+        return super().__iter__()
+
+    def __or__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            super().__setitem__(key, default)
+        return self[key]
+
+    def pop(self, key, *args):
+        if key in self:
+            self[key]
+        return super().pop(key, *args)
+
+    def popitem(self):
+        self._copy_all()
+        return super().popitem()
+
+    def values(self):
+        self._copy_all()
+        return super().values()
+
+    def items(self):
+        self._copy_all()
+        return super().items()
+
+    def copy(self):
+        return CopyOnWriteDict(self)
+
+    def _copy_all(self):
+        for key in self:
+            self[key]
+
+    def unwrap(self) -> dict[str, Any]:
+        """Returns a plain dict equal to this, without copying any of the sub-trees that are still shared."""
+        return {key: _unwrap(value) for key, value in super().items()}
+
+
+class CopyOnWriteList(list[Any]):
+    """The list equivalent of `CopyOnWriteDict`."""
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._copy_all()
+            return super().__getitem__(index)
+
+        value = super().__getitem__(index)
+        if isinstance(value, dict | list) and not isinstance(value, CopyOnWriteDict | CopyOnWriteList):
+            value = _copy_on_access(value)
+            super().__setitem__(index, value)
+        return value
+
+    def __iter__(self):
+        self._copy_all()
+        return super().__iter__()
+
+    def __reversed__(self):
+        self._copy_all()
+        return super().__reversed__()
+
+    def pop(self, index=-1):
+        self[index]
+        return super().pop(index)
+
+    def copy(self):
+        return CopyOnWriteList(self)
+
+    def _copy_all(self):
+        for index in range(len(self)):
+            self[index]
+
+    def unwrap(self) -> list[Any]:
+        return [_unwrap(value) for value in super().__iter__()]
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, CopyOnWriteDict | CopyOnWriteList):
+        return value.unwrap()
+    return value
+
+
+def load_values(values_file: str) -> dict[str, Any]:
+    """Returns the shared, cached, values for the given values file. Callers must not modify it."""
     if (Path("charts/matrix-stack/ci") / values_file).exists():
         values_file_path = Path("charts/matrix-stack/ci") / values_file
     elif (Path("charts/matrix-stack/ci_extra") / values_file).exists():
@@ -88,12 +302,54 @@ def values(values_file) -> dict[str, Any]:
                 v[default_enabled_component]["enabled"] = True
 
         values_cache[values_file] = v
-    return copy.deepcopy(values_cache[values_file])
+    return values_cache[values_file]
+
+
+@pytest.fixture
+def values(values_file) -> dict[str, Any]:
+    return CopyOnWriteDict(load_values(values_file))
+
+
+# Runs after every plugin's pytest_collection_modifyitems, so only the tests left after `-k`, `-m`,
+# `--manifests-changed-since`, ... deselected items have their values files pre-rendered
+def pytest_collection_finish(session: pytest.Session):
+    collected_values_files = set[str]()
+    for item in session.items:
+        callspec = getattr(item, "callspec", None)
+        if callspec is not None and "values_file" in callspec.params:
+            collected_values_files.add(callspec.params["values_file"])
+    session.config.stash[collected_values_files_key] = collected_values_files
+
+
+@pytest.fixture(scope="session")
+async def prerendered_templates(pytestconfig: pytest.Config, chart: pyhelm3.Chart, release_name: str, namespace: str):
+    """Renders every values file used by the selected tests up front and concurrently.
+
+    Anything else, such as values changed by a test, is still rendered when the test asks for it. The number of
+    helm processes running at once is bounded by `helm_processes` so this scales with the available cores without
+    oversubscribing them.
+    """
+    collected_values_files = pytestconfig.stash.get(collected_values_files_key, set())
+    await asyncio.gather(
+        *[
+            helm_template(chart, release_name, namespace, load_values(values_file))
+            for values_file in sorted(collected_values_files)
+        ]
+    )
 
 
 @pytest.fixture
-async def templates(chart: pyhelm3.Chart, release_name: str, namespace: str, values: dict[str, Any]):
-    return await helm_template(chart, release_name, namespace, values)
+async def templates(
+    request: pytest.FixtureRequest,
+    chart: pyhelm3.Chart,
+    release_name: str,
+    namespace: str,
+    values: dict[str, Any],
+    prerendered_templates,
+):
+    rendered = await helm_template(chart, release_name, namespace, values)
+    record_template_sources(request, rendered.sources)
+    return rendered
 
 
 @pytest.fixture
@@ -109,11 +365,14 @@ def other_configmaps(release_name, values):
 def generated_secrets(release_name: str, values: dict[str, Any], helm_generated_templates: list[Any]) -> Iterator[Any]:
     if values["initSecrets"]["enabled"]:
         init_secrets_job = None
-        for template in helm_generated_templates:
-            if template["kind"] == "Job" and template["metadata"]["name"] == f"{release_name}-init-secrets":
-                init_secrets_job = template
-                break
+        if isinstance(helm_generated_templates, RenderedManifests):
+            init_secrets_job = helm_generated_templates.by_id.get(f"Job/{release_name}-init-secrets")
         else:
+            for template in helm_generated_templates:
+                if template["kind"] == "Job" and template["metadata"]["name"] == f"{release_name}-init-secrets":
+                    init_secrets_job = template
+                    break
+        if init_secrets_job is None:
             # We don't have an init-secrets job
             return
 
@@ -239,6 +498,47 @@ def external_configmaps(release_name, values):
         }
 
 
+def chart_digest(chart: pyhelm3.Chart) -> str:
+    """Returns a digest of every file in the chart directory, computed once per session."""
+    chart_path = Path(str(chart.ref))
+    if str(chart_path) not in chart_digests:
+        digest = hashlib.sha256()
+        for file_path in sorted(path for path in chart_path.rglob("*") if path.is_file()):
+            file_contents = file_path.read_bytes()
+            digest.update(f"{file_path.relative_to(chart_path)}\0{len(file_contents)}\0".encode())
+            digest.update(file_contents)
+        chart_digests[str(chart_path)] = digest.hexdigest()
+    return chart_digests[str(chart_path)]
+
+
+@functools.cache
+def helm_version() -> str:
+    """Returns the version of Helm in use, as different versions may render the same chart differently."""
+    return subprocess.run(["helm", "version", "--short"], capture_output=True, check=True, text=True).stdout.strip()
+
+
+def read_cached_render(chart: pyhelm3.Chart, render_key: str) -> bytes | None:
+    if render_cache_dir is None:
+        return None
+    cached_render_path = render_cache_dir / chart_digest(chart) / f"{render_key}.yaml"
+    if not cached_render_path.exists():
+        return None
+    # Marks the render as recently used, so that it's kept by pytest_sessionfinish
+    os.utime(cached_render_path)
+    return cached_render_path.read_bytes()
+
+
+def write_cached_render(chart: pyhelm3.Chart, render_key: str, rendered: bytes):
+    if render_cache_dir is None:
+        return
+    chart_render_dir = render_cache_dir / chart_digest(chart)
+    chart_render_dir.mkdir(exist_ok=True)
+    # Written to a temporary file first so that a concurrent or interrupted session never sees a partial render
+    with tempfile.NamedTemporaryFile(dir=chart_render_dir, delete=False) as f:
+        f.write(rendered)
+    os.replace(f.name, chart_render_dir / f"{render_key}.yaml")
+
+
 async def helm_template(
     chart: pyhelm3.Chart,
     release_name: str,
@@ -247,12 +547,15 @@ async def helm_template(
     has_cert_manager_crd=True,
     has_service_monitor_crd=True,
     skip_cache=False,
-) -> list[Any]:
+) -> "RenderedManifests":
     """Generate template with ServiceMonitor API Versions enabled
 
     The native pyhelm3 template command does expose the --api-versions flag,
     so we implement it here.
     """
+    # Serialise only what tests have changed rather than walking (and so copying) the whole values tree
+    values = _unwrap(values)
+
     additional_apis: list[str] = []
     if has_service_monitor_crd:
         additional_apis.append("monitoring.coreos.com/v1/ServiceMonitor")
@@ -280,25 +583,109 @@ async def helm_template(
         }
     )
 
-    if skip_cache or template_cache_key not in template_cache:
-        templates = []
-        for template in yaml.load_all(
-            await pyhelm3.Command().run(command, json.dumps(values or {}).encode()), Loader=yaml.SafeLoader
-        ):
-            if template:
-                frozen_template = deepfreeze(template)
-                manifests_cache.setdefault(hash(frozen_template), frozen_template)
-                templates.append(manifests_cache[hash(frozen_template)])
-        template_cache[template_cache_key] = templates
+    if skip_cache:
+        return await render_templates(chart, command, values)
+
+    if template_cache_key not in template_cache:
+        # The namespace is constant for a session and so isn't part of the in-memory key, but it is rendered
+        # into the manifests and so must be part of the on-disk key
+        render_key = hashlib.sha256(f"{helm_version()}\0{namespace}\0{template_cache_key}".encode()).hexdigest()
+        # Tests run cooperatively, so many of them can ask for the same render at once. The first request starts
+        # the render and the others wait on it, rather than each spawning their own helm process.
+        if template_cache_key not in inflight_renders:
+            inflight_renders[template_cache_key] = asyncio.ensure_future(
+                render_templates(chart, command, values, render_key)
+            )
+        try:
+            template_cache[template_cache_key] = await asyncio.shield(inflight_renders[template_cache_key])
+        finally:
+            inflight_renders.pop(template_cache_key, None)
     return template_cache[template_cache_key]
 
 
+async def render_templates(
+    chart: pyhelm3.Chart, command: list[str], values: Any | None, render_key: str | None = None
+) -> "RenderedManifests":
+    """Runs helm template, or fetches the on-disk render if there is one, and interns the resulting manifests"""
+    rendered = read_cached_render(chart, render_key) if render_key is not None else None
+    if rendered is None:
+        async with helm_processes:
+            rendered = await pyhelm3.Command().run(command, json.dumps(values or {}).encode())
+        if render_key is not None:
+            write_cached_render(chart, render_key, rendered)
+
+    # Renders that aren't cached are only used by the test that asked for them, so their nodes are only shared
+    # within the render and are released along with it, rather than being kept in the session-wide table
+    interned = interned_nodes if render_key is not None else {}
+    rendered_manifests = RenderedManifests(
+        intern_node(template, interned) for template in yaml.load_all(rendered, Loader=yaml.SafeLoader) if template
+    )
+    rendered_manifests.sources = frozenset(re.findall(r"^# Source: (\S+)", rendered.decode("utf-8"), re.MULTILINE))
+    return rendered_manifests
+
+
+def intern_node(node: Any, interned: dict[Any, Any]) -> Any:
+    """Deep freezes a parsed manifest, as `deepfreeze` would, sharing any sub-tree already in `interned`.
+
+    Children are interned before their parents, so on a lookup hit the nested dicts & lists of the two nodes
+    will be the same objects. Scalars such as `True`/`1` or `1`/`1.0` compare equal whilst being different
+    though, and dicts compare equal regardless of key order, so a hit is only used if the keys are in the same
+    order and every child is either the same object or a scalar of the same type.
+    """
+    if isinstance(node, str):
+        return sys.intern(node)
+    elif isinstance(node, dict):
+        frozen_node: Any = frozendict(
+            (intern_node(key, interned), intern_node(value, interned)) for key, value in node.items()
+        )
+    elif isinstance(node, list):
+        frozen_node = tuple(intern_node(value, interned) for value in node)
+    else:
+        return node
+
+    interning_stats["nodes"] += 1
+    interned_node = interned.setdefault(frozen_node, frozen_node)
+    if interned_node is frozen_node:
+        return frozen_node
+
+    def children(node):
+        return [*node.keys(), *node.values()] if isinstance(node, frozendict) else node
+
+    if type(interned_node) is not type(frozen_node) or not all(
+        ours is theirs or (type(ours) is type(theirs) and not isinstance(ours, str | tuple | frozendict))
+        for ours, theirs in zip(children(frozen_node), children(interned_node), strict=True)
+    ):
+        return frozen_node
+
+    interning_stats["shared"] += 1
+    return interned_node
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter):
+    if not interning_stats["nodes"]:
+        return
+    terminalreporter.write_sep("-", "rendered manifests memory")
+    # ru_maxrss is in KiB on Linux but in bytes on macOS
+    peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss_kib //= 1024
+    terminalreporter.write_line(
+        f"{interning_stats['nodes']} manifest nodes rendered, {len(interned_nodes)} unique nodes kept "
+        f"({interning_stats['shared'] / interning_stats['nodes']:.1%} shared), "
+        f"peak RSS {peak_rss_kib // 1024} MiB"
+    )
+
+
 @pytest.fixture
-def make_templates(chart: pyhelm3.Chart, release_name: str, namespace: str):
+def make_templates(
+    request: pytest.FixtureRequest, chart: pyhelm3.Chart, release_name: str, namespace: str, prerendered_templates
+):
     async def _make_templates(values, has_cert_manager_crd=True, has_service_monitor_crd=True, skip_cache=False):
-        return await helm_template(
+        rendered = await helm_template(
             chart, release_name, namespace, values, has_cert_manager_crd, has_service_monitor_crd, skip_cache
         )
+        record_template_sources(request, rendered.sources)
+        return rendered
 
     return _make_templates
 
@@ -328,31 +715,40 @@ def template_to_deployable_details(template: dict[str, Any], container_name: str
     # As per test_labels this doesn't have the release_name prefixed to it
     manifest_name: str = template["metadata"]["labels"]["app.kubernetes.io/name"]
 
-    match = None
-    for deployable_details in all_deployables_details:
-        # We name the various DeployableDetails to match the name the chart should use for
-        # the manifest name and thus the app.kubernetes.io/name label above. e.g. A manifest
-        # belonging to Synapse should be named `<release-name>-synapse(-<optional extra>)`.
-        #
-        # When we find a matching (sub-)component we ensure that there has been no other
-        # match (with the exception of matching both a sub-component and its parent) as
-        # otherwise we have no way of identifying the associated DeployableDeploys and
-        # thus which parts of the values files need manipulating for this deployable.
-        if deployable_details.owns_manifest_named(manifest_name):
-            assert match is None, (
-                f"{template_id(template)} could belong to at least 2 (sub-)components: "
-                f"{match.name} and {deployable_details.name}"  # type: ignore[attr-defined]
-            )
-            match = deployable_details
-
-    assert match is not None, f"{template_id(template)} can't be linked to any (sub-)component"
+    # all_deployables_details is fixed, so the owner of a given manifest name or container never changes.
+    # Only successful lookups are remembered, so any failing assertion below is raised for every template
+    if manifest_name not in manifest_name_to_deployable_details:
+        match = None
+        for deployable_details in all_deployables_details:
+            # We name the various DeployableDetails to match the name the chart should use for
+            # the manifest name and thus the app.kubernetes.io/name label above. e.g. A manifest
+            # belonging to Synapse should be named `<release-name>-synapse(-<optional extra>)`.
+            #
+            # When we find a matching (sub-)component we ensure that there has been no other
+            # match (with the exception of matching both a sub-component and its parent) as
+            # otherwise we have no way of identifying the associated DeployableDeploys and
+            # thus which parts of the values files need manipulating for this deployable.
+            if deployable_details.owns_manifest_named(manifest_name):
+                assert match is None, (
+                    f"{template_id(template)} could belong to at least 2 (sub-)components: "
+                    f"{match.name} and {deployable_details.name}"  # type: ignore[attr-defined]
+                )
+                match = deployable_details
+
+        assert match is not None, f"{template_id(template)} can't be linked to any (sub-)component"
+        manifest_name_to_deployable_details[manifest_name] = match
+
+    match = manifest_name_to_deployable_details[manifest_name]
     # If this is a template that has multiple containers, the containers could have different ownership
     # e.g. a sidecar. For everything else we don't need to check further as there's no shared ownership
     if container_name is not None:
-        match = match.deployable_details_for_container(container_name)
-        assert match is not None, (
-            f"{template_id(template)} can't be linked to any (sub-)component or specific container"
-        )
+        if (manifest_name, container_name) not in container_to_deployable_details:
+            container_match = match.deployable_details_for_container(container_name)
+            assert container_match is not None, (
+                f"{template_id(template)} can't be linked to any (sub-)component or specific container"
+            )
+            container_to_deployable_details[(manifest_name, container_name)] = container_match
+        match = container_to_deployable_details[(manifest_name, container_name)]
     return match
 
 
@@ -369,6 +765,12 @@ def get_or_empty(d, key):
 
 
 def find_workload_ids_matching_selector(templates: list[dict[str, Any]], selector: dict[str, str]) -> set[str]:
+    if isinstance(templates, RenderedManifests):
+        return {
+            pod_template_details.manifest_id
+            for pod_template_details in templates.pod_templates_matching_selector(selector, ALL_WORKLOAD_KINDS)
+        }
+
     workload_ids = set[str]()
     for pod_template_details in iterate_pod_template(templates):
         if selector_match(pod_template_details.pod_template["metadata"]["labels"], selector):
@@ -378,6 +780,9 @@ def find_workload_ids_matching_selector(templates: list[dict[str, Any]], selecto
 
 
 def find_services_matching_selector(templates: list[dict[str, Any]], selector: dict[str, str]) -> list[dict[str, Any]]:
+    if isinstance(templates, RenderedManifests):
+        return templates.matching_selector(selector, ("Service",))
+
     services = []
     for template in templates:
         if template["kind"] == "Service" and selector_match(template["metadata"]["labels"], selector):
@@ -417,9 +822,7 @@ async def assert_covers_expected_workloads(
 
     iterate_deployables_parts(enable_covering_templates, if_condition)
 
-    templates_by_kind = dict[str, list[dict[str, Any]]]()
-    for template in await make_templates(values):
-        templates_by_kind.setdefault(template["kind"], []).append(template)
+    templates_by_kind: dict[str, list[dict[str, Any]]] = dict((await make_templates(values)).by_kind)
 
     covered_workload_ids = set[str]()
     for seen_covering_template in templates_by_kind.get(covering_kind, []):
@@ -464,6 +867,14 @@ ALL_WORKLOAD_KINDS = PERSISTENT_WORKLOAD_KINDS + EPHEMERAL_WORKLOAD_KINDS
 
 
 def iterate_pod_template(manifests, kinds: tuple[str, ...] = ALL_WORKLOAD_KINDS):
+    if isinstance(manifests, RenderedManifests):
+        yield from (
+            pod_template_details
+            for pod_template_details in manifests.pod_templates
+            if pod_template_details.manifest["kind"] in kinds
+        )
+        return
+
     for manifest in manifests:
         if manifest["kind"] not in kinds:
             continue
@@ -475,3 +886,86 @@ def workload_spec_containers(workload_spec):
         yield container
     for container in workload_spec.get("containers", []):
         yield container
+
+
+class RenderedManifests(list[Any]):
+    """The manifests from a single render, in the order helm rendered them.
+
+    Indexes over the manifests are built the first time they're used and kept for as long as the render is,
+    so repeated lookups against a cached render don't rescan it. The indexes aren't updated if the list is
+    changed, so this should be treated as read-only.
+    """
+
+    # The chart files, relative to the directory containing the chart, that rendered to these manifests
+    sources: frozenset[str] = frozenset()
+
+    def __add__(self, other):
+        return RenderedManifests([*self, *other])
+
+    @cached_property
+    def by_kind(self) -> dict[str, "RenderedManifests"]:
+        by_kind = dict[str, RenderedManifests]()
+        for manifest in self:
+            by_kind.setdefault(manifest["kind"], RenderedManifests()).append(manifest)
+        return by_kind
+
+    @cached_property
+    def by_id(self) -> dict[str, Any]:
+        by_id = dict[str, Any]()
+        for manifest in self:
+            by_id.setdefault(template_id(manifest), manifest)
+        return by_id
+
+    @cached_property
+    def by_label(self) -> dict[tuple[str, str], list[Any]]:
+        by_label = dict[tuple[str, str], list[Any]]()
+        for manifest in self:
+            for label in get_or_empty(manifest["metadata"], "labels").items():
+                by_label.setdefault(label, []).append(manifest)
+        return by_label
+
+    @cached_property
+    def pod_templates(self) -> list[PodTemplateDetails]:
+        return [PodTemplateDetails(manifest) for manifest in self if manifest["kind"] in ALL_WORKLOAD_KINDS]
+
+    @cached_property
+    def pod_templates_by_label(self) -> dict[tuple[str, str], list[PodTemplateDetails]]:
+        pod_templates_by_label = dict[tuple[str, str], list[PodTemplateDetails]]()
+        for pod_template_details in self.pod_templates:
+            for label in get_or_empty(pod_template_details.pod_template["metadata"], "labels").items():
+                pod_templates_by_label.setdefault(label, []).append(pod_template_details)
+        return pod_templates_by_label
+
+    @cached_property
+    def secret_providers(self) -> dict[str, Any]:
+        """The first Secret, or Certificate that will create a Secret, for each Secret name"""
+        secret_providers = dict[str, Any]()
+        for manifest in self:
+            if manifest["kind"] == "Secret":
+                secret_providers.setdefault(manifest["metadata"]["name"], manifest)
+            elif manifest["kind"] == "Certificate":
+                secret_providers.setdefault(manifest["spec"]["secretName"], manifest)
+        return secret_providers
+
+    def matching_selector(self, selector: dict[str, str], kinds: tuple[str, ...]) -> list[Any]:
+        if not selector:
+            return [manifest for manifest in self if manifest["kind"] in kinds]
+        candidates = min((self.by_label.get(label, []) for label in selector.items()), key=len)
+        return [
+            manifest
+            for manifest in candidates
+            if manifest["kind"] in kinds and selector_match(manifest["metadata"]["labels"], selector)
+        ]
+
+    def pod_templates_matching_selector(
+        self, selector: dict[str, str], kinds: tuple[str, ...]
+    ) -> list[PodTemplateDetails]:
+        if not selector:
+            return [details for details in self.pod_templates if details.manifest["kind"] in kinds]
+        candidates = min((self.pod_templates_by_label.get(label, []) for label in selector.items()), key=len)
+        return [
+            details
+            for details in candidates
+            if details.manifest["kind"] in kinds
+            and selector_match(details.pod_template["metadata"]["labels"], selector)
+        ]